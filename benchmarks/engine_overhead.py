@@ -0,0 +1,47 @@
+# run this benchmark using `make run-benchmark BENCHMARK=engine_overhead` from the root directory
+
+import argparse
+import time
+from typing import Any, Dict, Iterator, Literal
+
+from sparp.sparp import SPARP, SparpResult, StatusClassifier
+from sparp.transports import InMemoryTransport, ScriptedResponse
+
+
+def requests(count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {"method": "GET", "url": f"http://in-memory/items/{i}"}
+
+
+async def status_only_parser(request_dict: Dict[str, Any], response: Any) -> int:
+    return response.status
+
+
+def main(count: int, concurrency: int, latency_s: float, dispatch: Literal["workers", "tasks"]) -> None:
+    transport = InMemoryTransport(ScriptedResponse(status=200, body=b'{"status": "ok"}', latency_s=latency_s))
+    sparp = SPARP(
+        requests(count),
+        inspect_response=StatusClassifier(),
+        parse_response=status_only_parser,
+        concurrency=concurrency,
+        transport=transport,
+        retain_results=False,
+        dispatch=dispatch,
+    )
+    start: float = time.perf_counter()
+    result: SparpResult = sparp.main()
+    took: float = time.perf_counter() - start
+    print(
+        f"requests={result.stats.success} concurrency={concurrency} dispatch={dispatch} latency={latency_s}s took={took:.2f}s "
+        f"throughput={result.stats.success / took:,.0f} req/s overhead={1e6 * took / result.stats.success:.1f}us/req"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure SPARP's scheduling overhead without sockets")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-s", type=float, default=0.0)
+    parser.add_argument("--dispatch", choices=("workers", "tasks"), default="workers")
+    args = parser.parse_args()
+    main(args.count, args.concurrency, args.latency_s, args.dispatch)
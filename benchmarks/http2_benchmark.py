@@ -0,0 +1,64 @@
+# run this benchmark using `make run-benchmark BENCHMARK=http2_benchmark` from the root directory
+# requires the http2 extra: pip install 'sparp[http2]'
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, Iterator
+
+from benchmarks.servers import H1StandInServer, H2StandInServer
+from sparp.sparp import SPARP, SparpResult, StatusClassifier
+from sparp.transports import AiohttpTransport, Http2Transport, Transport
+
+
+def requests(count: int, port: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {"method": "POST", "url": f"http://localhost:{port}/items", "json": {"value": i}}
+
+
+async def run_once(name: str, server: Any, transport: Transport, count: int, concurrency: int) -> None:
+    await server.start()
+    try:
+        sparp = SPARP(
+            requests(count, server.port),
+            inspect_response=StatusClassifier(),
+            concurrency=concurrency,
+            transport=transport,
+            retain_results=False,
+        )
+        start: float = time.perf_counter()
+        result: SparpResult = await sparp._main()
+        took: float = time.perf_counter() - start
+    finally:
+        await server.stop()
+    print(
+        f"{name:<10} requests={result.stats.success:>7} took={took:6.2f}s "
+        f"throughput={result.stats.success / took:8.0f} req/s tcp_connections={server.connections}"
+    )
+
+
+async def main(count: int, concurrency: int, latency_s: float, max_connections: int) -> None:
+    await run_once(
+        "HTTP/1.1",
+        H1StandInServer(latency_s=latency_s),
+        AiohttpTransport(),
+        count,
+        concurrency,
+    )
+    await run_once(
+        "HTTP/2",
+        H2StandInServer(latency_s=latency_s),
+        Http2Transport(max_connections=max_connections, prior_knowledge=True),
+        count,
+        concurrency,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the HTTP/1.1 and HTTP/2 transports on local servers")
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--latency-s", type=float, default=0.01)
+    parser.add_argument("--max-connections", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.concurrency, args.latency_s, args.max_connections))
@@ -0,0 +1,224 @@
+# run this benchmark using `make run-benchmark BENCHMARK=memory_footprint` from the root directory
+# for other sizes or the stand-in server, run it directly from the root directory, e.g.
+#   PYTHONPATH=src python -m benchmarks.memory_footprint --count 10000000 --check
+#   PYTHONPATH=src python -m benchmarks.memory_footprint --count 100000 --transport http
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List
+
+from benchmarks.servers import H1StandInServer
+from sparp.sparp import SPARP, SparpResult, StatusClassifier, default_parse_response
+from sparp.transports import AiohttpTransport, InMemoryTransport, ScriptedResponse, Transport
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One configuration to measure; every scenario runs in a fresh process so RSS numbers do not leak."""
+
+    name: str
+    input_kind: str = "generator"
+    input_buffer_size: int = 100
+    concurrency: int = 100
+    parser: str = "status"
+    retain_results: bool = False
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("baseline"),
+    Scenario("list-input", input_kind="list"),
+    Scenario("buffer-10000", input_buffer_size=10_000),
+    Scenario("concurrency-1000", concurrency=1000),
+    Scenario("default-parser", parser="default"),
+    Scenario("retain", retain_results=True),
+    Scenario("retain-default-parser", parser="default", retain_results=True),
+]
+
+# Upper bounds in bytes for --check; a run above one of them is a memory regression
+LIMITS: Dict[str, float] = {
+    "list_input_item": 1_000,
+    "queued_input": 1_000,
+    "in_flight_request": 20_000,
+    "stored_result": 100,
+    "stored_default_result": 3_000,
+    # Not per item: with retain_results=False and generator input the peak should not grow with the count
+    "baseline_peak": 4_000_000,
+}
+
+BODY: bytes = b'{"status": "ok", "items": [1, 2, 3]}'
+
+
+def rss_bytes() -> int:
+    """Current resident set size, from /proc on Linux, else the peak reported by getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        scale: int = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def requests(count: int, url: str) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {"method": "POST", "url": url, "json": {"value": i}}
+
+
+async def status_only_parser(request_dict: Dict[str, Any], response: Any) -> int:
+    return response.status
+
+
+async def sample(samples: List[tuple[float, int, int]], interval_s: float) -> None:
+    while True:
+        samples.append((time.perf_counter(), tracemalloc.get_traced_memory()[0], rss_bytes()))
+        await asyncio.sleep(interval_s)
+
+
+async def run(
+    scenario: Scenario, source: Any, transport: Transport
+) -> tuple[SparpResult, List[tuple[float, int, int]]]:
+    sparp = SPARP(
+        source,
+        inspect_response=StatusClassifier(),
+        parse_response=status_only_parser if scenario.parser == "status" else default_parse_response,
+        concurrency=scenario.concurrency,
+        input_buffer_size=scenario.input_buffer_size,
+        retain_results=scenario.retain_results,
+        transport=transport,
+    )
+    samples: List[tuple[float, int, int]] = []
+    sampler: asyncio.Task[None] = asyncio.create_task(sample(samples, 0.05))
+    try:
+        result: SparpResult = await sparp._main()
+    finally:
+        sampler.cancel()
+    return result, samples
+
+
+async def run_with_server(scenario: Scenario, count: int, latency_s: float) -> Any:
+    server = H1StandInServer(latency_s=latency_s)
+    await server.start()
+    try:
+        url: str = f"http://localhost:{server.port}/items"
+        source: Any = list(requests(count, url)) if scenario.input_kind == "list" else requests(count, url)
+        return await run(scenario, source, AiohttpTransport())
+    finally:
+        await server.stop()
+
+
+def measure(scenario: Scenario, count: int, transport: str, latency_s: float) -> Dict[str, float]:
+    """Runs one scenario in this process and returns its memory figures in bytes."""
+    tracemalloc.start()
+    base_traced: int = tracemalloc.get_traced_memory()[0]
+    base_rss: int = rss_bytes()
+    start: float = time.perf_counter()
+    if transport == "http":
+        result, samples = asyncio.run(run_with_server(scenario, count, latency_s))
+    else:
+        url: str = "http://in-memory/items"
+        source: Any = list(requests(count, url)) if scenario.input_kind == "list" else requests(count, url)
+        result, samples = asyncio.run(
+            run(scenario, source, InMemoryTransport(ScriptedResponse(body=BODY, latency_s=latency_s)))
+        )
+        del source
+    took: float = time.perf_counter() - start
+    retained: int = tracemalloc.get_traced_memory()[0] - base_traced
+    peak: int = tracemalloc.get_traced_memory()[1] - base_traced
+    tracemalloc.stop()
+    assert result.stats.success == count, f"expected {count} successes, got {result.stats.success}"
+    # Steady state: the median over the middle half of the run, away from ramp-up and drain
+    middle: List[tuple[float, int, int]] = samples[len(samples) // 4 : len(samples) * 3 // 4] or samples[-1:]
+    return {
+        "peak_traced": peak,
+        "steady_traced": statistics.median(s[1] for s in middle) - base_traced if middle else peak,
+        "retained_traced": retained,
+        "peak_rss": max((s[2] for s in samples), default=base_rss) - base_rss,
+        "steady_rss": statistics.median(s[2] for s in middle) - base_rss if middle else 0,
+        "took_s": took,
+    }
+
+
+def per_item(figures: Dict[str, Dict[str, float]], count: int) -> Dict[str, float]:
+    """Derives per-item overheads in bytes from pairs of scenarios that differ in one setting."""
+    base: Dict[str, float] = figures["baseline"]
+    return {
+        "list_input_item": (figures["list-input"]["peak_traced"] - base["peak_traced"]) / count,
+        "queued_input": (figures["buffer-10000"]["steady_traced"] - base["steady_traced"]) / (10_000 - 100),
+        "in_flight_request": (figures["concurrency-1000"]["steady_traced"] - base["steady_traced"]) / (1000 - 100),
+        "stored_result": (figures["retain"]["retained_traced"] - base["retained_traced"]) / count,
+        "stored_default_result": (
+            figures["retain-default-parser"]["retained_traced"] - figures["default-parser"]["retained_traced"]
+        )
+        / count,
+        "baseline_peak": base["peak_traced"],
+    }
+
+
+def main(count: int, transport: str, latency_s: float, check: bool) -> int:
+    figures: Dict[str, Dict[str, float]] = {}
+    print(f"requests={count} transport={transport} latency={latency_s}s (tracemalloc slows runs down)")
+    print(f"{'scenario':<24}{'peak':>10}{'steady':>10}{'retained':>10}{'peak rss':>10}{'steady rss':>12}{'took':>8}")
+    for scenario in SCENARIOS:
+        # A fresh interpreter per scenario keeps RSS and allocator state independent
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.memory_footprint",
+                "--scenario",
+                json.dumps(asdict(scenario)),
+                "--count",
+                str(count),
+                "--transport",
+                transport,
+                "--latency-s",
+                str(latency_s),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        f: Dict[str, float] = json.loads(completed.stdout.splitlines()[-1])
+        figures[scenario.name] = f
+        print(
+            f"{scenario.name:<24}{f['peak_traced'] / 1e6:>8.1f}MB{f['steady_traced'] / 1e6:>8.1f}MB"
+            f"{f['retained_traced'] / 1e6:>8.1f}MB{f['peak_rss'] / 1e6:>8.1f}MB{f['steady_rss'] / 1e6:>10.1f}MB"
+            f"{f['took_s']:>7.1f}s"
+        )
+
+    overheads: Dict[str, float] = per_item(figures, count)
+    print("\nper-item overhead (traced bytes), from pairs of scenarios differing in one setting")
+    regressions: List[str] = []
+    for name, value in overheads.items():
+        over: bool = value > LIMITS[name]
+        print(f"  {name:<32}{value:>10.0f} B   limit {LIMITS[name]:>8.0f} B{'   REGRESSION' if over else ''}")
+        if over:
+            regressions.append(name)
+    if check and regressions:
+        print(f"memory regression in: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure SPARP's memory footprint with tracemalloc and RSS")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument(
+        "--transport", choices=("memory", "http"), default="memory", help="http uses a local stand-in server"
+    )
+    parser.add_argument("--latency-s", type=float, default=0.005)
+    parser.add_argument("--check", action="store_true", help="exit with status 1 when a per-item limit is exceeded")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.scenario:
+        print(json.dumps(measure(Scenario(**json.loads(args.scenario)), args.count, args.transport, args.latency_s)))
+    else:
+        sys.exit(main(args.count, args.transport, args.latency_s, args.check))
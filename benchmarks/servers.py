@@ -0,0 +1,121 @@
+import asyncio
+import json
+from typing import Any, Dict, Self
+
+from aiohttp import web
+
+
+class H2StandInServer:
+    """Minimal cleartext HTTP/2 (h2c, prior knowledge) server answering every request after a fixed latency.
+
+    Counts the TCP connections it accepted, which is what HTTP/2 multiplexing is meant to keep low.
+    Requires the h2 package, which comes with httpx[http2].
+    """
+
+    def __init__(self: Self, host: str = "localhost", port: int = 8790, latency_s: float = 0.01) -> None:
+        """Configures the address and per-request latency of the server."""
+        self.host: str = host
+        self.port: int = port
+        self.latency_s: float = latency_s
+        self.connections: int = 0
+        self.requests: int = 0
+        self._server: asyncio.Server | None = None
+
+    async def start(self: Self) -> None:
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: _H2Protocol(self), self.host, self.port)
+
+    async def stop(self: Self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+class _H2Protocol(asyncio.Protocol):
+    """One server-side HTTP/2 connection."""
+
+    def __init__(self: Self, server: H2StandInServer) -> None:
+        import h2.config
+        import h2.connection
+
+        self.server: H2StandInServer = server
+        self.conn: Any = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self.transport: asyncio.Transport | None = None
+        self.bodies: Dict[int, bytearray] = {}
+
+    def connection_made(self: Self, transport: asyncio.BaseTransport) -> None:
+        assert isinstance(transport, asyncio.Transport)
+        self.server.connections += 1
+        self.transport = transport
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self: Self, data: bytes) -> None:
+        import h2.events
+
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                self.bodies[event.stream_id] = bytearray()
+            elif isinstance(event, h2.events.DataReceived):
+                self.bodies.setdefault(event.stream_id, bytearray()).extend(event.data)
+                self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                asyncio.get_running_loop().call_later(self.server.latency_s, self._respond, event.stream_id)
+            elif isinstance(event, h2.events.ConnectionTerminated) and self.transport is not None:
+                self.transport.close()
+        self._flush()
+
+    def _respond(self: Self, stream_id: int) -> None:
+        if self.transport is None or self.transport.is_closing():
+            return
+        request_body: bytes = bytes(self.bodies.pop(stream_id, b""))
+        echo: Any = json.loads(request_body) if request_body else None
+        body: bytes = json.dumps({"status": "ok", "echo": echo}).encode()
+        self.server.requests += 1
+        self.conn.send_headers(
+            stream_id,
+            [(":status", "200"), ("content-type", "application/json"), ("content-length", str(len(body)))],
+        )
+        self.conn.send_data(stream_id, body, end_stream=True)
+        self._flush()
+
+    def _flush(self: Self) -> None:
+        data: bytes = self.conn.data_to_send()
+        if data and self.transport is not None:
+            self.transport.write(data)
+
+
+class H1StandInServer:
+    """aiohttp HTTP/1.1 server with the same behavior as H2StandInServer, used as the baseline."""
+
+    def __init__(self: Self, host: str = "localhost", port: int = 8791, latency_s: float = 0.01) -> None:
+        """Configures the address and per-request latency of the server."""
+        self.host: str = host
+        self.port: int = port
+        self.latency_s: float = latency_s
+        self.connections: int = 0
+        self.requests: int = 0
+        self._runner: web.AppRunner | None = None
+        self._seen_transports: set[int] = set()
+
+    async def _handle(self: Self, request: web.Request) -> web.StreamResponse:
+        if request.transport is not None and id(request.transport) not in self._seen_transports:
+            self._seen_transports.add(id(request.transport))
+            self.connections += 1
+        body: bytes = await request.read()
+        await asyncio.sleep(self.latency_s)
+        self.requests += 1
+        return web.json_response({"status": "ok", "echo": json.loads(body) if body else None})
+
+    async def start(self: Self) -> None:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self: Self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,31 @@
+# run this example using `make run-example EXAMPLE=distributed` from the root directory
+# On real clusters, run Worker(...).main() on each machine with the coordinator's host and port
+
+import multiprocessing
+
+from sparp.distributed import Coordinator, Worker
+from sparp.sparp import StatusClassifier
+
+
+def requests():
+    for i in range(200):
+        yield {"method": "POST", "url": "https://httpbin.org/anything", "json": {"id": i}}
+
+
+def run_worker():
+    Worker(StatusClassifier(), host="127.0.0.1", port=8800, concurrency=20).main()
+
+
+def main():
+    workers = [multiprocessing.Process(target=run_worker) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    # Workers keep retrying to connect until the coordinator listens
+    result = Coordinator(requests(), host="127.0.0.1", port=8800, chunk_size=25).main()
+    for worker in workers:
+        worker.join()
+    print(f"Completed: {result.stats.success} requests in {result.chunks} chunks, {result.releases} re-leased")
+
+
+if __name__ == "__main__":
+    main()
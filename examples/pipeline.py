@@ -0,0 +1,34 @@
+# run this example using `make run-example EXAMPLE=pipeline` from the root directory
+
+from sparp.pipeline import Pipeline
+from sparp.sparp import SPARP, StatusClassifier, emit
+
+
+async def parse_page(req, response):
+    # Every page fans out into item requests and links to the next page until page 3
+    page = int(req["url"].rsplit("/", 1)[1])
+    for item in range(page * 5, page * 5 + 5):
+        emit({"method": "GET", "url": f"https://httpbin.org/anything/items/{item}"}, stage="items")
+    if page < 3:
+        emit({"method": "GET", "url": f"https://httpbin.org/anything/pages/{page + 1}"})
+    return page
+
+
+async def parse_item(req, response):
+    return (await response.json())["url"]
+
+
+def main():
+    first_page = [{"method": "GET", "url": "https://httpbin.org/anything/pages/0"}]
+    pipeline = Pipeline(
+        {
+            "pages": SPARP(first_page, inspect_response=StatusClassifier(), parse_response=parse_page, concurrency=1),
+            "items": SPARP([], inspect_response=StatusClassifier(), parse_response=parse_item, concurrency=10),
+        }
+    )
+    results = pipeline.main()
+    print(f"Completed: {results['pages'].stats.success} pages, {results['items'].stats.success} items")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# run this example using `make run-example EXAMPLE=request_templates` from the root directory
+
+import array
+import aiohttp
+from sparp.sparp import SPARP, PARAM, RequestTemplate, ResponseState
+
+
+def inspect_response(response: aiohttp.ClientResponse) -> ResponseState:
+    if response.status == 200:
+        return ResponseState.SUCCESS
+    if response.status == 429 or response.status == 502:
+        return ResponseState.SOFT_FAIL
+    return ResponseState.HARD_FAIL
+
+
+def main():
+    # Only the ids are kept in memory; each request dict is built right before it is sent
+    template = RequestTemplate(
+        "POST", "https://httpbin.org/anything/{}", headers={"X-Job": "templates"}, json={"id": PARAM}
+    )
+    ids = array.array("q", range(100))
+
+    sparp = SPARP(template.bind(ids), inspect_response=inspect_response, concurrency=20, show_progress_bar=True)
+    result = sparp.main()
+    print(f"Completed: {result.stats.success} templated requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import contextlib
+import dataclasses
+import json
+import sys
+from typing import IO, Any, Callable, Dict, Iterator, Sequence
+
+import aiohttp
+
+from .readers import JsonlReader, _loads
+from .sparp import SPARP, Callbacks, ResponseState, SparpResult, StatusClassifier, StopConditions
+
+
+def parse_status_codes(spec: str) -> frozenset[int]:
+    """Parses a status code list such as "200-299,304" into a set of codes."""
+    codes: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            low, high = part.split("-", 1)
+            codes.update(range(int(low), int(high) + 1))
+        else:
+            codes.add(int(part))
+    return frozenset(codes)
+
+
+def _stdin_requests(stream: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Lazily decodes one request dict per non-empty line of a binary stream."""
+    for line in stream:
+        if line.strip():
+            yield _loads(line)
+
+
+def _make_parser(body: str) -> Callable[[Dict[str, Any], aiohttp.ClientResponse], Any]:
+    """Returns a parse_response producing one JSON-serializable output record per response.
+
+    With body="json", a body that is not JSON (e.g. an HTML error page) gets "json": null, the body under
+    "text" and the decoding error under "error", instead of ending the run.
+    """
+
+    async def parse_response(request_dict: Dict[str, Any], response: aiohttp.ClientResponse) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"input": request_dict, "status": response.status}
+        if body == "text":
+            record["text"] = await response.text()
+        elif body == "json":
+            try:
+                record["json"] = await response.json(content_type=None)
+            except ValueError as e:
+                record["json"] = None
+                record["text"] = await response.text(errors="replace")
+                record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    return parse_response
+
+
+def record_callbacks(write: Callable[[Dict[str, Any]], Any]) -> Callbacks:
+    """Returns Callbacks passing one output record per final outcome to write.
+
+    Records are the parsed response (a dict) with a "state" key added, or the request dict under "input"
+    for requests that reached their maximum number of retries.
+    """
+
+    def on_result(request_dict: Dict[str, Any], state: ResponseState, parsed: Any) -> None:
+        write({"state": state.value, **parsed})
+
+    return Callbacks(
+        on_result=on_result,
+        on_max_retries_by_soft_fail_reached=lambda req: write(
+            {"state": "MAX_RETRIES_BY_SOFT_FAIL_REACHED", "input": req}
+        ),
+        on_max_retries_by_timeout_reached=lambda req: write({"state": "MAX_RETRIES_BY_TIMEOUT_REACHED", "input": req}),
+    )
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Builds the argument parser of the sparp command."""
+    parser = argparse.ArgumentParser(
+        prog="sparp",
+        description=(
+            "Stream JSONL request dicts (aiohttp session.request kwargs) through SPARP and write one JSONL "
+            "record per final outcome as soon as it is known. Exits with 1 when a stop condition ended the run."
+        ),
+    )
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of request dicts, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="file to write JSONL results to, or - for stdout")
+    parser.add_argument("-c", "--concurrency", type=int, default=100)
+    parser.add_argument("--max-retries-by-soft-fail", type=int, default=20)
+    parser.add_argument("--max-retries-by-timeout", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a request attempt times out")
+    parser.add_argument("--input-buffer-size", type=int, default=100)
+    parser.add_argument("--memory-budget-bytes", type=int, default=None)
+    parser.add_argument(
+        "--success-status", default="200-299", help="status codes classified as SUCCESS, e.g. 200-299,304"
+    )
+    parser.add_argument(
+        "--soft-fail-status", default="429,502-504", help="status codes classified as SOFT_FAIL (retried)"
+    )
+    parser.add_argument("--body", choices=("text", "json", "none"), default="text", help="how to record bodies")
+    parser.add_argument("--start-offset", type=int, default=0, help="byte offset to resume an input file from")
+    parser.add_argument("--start-line", type=int, default=0, help="line to start an input file from")
+    parser.add_argument("--stop-on-hard-fail", action="store_true")
+    parser.add_argument("--progress", action="store_true", help="show the progress bar on stderr")
+    return parser
+
+
+def run(args: argparse.Namespace, stdin: IO[bytes], stdout: IO[str]) -> int:
+    """Runs a sparp command with parsed arguments; returns the process exit code.
+
+    The exit code is 1 when a stop condition ended the run before the input was exhausted, 0 otherwise.
+    """
+    input_collection: Any
+    estimated_size: int | None = None
+    if args.input == "-":
+        input_collection = _stdin_requests(stdin)
+    else:
+        reader: JsonlReader = JsonlReader(args.input, start_offset=args.start_offset, start_line=args.start_line)
+        input_collection = reader
+        if args.progress:
+            estimated_size = reader.count_lines()
+
+    output: IO[str] = stdout if args.output == "-" else open(args.output, "w")
+
+    def write(record: Dict[str, Any]) -> None:
+        output.write(json.dumps(record, default=str) + "\n")
+
+    callbacks: Callbacks = record_callbacks(write)
+
+    sparp: SPARP = SPARP(
+        input_collection,
+        inspect_response=StatusClassifier(
+            success=parse_status_codes(args.success_status), soft_fail=parse_status_codes(args.soft_fail_status)
+        ),
+        callbacks=callbacks,
+        concurrency=args.concurrency,
+        max_retries_by_soft_fail=args.max_retries_by_soft_fail,
+        max_retries_by_timeout=args.max_retries_by_timeout,
+        parse_response=_make_parser(args.body),
+        stop_conditions=StopConditions(stop_on_hard_fail=args.stop_on_hard_fail),
+        input_buffer_size=args.input_buffer_size,
+        show_progress_bar=args.progress,
+        estimated_input_collection_size=estimated_size,
+        timeout_s=args.timeout,
+        memory_budget_bytes=args.memory_budget_bytes,
+        retain_results=False,
+    )
+    try:
+        # The progress bar prints to stdout, which may be carrying the results
+        with contextlib.redirect_stdout(sys.stderr):
+            result: SparpResult = sparp.main()
+    finally:
+        if output is not stdout:
+            output.close()
+        else:
+            output.flush()
+
+    print(json.dumps(dataclasses.asdict(result.stats)), file=sys.stderr)
+    return 1 if result.stats.stop_reason else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the sparp console script."""
+    args: argparse.Namespace = build_arg_parser().parse_args(argv)
+    return run(args, sys.stdin.buffer, sys.stdout)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import threading
+from abc import abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Iterable, List, ParamSpec, Protocol, Self, TypeVar, cast
+
+try:
+    import pyarrow as pa
+except ImportError as e:
+    raise ImportError("sparp.columnar requires pyarrow: pip install 'sparp[arrow]'") from e
+
+from .reducers import Reducer
+
+if TYPE_CHECKING:
+    from .sparp import ResponseState
+
+P = ParamSpec("P")
+R = TypeVar("R", covariant=True)
+
+
+class SchemaParser(Protocol, Generic[P, R]):
+    """A parse_response decorated with with_schema: callable as before, with the declared arrow_schema."""
+
+    arrow_schema: pa.Schema
+
+    def __call__(self: Self, *args: P.args, **kwargs: P.kwargs) -> R: ...
+
+
+def with_schema(schema: Any) -> Callable[[Callable[P, R]], SchemaParser[P, R]]:
+    """Declares the Arrow schema of the rows a parse_response returns, as a pa.Schema or (name, type) pairs.
+
+    ArrowTable and ParquetOutput built from the decorated parser take their columns from it.
+    """
+    arrow_schema: pa.Schema = schema if isinstance(schema, pa.Schema) else pa.schema(schema)
+
+    def declare(parser: Callable[P, R]) -> SchemaParser[P, R]:
+        declared: SchemaParser[P, R] = cast(SchemaParser[P, R], parser)
+        declared.arrow_schema = arrow_schema
+        return declared
+
+    return declare
+
+
+class _Rows:
+    """Accumulator of a columnar reducer: one list per column for the rows not yet in a batch."""
+
+    __slots__ = ("columns", "batches")
+
+    def __init__(self: Self, width: int) -> None:
+        self.columns: List[List[Any]] = [[] for _ in range(width)]
+        self.batches: List[pa.RecordBatch] = []
+
+
+class _ColumnarReducer(Reducer):
+    """Appends each parsed row to per-column lists and turns every batch_size rows into a RecordBatch.
+
+    A row is a dict keyed by column name (missing keys are null) or a sequence in schema order.
+    """
+
+    def __init__(self: Self, schema: Any, batch_size: int, states: Iterable["ResponseState"] | None) -> None:
+        super().__init__(states)
+        if batch_size < 1:
+            raise ValueError("batch_size should be at least 1")
+        schema = getattr(schema, "arrow_schema", schema)
+        self.schema: pa.Schema = schema if isinstance(schema, pa.Schema) else pa.schema(schema)
+        if not len(self.schema):
+            raise ValueError("schema should have at least one column")
+        self.batch_size: int = batch_size
+        self._names: List[str] = self.schema.names
+
+    def init(self: Self) -> _Rows:
+        return _Rows(len(self._names))
+
+    def accumulate(self: Self, acc: _Rows, parsed: Any) -> _Rows:
+        values: Iterable[Any] = [parsed.get(name) for name in self._names] if isinstance(parsed, dict) else parsed
+        for column, value in zip(acc.columns, values):
+            column.append(value)
+        if len(acc.columns[0]) >= self.batch_size:
+            self._flush(acc)
+        return acc
+
+    def merge(self: Self, a: _Rows, b: _Rows) -> _Rows:
+        a.batches.extend(b.batches)
+        for column, more in zip(a.columns, b.columns):
+            column.extend(more)
+        if len(a.columns[0]) >= self.batch_size:
+            self._flush(a)
+        return a
+
+    def _pending(self: Self, acc: _Rows) -> pa.RecordBatch:
+        """Builds a RecordBatch from the rows not yet in a batch, without taking them out."""
+        arrays: List[pa.Array] = [pa.array(column, type=field.type) for column, field in zip(acc.columns, self.schema)]
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def _flush(self: Self, acc: _Rows) -> None:
+        batch: pa.RecordBatch = self._pending(acc)
+        for column in acc.columns:
+            column.clear()
+        self._emit(acc, batch)
+
+    @abstractmethod
+    def _emit(self: Self, acc: _Rows, batch: pa.RecordBatch) -> None:
+        """Hands over a full record batch, to keep it in acc or write it out."""
+
+
+class ArrowTable(_ColumnarReducer):
+    """Builds a pyarrow.Table of the parsed rows as they arrive, batch_size rows per record batch.
+
+    schema is a pa.Schema, (name, type) pairs, or a parser decorated with with_schema. Pair it with
+    retain_results=False so rows are not also kept as dicts in SparpResult.success.
+    """
+
+    def __init__(
+        self: Self, schema: Any, batch_size: int = 65_536, states: Iterable["ResponseState"] | None = None
+    ) -> None:
+        super().__init__(schema, batch_size, states)
+
+    def _emit(self: Self, acc: _Rows, batch: pa.RecordBatch) -> None:
+        acc.batches.append(batch)
+
+    def result(self: Self, acc: _Rows) -> pa.Table:
+        batches: List[pa.RecordBatch] = acc.batches + [self._pending(acc)] if acc.columns[0] else acc.batches
+        return pa.Table.from_batches(batches, schema=self.schema)
+
+
+class ParquetOutput(_ColumnarReducer):
+    """Streams the parsed rows into a Parquet file at path, one row group per batch_size rows.
+
+    Only the rows of the current batch are held in memory. The file is opened on the first full batch and
+    closed when the run finishes; its path is reported in SparpResult.reduced. Loops of a ThreadedSPARP
+    write into the same file. Extra writer_kwargs (e.g. compression="zstd") go to pyarrow.parquet.ParquetWriter.
+    """
+
+    def __init__(
+        self: Self,
+        path: str,
+        schema: Any,
+        batch_size: int = 65_536,
+        states: Iterable["ResponseState"] | None = None,
+        **writer_kwargs: Any,
+    ) -> None:
+        super().__init__(schema, batch_size, states)
+        self.path: str = path
+        self.writer_kwargs: Dict[str, Any] = writer_kwargs
+        self._writer: Any = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _emit(self: Self, acc: _Rows, batch: pa.RecordBatch) -> None:
+        with self._lock:
+            self._open().write_batch(batch)
+
+    def _open(self: Self) -> Any:
+        if self._writer is None:
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self.path, self.schema, **self.writer_kwargs)
+        return self._writer
+
+    def finish(self: Self, acc: _Rows) -> _Rows:
+        if acc.columns[0]:
+            self._flush(acc)
+        with self._lock:
+            # Opened here if no batch was written, so an empty run still leaves a file with the schema
+            self._open().close()
+            self._writer = None
+        return acc
+
+    def result(self: Self, acc: _Rows) -> str:
+        return self.path
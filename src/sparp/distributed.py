@@ -0,0 +1,471 @@
+import asyncio
+import collections
+import functools
+import itertools
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Self
+
+import aiohttp
+
+from .readers import _loads
+from .sparp import SPARP, ResponseState, ResultQueues, SparpResult, SparpStats
+
+# Protocol: newline-delimited JSON messages over one TCP connection per worker.
+#   worker -> coordinator: {"type": "lease"}
+#                          {"type": "result", "lease": id, "record": {...}}
+#                          {"type": "heartbeat", "lease": id}
+#                          {"type": "complete", "lease": id, "stats": {...}}
+#   coordinator -> worker: {"type": "chunk", "lease": id, "items": [...], "heartbeat_s": s}
+#                          {"type": "done"}
+# A worker may send its next lease request before the chunk it runs is complete.
+
+# State of the records of each result kind, the same as in the output of the sparp command (cli.record_callbacks)
+_RECORD_STATES: Dict[str, str] = {
+    "success": ResponseState.SUCCESS.value,
+    "failed": ResponseState.HARD_FAIL.value,
+    "max_retries_soft_fail_reached": "MAX_RETRIES_BY_SOFT_FAIL_REACHED",
+    "max_retries_timeout_reached": "MAX_RETRIES_BY_TIMEOUT_REACHED",
+}
+
+
+def _dumps(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, default=str) + "\n").encode()
+
+
+def _record(kind: str, value: Any) -> Dict[str, Any]:
+    """Builds the output record of a final outcome: the parsed response, or the request under "input"."""
+    if kind in ("success", "failed"):
+        return {"state": _RECORD_STATES[kind], **value}
+    return {"state": _RECORD_STATES[kind], "input": value}
+
+
+@dataclass(frozen=True)
+class DistributedResult:
+    """Data container for the outcome of a distributed run.
+
+    Attributes:
+        stats: Counters summed over all completed chunks; stop_reason is the first stop reported by a worker.
+        records: One output record per final outcome (see cli.record_callbacks), empty with retain_results=False.
+        chunks: Number of completed chunks.
+        releases: Number of times a chunk was leased again because its worker died or missed its heartbeats.
+    """
+
+    stats: SparpStats
+    records: List[Dict[str, Any]]
+    chunks: int
+    releases: int
+
+
+class _Lease:
+    """A chunk handed to one worker, with the records it streamed back so far."""
+
+    __slots__ = ("lease_id", "items", "records", "deadline")
+
+    def __init__(self: Self, lease_id: int, items: List[Dict[str, Any]], deadline: float) -> None:
+        self.lease_id: int = lease_id
+        self.items: List[Dict[str, Any]] = items
+        self.records: List[Dict[str, Any]] = []
+        self.deadline: float = deadline
+
+
+class Coordinator:
+    """Leases chunks of input_collection to remote Workers over TCP and collects their results.
+
+    Records streamed back for a chunk are held until the chunk completes and only then committed (passed
+    to on_record and, with retain_results=True, kept for the result), so a chunk leased again after its
+    worker died or went silent for lease_timeout_s is never counted twice. Items must be JSON-serializable
+    request dicts. A stop condition tripping on any worker stops leasing new chunks.
+    """
+
+    def __init__(
+        self: Self,
+        input_collection: Iterable[Dict[str, Any]],
+        host: str = "127.0.0.1",
+        port: int = 8800,
+        chunk_size: int = 1000,
+        lease_timeout_s: float = 60.0,
+        on_record: Callable[[Dict[str, Any]], Any] | None = None,
+        retain_results: bool = True,
+    ) -> None:
+        """Initializes the coordinator; port=0 picks a free port, available as .port once listening is set."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be at least 1")
+        self.host: str = host
+        self.port: int = port
+        self.chunk_size: int = chunk_size
+        self.lease_timeout_s: float = lease_timeout_s
+        self.on_record: Callable[[Dict[str, Any]], Any] | None = on_record
+        self.retain_results: bool = retain_results
+        self.listening: asyncio.Event = asyncio.Event()
+        self.records: List[Dict[str, Any]] = []
+        self.chunks: int = 0
+        self.releases: int = 0
+        self.stop_reason: str | None = None
+        self.totals: Dict[str, int] = {
+            "success": 0,
+            "failed": 0,
+            "soft_retries": 0,
+            "timeout_retries": 0,
+            "max_retries_soft_fail_reached": 0,
+            "max_retries_timeout_reached": 0,
+            "retries_denied": 0,
+        }
+        self.status_codes: collections.Counter[int] = collections.Counter()
+        self.exceptions: collections.Counter[str] = collections.Counter()
+        self._source: Iterator[Dict[str, Any]] | None = iter(input_collection)
+        self._requeued: collections.deque[List[Dict[str, Any]]] = collections.deque()
+        self._leases: Dict[int, _Lease] = {}
+        self._lease_ids: Iterator[int] = itertools.count()
+        self._changed: asyncio.Event = asyncio.Event()
+        self._finished: asyncio.Event = asyncio.Event()
+
+    def _check_finished(self: Self) -> None:
+        if not self._leases and (self.stop_reason is not None or (self._source is None and not self._requeued)):
+            self._finished.set()
+        self._changed.set()
+
+    async def _next_lease(self: Self) -> _Lease | None:
+        """Waits for a chunk to lease; None once the job is finished."""
+        while True:
+            items: List[Dict[str, Any]] = []
+            if self.stop_reason is not None:
+                pass
+            elif self._requeued:
+                items = self._requeued.popleft()
+            elif self._source is not None:
+                items = list(itertools.islice(self._source, self.chunk_size))
+                if not items:
+                    self._source = None
+                    self._check_finished()
+            if items:
+                lease: _Lease = _Lease(next(self._lease_ids), items, time.monotonic() + self.lease_timeout_s)
+                self._leases[lease.lease_id] = lease
+                return lease
+            if self._finished.is_set():
+                return None
+            # Leased chunks are still running and one of them may come back if its worker dies
+            self._changed.clear()
+            await self._changed.wait()
+
+    def _release(self: Self, lease_id: int) -> None:
+        """Puts an unfinished chunk back in line for another worker."""
+        lease: _Lease | None = self._leases.pop(lease_id, None)
+        if lease is not None:
+            self.releases += 1
+            self._requeued.append(lease.items)
+            self._check_finished()
+
+    def _complete(self: Self, lease: _Lease, stats: Dict[str, Any]) -> None:
+        """Commits the records and counters of a finished chunk."""
+        del self._leases[lease.lease_id]
+        for record in lease.records:
+            if self.on_record is not None:
+                self.on_record(record)
+            if self.retain_results:
+                self.records.append(record)
+        for name in self.totals:
+            self.totals[name] += stats.get(name, 0)
+        # JSON object keys are strings, status codes are turned back into ints
+        self.status_codes.update({int(code): n for code, n in stats.get("status_codes", {}).items()})
+        self.exceptions.update(stats.get("exceptions", {}))
+        if stats.get("stop_reason") and self.stop_reason is None:
+            self.stop_reason = stats["stop_reason"]
+        self.chunks += 1
+        self._check_finished()
+
+    async def _serve_lease(self: Self, writer: asyncio.StreamWriter, held: set[int]) -> None:
+        """Answers one lease request of a worker with a chunk, or with done once the job is finished."""
+        lease: _Lease | None = await self._next_lease()
+        if lease is None:
+            writer.write(_dumps({"type": "done"}))
+        else:
+            held.add(lease.lease_id)
+            writer.write(
+                _dumps(
+                    {
+                        "type": "chunk",
+                        "lease": lease.lease_id,
+                        "items": lease.items,
+                        "heartbeat_s": self.lease_timeout_s / 3,
+                    }
+                )
+            )
+        await writer.drain()
+
+    async def _handle(self: Self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one worker connection; chunks it still holds are leased again when it disconnects."""
+        held: set[int] = set()
+        # A lease request waits for a chunk in a task of its own, so the results and heartbeats of the chunk
+        # the worker is still running keep being read meanwhile
+        requests: set[asyncio.Task[None]] = set()
+        try:
+            while line := await reader.readline():
+                message: Dict[str, Any] = _loads(line)
+                kind: str = message["type"]
+                if kind == "lease":
+                    request: asyncio.Task[None] = asyncio.create_task(self._serve_lease(writer, held))
+                    requests.add(request)
+                    request.add_done_callback(requests.discard)
+                    continue
+
+                # Messages about a lease that expired in the meantime are dropped
+                current: _Lease | None = self._leases.get(message["lease"])
+                if current is None:
+                    continue
+                current.deadline = time.monotonic() + self.lease_timeout_s
+                if kind == "result":
+                    current.records.append(message["record"])
+                elif kind == "complete":
+                    held.discard(current.lease_id)
+                    self._complete(current, message["stats"])
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            for request in list(requests):
+                request.cancel()
+            for lease_id in held:
+                self._release(lease_id)
+            writer.close()
+
+    async def _reaper(self: Self) -> None:
+        """Leases again the chunks of workers that stopped sending messages."""
+        while True:
+            await asyncio.sleep(min(self.lease_timeout_s / 4, 1.0))
+            now: float = time.monotonic()
+            for lease_id in [lease.lease_id for lease in self._leases.values() if lease.deadline < now]:
+                self._release(lease_id)
+
+    async def _main(self: Self) -> DistributedResult:
+        """Serves workers until every chunk is completed (or a worker reported a stop)."""
+        server: asyncio.Server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.listening.set()
+        reaper: asyncio.Task[None] = asyncio.create_task(self._reaper())
+        try:
+            async with server:
+                await self._finished.wait()
+        finally:
+            reaper.cancel()
+        return DistributedResult(
+            stats=SparpStats(
+                success=self.totals["success"],
+                failed=self.totals["failed"],
+                soft_retries=self.totals["soft_retries"],
+                timeout_retries=self.totals["timeout_retries"],
+                max_retries_soft_fail_reached=self.totals["max_retries_soft_fail_reached"],
+                max_retries_timeout_reached=self.totals["max_retries_timeout_reached"],
+                status_codes=dict(self.status_codes),
+                exceptions=dict(self.exceptions),
+                retries_denied=self.totals["retries_denied"],
+                stop_reason=self.stop_reason,
+            ),
+            records=self.records,
+            chunks=self.chunks,
+            releases=self.releases,
+        )
+
+    def main(self: Self) -> DistributedResult:
+        """Synchronous entry point to run the coordinator."""
+        return asyncio.run(self._main())
+
+
+class _Chunk:
+    """A chunk run by a Worker: the number of its items not finished yet and the outcomes counted so far."""
+
+    __slots__ = ("lease_id", "pending", "outcomes", "heartbeat")
+
+    def __init__(self: Self, lease_id: int, pending: int, heartbeat: asyncio.Task[None]) -> None:
+        self.lease_id: int = lease_id
+        self.pending: int = pending
+        self.outcomes: Dict[str, int] = dict.fromkeys(ResultQueues.KINDS, 0)
+        self.heartbeat: asyncio.Task[None] = heartbeat
+
+
+class Worker:
+    """Runs the chunks leased by a Coordinator through one local SPARP engine and streams back the records.
+
+    The engine and its transport session last as long as the worker. The next chunk is leased while the
+    current one drains, and its items queue up behind the last requests of the current one, so concurrency
+    does not drop at chunk boundaries. sparp_kwargs are passed to the engine, except retain_results, which
+    the worker sets itself; ordered and load_profile only apply to a finite input and are not supported.
+    Records are built like the ones of the sparp command (cli.record_callbacks), so parse_response should
+    return JSON-serializable dicts. Retry, status code and exception counters belong to the whole engine:
+    each completed chunk reports how much they grew since the previous one completed.
+    """
+
+    UNSUPPORTED: tuple[str, ...] = ("ordered", "load_profile")
+    # Chunks held at once: the one running and the one leased ahead
+    CHUNKS_HELD: int = 2
+
+    def __init__(
+        self: Self,
+        inspect_response: Callable[[aiohttp.ClientResponse], ResponseState],
+        host: str = "127.0.0.1",
+        port: int = 8800,
+        connect_timeout_s: float = 30.0,
+        **sparp_kwargs: Any,
+    ) -> None:
+        """Stores the coordinator address and builds the engine.
+
+        Connecting is retried for up to connect_timeout_s, so workers may start before the coordinator.
+        """
+        if "retain_results" in sparp_kwargs:
+            raise ValueError("Worker sets retain_results itself")
+        unsupported: List[str] = [name for name in self.UNSUPPORTED if sparp_kwargs.get(name)]
+        if unsupported:
+            raise ValueError(f"Worker does not support {', '.join(unsupported)}")
+        self.inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] = inspect_response
+        self.host: str = host
+        self.port: int = port
+        self.connect_timeout_s: float = connect_timeout_s
+        self.chunks: int = 0
+        self._sparp: SPARP = SPARP((), inspect_response, retain_results=False, **sparp_kwargs)
+        # Chunks are submitted as they arrive, so the engine waits for more until the coordinator is done
+        self._sparp._activity.open_sources += 1
+        self._chunks: Dict[int, _Chunk] = {}
+        self._requested: int = 0
+        self._leasing: bool = True
+        self._closed: bool = False
+        self._error: BaseException | None = None
+        self._reported: SparpStats = self._sparp.get_stats()
+
+    async def _heartbeat(self: Self, writer: asyncio.StreamWriter, lease_id: int, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            writer.write(_dumps({"type": "heartbeat", "lease": lease_id}))
+            await writer.drain()
+
+    async def _connect(self: Self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        deadline: float = time.monotonic() + self.connect_timeout_s
+        while True:
+            try:
+                return await asyncio.open_connection(self.host, self.port)
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+    def _lease(self: Self) -> None:
+        """Asks for chunks until CHUNKS_HELD are held or asked for, unless the coordinator is done."""
+        while self._leasing and len(self._chunks) + self._requested < self.CHUNKS_HELD:
+            self._writer.write(_dumps({"type": "lease"}))
+            self._requested += 1
+
+    def _close_if_idle(self: Self) -> None:
+        """Lets the engine finish once the coordinator is done and every chunk held is complete."""
+        if not self._leasing and not self._chunks and not self._closed:
+            self._closed = True
+            self._sparp._activity.close_source()
+
+    async def _listen(self: Self, reader: asyncio.StreamReader) -> None:
+        """Hands the chunks sent by the coordinator to the engine; returns when the connection closes."""
+        while line := await reader.readline():
+            message: Dict[str, Any] = _loads(line)
+            self._requested -= 1
+            if message["type"] == "done":
+                self._leasing = False
+                self._close_if_idle()
+                continue
+            lease_id: int = message["lease"]
+            heartbeat: asyncio.Task[None] = asyncio.create_task(
+                self._heartbeat(self._writer, lease_id, message["heartbeat_s"])
+            )
+            chunk: _Chunk = _Chunk(lease_id, len(message["items"]), heartbeat)
+            self._chunks[lease_id] = chunk
+            for item in message["items"]:
+                self._sparp._submit(item, functools.partial(self._outcome, chunk))
+            self._lease()
+            await self._writer.drain()
+
+    def _outcome(self: Self, chunk: _Chunk, kind: str | None, value: Any) -> None:
+        """Streams the record of one final outcome, completing its chunk with the last one."""
+        if kind is None:
+            # An unexpected error ends the worker like it would end a run; its chunks are leased again
+            if self._error is None:
+                self._error = value
+                self._engine.cancel()
+            return
+        chunk.outcomes[kind] += 1
+        self._writer.write(_dumps({"type": "result", "lease": chunk.lease_id, "record": _record(kind, value)}))
+        chunk.pending -= 1
+        if not chunk.pending:
+            self._complete(chunk, None)
+            self._lease()
+            self._close_if_idle()
+
+    def _complete(self: Self, chunk: _Chunk, stop_reason: str | None) -> None:
+        """Reports a chunk as complete, with the growth of the engine counters since the last report."""
+        del self._chunks[chunk.lease_id]
+        chunk.heartbeat.cancel()
+        stats: SparpStats = self._sparp.get_stats()
+        reported: SparpStats = self._reported
+        self._reported = stats
+        self._writer.write(
+            _dumps(
+                {
+                    "type": "complete",
+                    "lease": chunk.lease_id,
+                    "stats": {
+                        **chunk.outcomes,
+                        "soft_retries": stats.soft_retries - reported.soft_retries,
+                        "timeout_retries": stats.timeout_retries - reported.timeout_retries,
+                        "retries_denied": stats.retries_denied - reported.retries_denied,
+                        "status_codes": {
+                            code: n - reported.status_codes.get(code, 0)
+                            for code, n in stats.status_codes.items()
+                            if n > reported.status_codes.get(code, 0)
+                        },
+                        "exceptions": {
+                            name: n - reported.exceptions.get(name, 0)
+                            for name, n in stats.exceptions.items()
+                            if n > reported.exceptions.get(name, 0)
+                        },
+                        "stop_reason": stop_reason,
+                    },
+                }
+            )
+        )
+        self.chunks += 1
+
+    async def _main(self: Self) -> int:
+        """Leases and runs chunks until the coordinator is done; returns the number of chunks completed."""
+        reader: asyncio.StreamReader
+        reader, self._writer = await self._connect()
+        self._engine: asyncio.Task[SparpResult] = asyncio.create_task(self._sparp._main())
+        listener: asyncio.Task[None] = asyncio.create_task(self._listen(reader))
+        try:
+            self._lease()
+            await asyncio.wait({self._engine, listener}, return_when=asyncio.FIRST_COMPLETED)
+            if not self._engine.done():
+                # The coordinator went away, or its messages could not be read
+                self._engine.cancel()
+                listener.result()
+            elif self._error is not None:
+                raise self._error
+            else:
+                stop_reason: str | None = self._engine.result().stats.stop_reason
+                if stop_reason is not None and self._chunks:
+                    # The chunks that got outcomes are complete as far as this run goes, and the first one
+                    # carries the stop reason even without any; the others are leased again on disconnect
+                    self._leasing = False
+                    held: List[_Chunk] = list(self._chunks.values())
+                    for chunk in held:
+                        if chunk is held[0] or any(chunk.outcomes.values()):
+                            self._complete(chunk, stop_reason)
+                await self._writer.drain()
+        finally:
+            listener.cancel()
+            for chunk in self._chunks.values():
+                chunk.heartbeat.cancel()
+            if not self._engine.done():
+                self._engine.cancel()
+            await asyncio.gather(self._engine, listener, return_exceptions=True)
+            self._writer.close()
+            await self._writer.wait_closed()
+        return self.chunks
+
+    def main(self: Self) -> int:
+        """Synchronous entry point to run the worker."""
+        return asyncio.run(self._main())
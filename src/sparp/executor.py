@@ -0,0 +1,143 @@
+import concurrent.futures
+import functools
+import threading
+from typing import Any, Callable, Dict, List, Self
+
+import aiohttp
+
+from .sparp import SPARP, ResponseState, SparpHandle, SparpResult
+
+
+class RequestFailed(Exception):
+    """Raised by the future of a submitted request that did not succeed.
+
+    kind is "failed" for a HARD_FAIL, value then being the parsed response, or "max_retries_soft_fail_reached"
+    / "max_retries_timeout_reached" when the request ran out of retries, value then being the request.
+    """
+
+    def __init__(self: Self, kind: str, value: Any) -> None:
+        super().__init__(f"request ended as {kind}")
+        self.kind: str = kind
+        self.value: Any = value
+
+
+class SPARPExecutor(SparpHandle):
+    """A long-lived SPARP engine on its own thread and event loop that takes requests as they come.
+
+    submit(request_dict) returns a concurrent.futures.Future of the parsed response, raising RequestFailed
+    for failures and the original exception for unexpected errors (which no longer end the run); await it from
+    async code with asyncio.wrap_future. The transport session and workers stay warm between submissions, and
+    requests go through the same classification, retries, stop conditions and stats as a regular run.
+
+    Submissions are batched: the first one of a batch wakes the engine's loop once, which takes every request
+    submitted by then, and batch_linger_s delays that wake-up so bursts coalesce further. sparp_kwargs are
+    passed to the engine; retain_results defaults to False since outcomes are delivered through the futures.
+    ordered and load_profile only apply to a finite input and are not supported. Call shutdown() (or use the
+    executor as a context manager) to finish the requests submitted so far and collect the final result.
+    """
+
+    UNSUPPORTED: tuple[str, ...] = ("ordered", "load_profile")
+
+    def __init__(
+        self: Self,
+        inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] | None,
+        batch_linger_s: float = 0.0,
+        **sparp_kwargs: Any,
+    ) -> None:
+        """Builds the engine and starts its loop."""
+        unsupported: List[str] = [name for name in self.UNSUPPORTED if sparp_kwargs.get(name)]
+        if unsupported:
+            raise ValueError(f"SPARPExecutor does not support {', '.join(unsupported)}")
+        if batch_linger_s < 0:
+            raise ValueError("batch_linger_s should not be negative")
+        sparp_kwargs.setdefault("retain_results", False)
+        sparp: SPARP = SPARP((), inspect_response, **sparp_kwargs)
+        # The executor is an input that stays open until shutdown(), so the engine waits for submissions
+        sparp._activity.open_sources += 1
+        self.batch_linger_s: float = batch_linger_s
+        self._buffer: List[tuple[Dict[str, Any], concurrent.futures.Future[Any]]] = []
+        self._unresolved: set[concurrent.futures.Future[Any]] = set()
+        self._futures_lock: threading.Lock = threading.Lock()
+        self._shut_down: bool = False
+        super().__init__(sparp)
+
+    def _run(self: Self, loop_ready: threading.Event) -> None:
+        super()._run(loop_ready)
+        # Whatever is still unresolved was queued or in flight when the engine stopped
+        error: BaseException = self._error or RuntimeError(
+            f"SPARPExecutor stopped: {self.sparp.stop_reason or 'shut down'}"
+        )
+        with self._futures_lock:
+            unresolved: List[concurrent.futures.Future[Any]] = list(self._unresolved)
+            self._unresolved.clear()
+        for future in unresolved:
+            self._settle(future, error)
+
+    def submit(self: Self, request_dict: Dict[str, Any]) -> concurrent.futures.Future[Any]:
+        """Queues one request; the future resolves to its parsed response once it reaches a final state."""
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        with self._lock:
+            if self._shut_down or self._finished or self._loop is None:
+                raise RuntimeError("cannot submit to a SPARPExecutor that is shut down")
+            with self._futures_lock:
+                self._buffer.append((request_dict, future))
+                self._unresolved.add(future)
+                first: bool = len(self._buffer) == 1
+            if first:
+                if self.batch_linger_s:
+                    self._loop.call_soon_threadsafe(self._loop.call_later, self.batch_linger_s, self._drain)
+                else:
+                    self._loop.call_soon_threadsafe(self._drain)
+        return future
+
+    def _drain(self: Self) -> None:
+        """Hands the buffered submissions to the engine, on its loop."""
+        with self._futures_lock:
+            batch: List[tuple[Dict[str, Any], concurrent.futures.Future[Any]]] = self._buffer
+            self._buffer = []
+        for request_dict, future in batch:
+            self.sparp._submit(request_dict, functools.partial(self._resolve, future))
+
+    def _resolve(self: Self, future: concurrent.futures.Future[Any], kind: str | None, value: Any) -> None:
+        with self._futures_lock:
+            self._unresolved.discard(future)
+        if kind is None:
+            self._settle(future, value)
+        elif kind == "success":
+            self._settle(future, value, succeeded=True)
+        else:
+            self._settle(future, RequestFailed(kind, value))
+
+    @staticmethod
+    def _settle(future: concurrent.futures.Future[Any], value: Any, succeeded: bool = False) -> None:
+        try:
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        except concurrent.futures.InvalidStateError:
+            # Cancelled by the caller in the meantime
+            pass
+
+    def shutdown(self: Self, wait: bool = True) -> SparpResult | None:
+        """Stops taking submissions; the engine finishes the ones it has, then stops.
+
+        With wait=True, blocks until then and returns the result of the whole run (counters, reducers, and
+        the outcomes themselves if retain_results was set).
+        """
+        with self._lock:
+            if not self._shut_down and not self._finished and self._loop is not None:
+                self._loop.call_soon_threadsafe(self._close)
+            self._shut_down = True
+        return self.result() if wait else None
+
+    def _close(self: Self) -> None:
+        # Submissions scheduled before shutdown() still count
+        self._drain()
+        self.sparp._activity.close_source()
+
+    def __enter__(self: Self) -> Self:
+        return self
+
+    def __exit__(self: Self, *exc_info: Any) -> None:
+        self.shutdown()
@@ -0,0 +1,213 @@
+import collections
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Self
+
+
+class LoadProfile(ABC):
+    """Open-loop schedule of intended request start times, in seconds from the start of the run.
+
+    Requests are dispatched when their time comes, whether or not earlier ones have completed. Dispatch
+    stops when the input runs out or, if duration_s is set, once the schedule passes duration_s.
+    """
+
+    def __init__(self: Self, duration_s: float | None = None) -> None:
+        self.duration_s: float | None = duration_s
+
+    @abstractmethod
+    def _offsets(self: Self) -> Iterator[float]:
+        """Yields the intended start offsets of the whole schedule, ignoring duration_s."""
+
+    @abstractmethod
+    def expected(self: Self, elapsed_s: float) -> float:
+        """Number of requests the profile intends to start during the first elapsed_s seconds."""
+
+    def offsets(self: Self) -> Iterator[float]:
+        """Yields the intended start offset of each request, in increasing order."""
+        for offset in self._offsets():
+            if self.duration_s is not None and offset >= self.duration_s:
+                return
+            yield offset
+
+
+class ConstantRate(LoadProfile):
+    """Starts rate_per_s requests per second at evenly spaced times."""
+
+    def __init__(self: Self, rate_per_s: float, duration_s: float | None = None) -> None:
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s should be positive")
+        super().__init__(duration_s)
+        self.rate_per_s: float = rate_per_s
+
+    def _offsets(self: Self) -> Iterator[float]:
+        i: int = 0
+        while True:
+            yield i / self.rate_per_s
+            i += 1
+
+    def expected(self: Self, elapsed_s: float) -> float:
+        return elapsed_s * self.rate_per_s
+
+
+class PoissonRate(ConstantRate):
+    """Starts rate_per_s requests per second on average, with exponentially distributed gaps (a Poisson process)."""
+
+    def __init__(self: Self, rate_per_s: float, duration_s: float | None = None, seed: int | None = None) -> None:
+        super().__init__(rate_per_s, duration_s)
+        self.seed: int | None = seed
+
+    def _offsets(self: Self) -> Iterator[float]:
+        rng: random.Random = random.Random(self.seed)
+        offset: float = 0.0
+        while True:
+            yield offset
+            offset += rng.expovariate(self.rate_per_s)
+
+
+class RampRate(LoadProfile):
+    """Ramps the rate linearly from start_rate_per_s to end_rate_per_s over ramp_s seconds, then holds it."""
+
+    def __init__(
+        self: Self,
+        start_rate_per_s: float,
+        end_rate_per_s: float,
+        ramp_s: float,
+        duration_s: float | None = None,
+    ) -> None:
+        if start_rate_per_s < 0 or end_rate_per_s <= 0 or ramp_s <= 0:
+            raise ValueError("rates and ramp_s should be positive (start_rate_per_s may be 0)")
+        super().__init__(duration_s)
+        self.start_rate_per_s: float = start_rate_per_s
+        self.end_rate_per_s: float = end_rate_per_s
+        self.ramp_s: float = ramp_s
+
+    def expected(self: Self, elapsed_s: float) -> float:
+        r0: float = self.start_rate_per_s
+        slope: float = (self.end_rate_per_s - r0) / self.ramp_s
+        if elapsed_s <= self.ramp_s:
+            return r0 * elapsed_s + slope * elapsed_s * elapsed_s / 2
+        return self.expected(self.ramp_s) + (elapsed_s - self.ramp_s) * self.end_rate_per_s
+
+    def _offsets(self: Self) -> Iterator[float]:
+        r0: float = self.start_rate_per_s
+        slope: float = (self.end_rate_per_s - r0) / self.ramp_s
+        ramp_count: float = self.expected(self.ramp_s)
+        k: int = 0
+        while True:
+            if k <= ramp_count:
+                # Solves expected(t) == k on the ramp
+                if slope == 0:
+                    yield k / r0
+                else:
+                    yield (-r0 + math.sqrt(r0 * r0 + 2 * slope * k)) / slope
+            else:
+                yield self.ramp_s + (k - ramp_count) / self.end_rate_per_s
+            k += 1
+
+
+class LatencyHistogram:
+    """Latencies in log-spaced buckets of about 1% relative width, so memory stays constant for any run."""
+
+    MIN_S: float = 1e-6
+
+    def __init__(self: Self, precision: float = 0.01) -> None:
+        self._log_base: float = math.log1p(precision)
+        self.buckets: Dict[int, int] = collections.defaultdict(int)
+        self.count: int = 0
+        self.total_s: float = 0.0
+        self.max_s: float = 0.0
+
+    def record(self: Self, latency_s: float) -> None:
+        self.buckets[int(math.log(max(latency_s, self.MIN_S) / self.MIN_S) / self._log_base)] += 1
+        self.count += 1
+        self.total_s += latency_s
+        if latency_s > self.max_s:
+            self.max_s = latency_s
+
+    def percentile(self: Self, q: float) -> float:
+        """Returns the latency below which a fraction q of the recorded latencies fall (upper bucket bound)."""
+        if self.count == 0:
+            return 0.0
+        rank: float = q * self.count
+        seen: int = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.MIN_S * math.exp((bucket + 1) * self._log_base), self.max_s)
+        return self.max_s
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """Outcome of an open-loop run (see LoadProfile).
+
+    Latencies are measured from each request's intended start time to its final outcome, so time spent
+    waiting for a free worker or behind a late dispatch counts (no coordinated omission).
+
+    Attributes:
+        dispatch_s: Time from the start of the run to the last dispatch.
+        dispatched: Number of requests dispatched on the schedule.
+        completed: Number of those requests that reached a final state.
+        target_rate_per_s: Mean rate the profile asked for over dispatch_s.
+        achieved_rate_per_s: Mean rate requests were actually dispatched at over dispatch_s (gaps between them).
+        max_dispatch_lag_s: Longest delay between a request's intended and actual dispatch.
+        latency_mean_s, latency_p50_s, latency_p90_s, latency_p99_s, latency_p999_s, latency_max_s: Latencies.
+    """
+
+    dispatch_s: float
+    dispatched: int
+    completed: int
+    target_rate_per_s: float
+    achieved_rate_per_s: float
+    max_dispatch_lag_s: float
+    latency_mean_s: float
+    latency_p50_s: float
+    latency_p90_s: float
+    latency_p99_s: float
+    latency_p999_s: float
+    latency_max_s: float
+
+    def summary(self: Self) -> str:
+        """Returns a human-readable report."""
+        lines: List[str] = [
+            f"dispatched: {self.dispatched} in {self.dispatch_s:.2f}s, target {self.target_rate_per_s:.1f}/s, "
+            f"achieved {self.achieved_rate_per_s:.1f}/s, max dispatch lag {1e3 * self.max_dispatch_lag_s:.2f}ms",
+            f"latency over {self.completed} requests: mean {1e3 * self.latency_mean_s:.2f}ms, "
+            f"p50 {1e3 * self.latency_p50_s:.2f}ms, p90 {1e3 * self.latency_p90_s:.2f}ms, "
+            f"p99 {1e3 * self.latency_p99_s:.2f}ms, p99.9 {1e3 * self.latency_p999_s:.2f}ms, "
+            f"max {1e3 * self.latency_max_s:.2f}ms",
+        ]
+        return "\n".join(lines)
+
+
+class _LoadCollector:
+    """Live schedule and latency state behind a LoadReport."""
+
+    def __init__(self: Self, profile: LoadProfile) -> None:
+        self.profile: LoadProfile = profile
+        self.started_at: float = time.perf_counter()
+        self.last_dispatch_at: float = self.started_at
+        self.dispatched: int = 0
+        self.max_dispatch_lag_s: float = 0.0
+        self.latency: LatencyHistogram = LatencyHistogram()
+
+    def snapshot(self: Self) -> LoadReport:
+        dispatch_s: float = self.last_dispatch_at - self.started_at
+        latency: LatencyHistogram = self.latency
+        return LoadReport(
+            dispatch_s=dispatch_s,
+            dispatched=self.dispatched,
+            completed=latency.count,
+            target_rate_per_s=self.profile.expected(dispatch_s) / dispatch_s if dispatch_s > 0 else 0.0,
+            achieved_rate_per_s=(self.dispatched - 1) / dispatch_s if dispatch_s > 0 else 0.0,
+            max_dispatch_lag_s=self.max_dispatch_lag_s,
+            latency_mean_s=latency.total_s / latency.count if latency.count else 0.0,
+            latency_p50_s=latency.percentile(0.5),
+            latency_p90_s=latency.percentile(0.9),
+            latency_p99_s=latency.percentile(0.99),
+            latency_p999_s=latency.percentile(0.999),
+            latency_max_s=latency.max_s,
+        )
@@ -0,0 +1,164 @@
+import collections
+import time
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Self, Sequence
+
+
+@dataclass(frozen=True)
+class MirrorStats:
+    """Live state of one origin of a MirrorPool.
+
+    Attributes:
+        origin: The origin, as given to MirrorPool.
+        requests: Number of attempts sent to it.
+        outstanding: Number of attempts in flight.
+        failures: Number of attempts that timed out or soft-failed.
+        ewma_latency_s: Exponentially weighted mean time to the response headers.
+        healthy: False while it is out of rotation.
+    """
+
+    origin: str
+    requests: int
+    outstanding: int
+    failures: int
+    ewma_latency_s: float
+    healthy: bool
+
+
+class _Mirror:
+    """Selection and health state of one origin."""
+
+    __slots__ = (
+        "origin",
+        "scheme",
+        "netloc",
+        "outstanding",
+        "requests",
+        "failures",
+        "ewma_s",
+        "recent",
+        "ejected_until",
+    )
+
+    def __init__(self: Self, origin: str, window: int) -> None:
+        parts: urllib.parse.SplitResult = urllib.parse.urlsplit(origin)
+        if not parts.scheme or not parts.netloc:
+            raise ValueError(f"Mirror origin should look like scheme://host[:port], got {origin!r}")
+        self.origin: str = origin
+        self.scheme: str = parts.scheme
+        self.netloc: str = parts.netloc
+        self.outstanding: int = 0
+        self.requests: int = 0
+        self.failures: int = 0
+        self.ewma_s: float = 0.0
+        # Outcomes of the last attempts, True for a failure
+        self.recent: collections.deque[bool] = collections.deque(maxlen=window)
+        self.ejected_until: float = 0.0
+
+
+class MirrorPool:
+    """Equivalent origins (scheme://host[:port]) that SPARP spreads requests over as it dispatches them.
+
+    Every attempt, retries included, picks an origin and has the scheme and host of its url rewritten to it;
+    the path and query are kept. strategy="least_outstanding" picks the origin with the fewest attempts in
+    flight, strategy="ewma" the lowest exponentially weighted latency times (attempts in flight + 1), so
+    traffic follows whichever origins are fastest right now. An origin whose last window attempts include at
+    least min_attempts attempts and a failure_ratio share of timeouts and soft fails is taken out of rotation
+    for cooldown_s seconds, then tried again with a clean window. If every origin is out, all are used.
+    """
+
+    def __init__(
+        self: Self,
+        origins: Sequence[str],
+        strategy: Literal["least_outstanding", "ewma"] = "least_outstanding",
+        ewma_alpha: float = 0.3,
+        window: int = 20,
+        min_attempts: int = 5,
+        failure_ratio: float = 0.5,
+        cooldown_s: float = 10.0,
+    ) -> None:
+        """Validates and stores the origins and the selection and health settings."""
+        if not origins:
+            raise ValueError("MirrorPool needs at least one origin")
+        if strategy not in ("least_outstanding", "ewma"):
+            raise ValueError("strategy should be 'least_outstanding' or 'ewma'")
+        if not 0 < ewma_alpha <= 1 or not 0 < failure_ratio <= 1:
+            raise ValueError("ewma_alpha and failure_ratio should be in (0, 1]")
+        if window < 1 or min_attempts < 1:
+            raise ValueError("window and min_attempts should be at least 1")
+        self.strategy: str = strategy
+        self.ewma_alpha: float = ewma_alpha
+        self.min_attempts: int = min(min_attempts, window)
+        self.failure_ratio: float = failure_ratio
+        self.cooldown_s: float = cooldown_s
+        self.mirrors: List[_Mirror] = [_Mirror(origin, window) for origin in origins]
+        # Rotates the scan start so ties do not always go to the first origin
+        self._next_start: int = 0
+
+    def acquire(self: Self) -> _Mirror:
+        """Picks the origin for one attempt and counts the attempt as in flight."""
+        now: float = time.monotonic()
+        mirrors: List[_Mirror] = self.mirrors
+        start: int = self._next_start
+        self._next_start = (start + 1) % len(mirrors)
+        best: _Mirror | None = None
+        best_score: float = 0.0
+        for fallback in (False, True):
+            for i in range(len(mirrors)):
+                mirror: _Mirror = mirrors[(start + i) % len(mirrors)]
+                if not fallback and mirror.ejected_until > now:
+                    continue
+                score: float = (
+                    mirror.outstanding
+                    if self.strategy == "least_outstanding"
+                    else mirror.ewma_s * (mirror.outstanding + 1)
+                )
+                if best is None or score < best_score:
+                    best, best_score = mirror, score
+            if best is not None:
+                break
+        assert best is not None
+        if best.ejected_until and best.ejected_until <= now:
+            # Back in rotation after the cooldown, judged on new attempts only
+            best.ejected_until = 0.0
+            best.recent.clear()
+        best.outstanding += 1
+        best.requests += 1
+        return best
+
+    def release(self: Self, mirror: _Mirror, failed: bool, latency_s: float) -> None:
+        """Records the outcome of an attempt; failed is True for timeouts and soft fails."""
+        mirror.outstanding -= 1
+        if mirror.ewma_s == 0.0:
+            mirror.ewma_s = latency_s
+        else:
+            mirror.ewma_s += self.ewma_alpha * (latency_s - mirror.ewma_s)
+        recent: collections.deque[bool] = mirror.recent
+        recent.append(failed)
+        if failed:
+            mirror.failures += 1
+            if len(recent) >= self.min_attempts and sum(recent) >= self.failure_ratio * len(recent):
+                mirror.ejected_until = time.monotonic() + self.cooldown_s
+                recent.clear()
+
+    @staticmethod
+    def rewrite(req: Dict[str, Any], mirror: _Mirror) -> Dict[str, Any]:
+        """Returns a copy of req whose url points at the mirror."""
+        parts: urllib.parse.SplitResult = urllib.parse.urlsplit(req["url"])
+        return {**req, "url": urllib.parse.urlunsplit(parts._replace(scheme=mirror.scheme, netloc=mirror.netloc))}
+
+    def snapshot(self: Self) -> List[MirrorStats]:
+        """Returns the live state of every origin, in the order given."""
+        now: float = time.monotonic()
+        return [
+            MirrorStats(
+                origin=mirror.origin,
+                requests=mirror.requests,
+                outstanding=mirror.outstanding,
+                failures=mirror.failures,
+                ewma_latency_s=mirror.ewma_s,
+                healthy=mirror.ejected_until <= now,
+            )
+            for mirror in self.mirrors
+        ]
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Dict, Self
+
+from .sparp import SPARP, SparpResult, _Activity
+
+
+class _StageStopped(Exception):
+    """Raised when a stop condition ended one stage while other stages still had work."""
+
+    pass
+
+
+class Pipeline:
+    """Runs several SPARP instances (stages) at the same time, linked by follow-ups emitted from parse_response.
+
+    Each stage keeps its own configuration, concurrency included. Inside parse_response, emit(item, stage=name)
+    queues item into another stage and emit(item) into the running stage itself, so pagination and fan-out
+    (list -> items -> details) flow through without materializing intermediate results. Downstream stages
+    usually start with an empty input_collection. All stages finish together once every input collection is
+    exhausted and no request or follow-up is left anywhere; a stop condition in one stage stops them all.
+    """
+
+    def __init__(self: Self, stages: Dict[str, SPARP]) -> None:
+        """Links the stages, keyed by the names used with emit(), so they share one completion tracker."""
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages: Dict[str, SPARP] = dict(stages)
+        self._activity: _Activity = _Activity(open_sources=len(self.stages))
+        for sparp in self.stages.values():
+            sparp._activity = self._activity
+            sparp._stages = self.stages
+
+    async def _run_stage(self: Self, name: str, sparp: SPARP, results: Dict[str, SparpResult]) -> None:
+        results[name] = await sparp._main()
+        if not self._activity.idle:
+            # A stage only returns early when one of its stop conditions fired
+            raise _StageStopped(name)
+
+    async def _main(self: Self) -> Dict[str, SparpResult]:
+        """Runs all stages concurrently and returns their results keyed by stage name."""
+        results: Dict[str, SparpResult] = {}
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for name, sparp in self.stages.items():
+                    tg.create_task(self._run_stage(name, sparp, results))
+        except* _StageStopped:
+            pass
+        for name, sparp in self.stages.items():
+            if name not in results:
+                results[name] = await sparp._finalize()
+        return {name: results[name] for name in self.stages}
+
+    def main(self: Self) -> Dict[str, SparpResult]:
+        """Synchronous entry point to run the pipeline."""
+        return asyncio.run(self._main())
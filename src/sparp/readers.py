@@ -0,0 +1,222 @@
+import array
+import bisect
+import csv
+import json
+import mmap
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Self
+
+try:
+    import orjson
+
+    _loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:  # pragma: no cover - depends on the installed extras
+    _loads = json.loads
+
+DEFAULT_CHUNK_SIZE: int = 1 << 22
+
+
+@dataclass(frozen=True)
+class LineIndex:
+    """Sparse line-count index of a line-oriented file, with one entry per read chunk.
+
+    Attributes:
+        line_count: Number of data lines in the file (a last line without trailing newline counts).
+        lines: Line number at the start of each indexed chunk.
+        offsets: Byte offset at the start of each indexed chunk.
+    """
+
+    line_count: int
+    lines: "array.array[int]"
+    offsets: "array.array[int]"
+
+
+class _LineReader:
+    """Reads a file line by line through large mmap'd chunks while tracking the byte offset."""
+
+    def __init__(
+        self: Self,
+        path: str | os.PathLike[str],
+        start_offset: int = 0,
+        start_line: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Initializes the reader; start_offset must point at the start of a line."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size should be a positive number of bytes")
+        self.path: str | os.PathLike[str] = path
+        self.chunk_size: int = chunk_size
+        self.start_offset: int = start_offset
+        self.start_line: int = start_line
+        self.offset: int = start_offset
+        self._index: LineIndex | None = None
+
+    def _data_start(self: Self) -> int:
+        """Returns the byte offset where data lines start (after any header)."""
+        return 0
+
+    def _chunks(self: Self, start: int) -> Iterator[tuple[int, bytes]]:
+        """Yields (offset, chunk) pairs of whole lines, starting at byte offset start."""
+        with open(self.path, "rb") as f:
+            size: int = os.fstat(f.fileno()).st_size
+            if start >= size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos: int = start
+                while pos < size:
+                    end: int = min(pos + self.chunk_size, size)
+                    if end < size:
+                        newline: int = mm.rfind(b"\n", pos, end)
+                        if newline == -1:
+                            # A single line longer than the chunk size
+                            newline = mm.find(b"\n", end)
+                        end = size if newline == -1 else newline + 1
+                    yield pos, mm[pos:end]
+                    pos = end
+
+    def build_index(self: Self) -> LineIndex:
+        """Counts the data lines in one pass, recording the line number and byte offset of every chunk."""
+        lines: array.array[int] = array.array("q")
+        offsets: array.array[int] = array.array("q")
+        line_count: int = 0
+        last_byte: bytes = b"\n"
+        for chunk_start, chunk in self._chunks(self._data_start()):
+            lines.append(line_count)
+            offsets.append(chunk_start)
+            line_count += chunk.count(b"\n")
+            last_byte = chunk[-1:]
+        if last_byte != b"\n":
+            line_count += 1
+        self._index = LineIndex(line_count=line_count, lines=lines, offsets=offsets)
+        return self._index
+
+    def count_lines(self: Self) -> int:
+        """Returns the number of data lines left to read from the configured start position."""
+        index: LineIndex = self._index or self.build_index()
+        if self.start_line:
+            return max(index.line_count - self.start_line, 0)
+        if self.start_offset > self._data_start():
+            remaining: int = 0
+            last_byte: bytes = b"\n"
+            for _, chunk in self._chunks(self.start_offset):
+                remaining += chunk.count(b"\n")
+                last_byte = chunk[-1:]
+            return remaining + (last_byte != b"\n")
+        return index.line_count
+
+    def _seek_line(self: Self, line: int) -> int:
+        """Returns the byte offset of a data line, using the line index to skip most of the file."""
+        index: LineIndex = self._index or self.build_index()
+        if not index.offsets:
+            return self._data_start()
+        slot: int = max(bisect.bisect_right(index.lines, line) - 1, 0)
+        offset: int = index.offsets[slot]
+        remaining: int = line - index.lines[slot]
+        for _ in self._raw_lines(offset, skip_empty=False):
+            if remaining == 0:
+                break
+            remaining -= 1
+            offset = self.offset
+        return offset
+
+    def _raw_lines(self: Self, start: int, skip_empty: bool = True) -> Iterator[bytes]:
+        """Yields lines without their newline, keeping self.offset at the end of the last yielded line."""
+        for chunk_start, chunk in self._chunks(start):
+            n: int = len(chunk)
+            pos: int = 0
+            while pos < n:
+                end: int = chunk.find(b"\n", pos)
+                if end == -1:
+                    end = n
+                line: bytes = chunk[pos:end]
+                pos = end + 1
+                self.offset = chunk_start + min(pos, n)
+                if skip_empty and not line.strip():
+                    continue
+                yield line
+
+    def _lines(self: Self) -> Iterator[bytes]:
+        """Yields data lines from the configured start position."""
+        start: int = self.start_offset
+        if self.start_line:
+            start = self._seek_line(self.start_line)
+        start = max(start, self._data_start())
+        self.offset = start
+        yield from self._raw_lines(start)
+
+
+class JsonlReader(_LineReader):
+    """Streams request dicts out of a JSONL file, one JSON object per line.
+
+    Lines are decoded with orjson when it is installed, falling back to the standard json module.
+    After each yielded item, offset holds the byte offset of the next unread line. It is a read position
+    only: in a run it is ahead of the items still queued or in flight, so a job resumed from it with
+    start_offset skips them.
+    """
+
+    def __init__(
+        self: Self,
+        path: str | os.PathLike[str],
+        start_offset: int = 0,
+        start_line: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        loads: Callable[[bytes], Any] = _loads,
+    ) -> None:
+        """Initializes the reader with an optional start position and decoder."""
+        super().__init__(path, start_offset=start_offset, start_line=start_line, chunk_size=chunk_size)
+        self.loads: Callable[[bytes], Any] = loads
+
+    def __iter__(self: Self) -> Iterator[Dict[str, Any]]:
+        loads: Callable[[bytes], Any] = self.loads
+        for line in self._lines():
+            yield loads(line)
+
+
+class CsvReader(_LineReader):
+    """Streams rows of a CSV file with a header line, converting each row into a request dict.
+
+    Every record must fit on a single line (no quoted newlines), which is what makes the byte offsets and
+    the line index exact. start_line counts data rows, not including the header.
+    """
+
+    def __init__(
+        self: Self,
+        path: str | os.PathLike[str],
+        to_request: Callable[[Dict[str, str]], Dict[str, Any]] | None = None,
+        start_offset: int = 0,
+        start_line: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        delimiter: str = ",",
+        encoding: str = "utf-8",
+    ) -> None:
+        """Initializes the reader; without to_request every row is used as request kwargs as-is."""
+        super().__init__(path, start_offset=start_offset, start_line=start_line, chunk_size=chunk_size)
+        self.to_request: Callable[[Dict[str, str]], Dict[str, Any]] | None = to_request
+        self.delimiter: str = delimiter
+        self.encoding: str = encoding
+        self._header: list[str] | None = None
+        self._header_end: int = 0
+
+    def _read_header(self: Self) -> list[str]:
+        """Reads and caches the header line."""
+        if self._header is None:
+            with open(self.path, "rb") as f:
+                first: bytes = f.readline()
+            self._header_end = len(first)
+            self._header = next(csv.reader([first.decode(self.encoding)], delimiter=self.delimiter), [])
+        return self._header
+
+    def _data_start(self: Self) -> int:
+        self._read_header()
+        return self._header_end
+
+    def __iter__(self: Self) -> Iterator[Dict[str, Any]]:
+        header: list[str] = self._read_header()
+        encoding: str = self.encoding
+        rows: Iterator[list[str]] = csv.reader(
+            (line.decode(encoding) for line in self._lines()), delimiter=self.delimiter
+        )
+        for row in rows:
+            record: Dict[str, str] = dict(zip(header, row))
+            yield self.to_request(record) if self.to_request else record
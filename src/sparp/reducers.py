@@ -0,0 +1,183 @@
+import bisect
+import collections
+import heapq
+import itertools
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, Iterator, List, Sequence, Self
+
+if TYPE_CHECKING:
+    from .sparp import ResponseState
+
+
+class Reducer(ABC):
+    """Folds parsed responses into an accumulator as they arrive, so aggregates need no per-result storage.
+
+    init() returns an empty accumulator, accumulate(acc, parsed) folds one parsed response into it and
+    returns the new accumulator, and merge(a, b) combines accumulators built separately (e.g. by parallel
+    runs), which must give the same answer as folding everything into one. result(acc) turns the final
+    accumulator into the value reported in SparpResult.reduced. finish(acc) is called once on the final
+    accumulator when the run is over, before the last result(), so a reducer can flush buffers or close files.
+
+    states selects the outcomes that are folded; None folds SUCCESS responses only.
+    """
+
+    def __init__(self: Self, states: Iterable["ResponseState"] | None = None) -> None:
+        self.states: frozenset["ResponseState"] | None = frozenset(states) if states is not None else None
+
+    @abstractmethod
+    def init(self: Self) -> Any:
+        """Returns an empty accumulator."""
+
+    @abstractmethod
+    def accumulate(self: Self, acc: Any, parsed: Any) -> Any:
+        """Folds one parsed response into acc and returns the new accumulator."""
+
+    @abstractmethod
+    def merge(self: Self, a: Any, b: Any) -> Any:
+        """Combines two accumulators built separately."""
+
+    def result(self: Self, acc: Any) -> Any:
+        return acc
+
+    def finish(self: Self, acc: Any) -> Any:
+        return acc
+
+
+class Count(Reducer):
+    """Counts responses, or counts them by key(parsed) into a Counter (e.g. by status)."""
+
+    def __init__(
+        self: Self,
+        key: Callable[[Any], Hashable] | None = None,
+        states: Iterable["ResponseState"] | None = None,
+    ) -> None:
+        super().__init__(states)
+        self.key: Callable[[Any], Hashable] | None = key
+
+    def init(self: Self) -> int | collections.Counter[Hashable]:
+        return 0 if self.key is None else collections.Counter()
+
+    def accumulate(self: Self, acc: Any, parsed: Any) -> Any:
+        if self.key is None:
+            return acc + 1
+        acc[self.key(parsed)] += 1
+        return acc
+
+    def merge(self: Self, a: Any, b: Any) -> Any:
+        return a + b
+
+    def result(self: Self, acc: Any) -> Any:
+        return acc if self.key is None else collections.Counter(acc)
+
+
+class Sum(Reducer):
+    """Sums value(parsed) over responses."""
+
+    def __init__(self: Self, value: Callable[[Any], float], states: Iterable["ResponseState"] | None = None) -> None:
+        super().__init__(states)
+        self.value: Callable[[Any], float] = value
+
+    def init(self: Self) -> float:
+        return 0
+
+    def accumulate(self: Self, acc: float, parsed: Any) -> float:
+        return acc + self.value(parsed)
+
+    def merge(self: Self, a: float, b: float) -> float:
+        return a + b
+
+
+class Histogram(Reducer):
+    """Counts value(parsed) into buckets split at the sorted bounds.
+
+    The result has len(bounds) + 1 counts: bucket i holds values in [bounds[i - 1], bounds[i]), the first
+    bucket everything below bounds[0] and the last everything from bounds[-1] on.
+    """
+
+    def __init__(
+        self: Self,
+        value: Callable[[Any], float],
+        bounds: Sequence[float],
+        states: Iterable["ResponseState"] | None = None,
+    ) -> None:
+        super().__init__(states)
+        if list(bounds) != sorted(bounds):
+            raise ValueError("bounds should be sorted")
+        self.value: Callable[[Any], float] = value
+        self.bounds: List[float] = list(bounds)
+
+    def init(self: Self) -> List[int]:
+        return [0] * (len(self.bounds) + 1)
+
+    def accumulate(self: Self, acc: List[int], parsed: Any) -> List[int]:
+        acc[bisect.bisect_right(self.bounds, self.value(parsed))] += 1
+        return acc
+
+    def merge(self: Self, a: List[int], b: List[int]) -> List[int]:
+        return [x + y for x, y in zip(a, b)]
+
+    def result(self: Self, acc: List[int]) -> List[int]:
+        return list(acc)
+
+
+class TopK(Reducer):
+    """Keeps the k responses with the largest key(parsed), in a heap of k entries; result is largest first."""
+
+    def __init__(
+        self: Self,
+        k: int,
+        key: Callable[[Any], Any],
+        states: Iterable["ResponseState"] | None = None,
+    ) -> None:
+        super().__init__(states)
+        if k < 1:
+            raise ValueError("k should be at least 1")
+        self.k: int = k
+        self.key: Callable[[Any], Any] = key
+        # Breaks ties between equal keys so parsed responses themselves are never compared
+        self._order: Iterator[int] = itertools.count()
+
+    def init(self: Self) -> List[tuple[Any, int, Any]]:
+        return []
+
+    def accumulate(self: Self, acc: List[tuple[Any, int, Any]], parsed: Any) -> List[tuple[Any, int, Any]]:
+        entry: tuple[Any, int, Any] = (self.key(parsed), next(self._order), parsed)
+        if len(acc) < self.k:
+            heapq.heappush(acc, entry)
+        elif entry[0] > acc[0][0]:
+            heapq.heapreplace(acc, entry)
+        return acc
+
+    def merge(self: Self, a: List[tuple[Any, int, Any]], b: List[tuple[Any, int, Any]]) -> List[tuple[Any, int, Any]]:
+        merged: List[tuple[Any, int, Any]] = heapq.nlargest(self.k, a + b)
+        heapq.heapify(merged)
+        return merged
+
+    def result(self: Self, acc: List[tuple[Any, int, Any]]) -> List[Any]:
+        return [parsed for _, _, parsed in sorted(acc, reverse=True)]
+
+
+class Unique(Reducer):
+    """Collects the distinct key(parsed) values (e.g. ids); memory grows with the number of distinct values."""
+
+    def __init__(self: Self, key: Callable[[Any], Hashable], states: Iterable["ResponseState"] | None = None) -> None:
+        super().__init__(states)
+        self.key: Callable[[Any], Hashable] = key
+
+    def init(self: Self) -> set[Hashable]:
+        return set()
+
+    def accumulate(self: Self, acc: set[Hashable], parsed: Any) -> set[Hashable]:
+        acc.add(self.key(parsed))
+        return acc
+
+    def merge(self: Self, a: set[Hashable], b: set[Hashable]) -> set[Hashable]:
+        return a | b
+
+    def result(self: Self, acc: set[Hashable]) -> set[Hashable]:
+        return set(acc)
+
+
+def merge_accumulators(reducers: Dict[str, Reducer], a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Merges two dicts of accumulators built with the same reducers, name by name."""
+    return {name: reducer.merge(a[name], b[name]) for name, reducer in reducers.items()}
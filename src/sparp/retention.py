@@ -0,0 +1,112 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, Self
+
+
+class RetentionPolicy(ABC):
+    """Decides which outcomes of one kind (e.g. hard failures) are kept in SparpResult.
+
+    Outcomes that are not kept are still counted in SparpStats. Every outcome kind a policy is used for
+    gets its own store from new_store().
+    """
+
+    @abstractmethod
+    def new_store(self: Self) -> "RetentionStore":
+        """Returns an empty store for one outcome kind."""
+
+
+class RetentionStore(ABC):
+    """Outcomes kept under a RetentionPolicy for one outcome kind."""
+
+    def __init__(self: Self) -> None:
+        self.kept: List[Any] = []
+        self.offered: int = 0
+
+    @abstractmethod
+    def offer(self: Self, item: Any) -> tuple[bool, Any]:
+        """Offers one outcome; returns whether it was kept and the outcome it evicted, or None."""
+
+
+class KeepFirst(RetentionPolicy):
+    """Keeps the first n outcomes and drops the rest."""
+
+    def __init__(self: Self, n: int) -> None:
+        if n < 0:
+            raise ValueError("n should not be negative")
+        self.n: int = n
+
+    def new_store(self: Self) -> RetentionStore:
+        return _FirstStore(self.n)
+
+
+class _FirstStore(RetentionStore):
+    def __init__(self: Self, n: int) -> None:
+        super().__init__()
+        self.n: int = n
+
+    def offer(self: Self, item: Any) -> tuple[bool, Any]:
+        self.offered += 1
+        if len(self.kept) < self.n:
+            self.kept.append(item)
+            return True, None
+        return False, None
+
+
+class ReservoirSample(RetentionPolicy):
+    """Keeps a uniform random sample of n outcomes out of all of them (reservoir sampling)."""
+
+    def __init__(self: Self, n: int, seed: int | None = None) -> None:
+        if n < 1:
+            raise ValueError("n should be at least 1")
+        self.n: int = n
+        self.seed: int | None = seed
+
+    def new_store(self: Self) -> RetentionStore:
+        return _ReservoirStore(self.n, random.Random(self.seed))
+
+
+class _ReservoirStore(RetentionStore):
+    def __init__(self: Self, n: int, rng: random.Random) -> None:
+        super().__init__()
+        self.n: int = n
+        self.rng: random.Random = rng
+
+    def offer(self: Self, item: Any) -> tuple[bool, Any]:
+        self.offered += 1
+        if len(self.kept) < self.n:
+            self.kept.append(item)
+            return True, None
+        slot: int = self.rng.randrange(self.offered)
+        if slot < self.n:
+            evicted: Any = self.kept[slot]
+            self.kept[slot] = item
+            return True, evicted
+        return False, None
+
+
+class Spill(RetentionPolicy):
+    """Keeps the first keep outcomes and hands every other one to sink (e.g. a function appending to a file)."""
+
+    def __init__(self: Self, sink: Callable[[Any], Any], keep: int = 0) -> None:
+        if keep < 0:
+            raise ValueError("keep should not be negative")
+        self.sink: Callable[[Any], Any] = sink
+        self.keep: int = keep
+
+    def new_store(self: Self) -> RetentionStore:
+        return _SpillStore(self.sink, self.keep)
+
+
+class _SpillStore(RetentionStore):
+    def __init__(self: Self, sink: Callable[[Any], Any], keep: int) -> None:
+        super().__init__()
+        self.sink: Callable[[Any], Any] = sink
+        self.keep: int = keep
+
+    def offer(self: Self, item: Any) -> tuple[bool, Any]:
+        self.offered += 1
+        if len(self.kept) < self.keep:
+            self.kept.append(item)
+            return True, None
+        self.sink(item)
+        return False, None
@@ -0,0 +1,230 @@
+import asyncio
+import collections
+from typing import Any, Callable, Dict, Self
+
+
+class HostScheduling:
+    """Fair dispatch between hosts: one sub-queue per host, served by deficit round-robin.
+
+    Each turn a host may dispatch weights[host] requests (1 by default, fractions carry over to its next
+    turn), so a host whose requests are slow or keep being retried gets its share of the workers instead of
+    all of them. max_in_flight_per_host caps the requests in flight to any host, and max_in_flight caps
+    specific hosts (overriding the default); a capped host waits while the others keep dispatching.
+    Items queued for a host at its cap do not count against input_buffer_size, so the input keeps being read
+    past a slow host listed first; up to max_queued_per_host of them, after which the producer waits.
+    Hosts are the host[:port] part of each request url.
+    """
+
+    def __init__(
+        self: Self,
+        max_in_flight_per_host: int | None = None,
+        max_in_flight: Dict[str, int] | None = None,
+        weights: Dict[str, float] | None = None,
+        max_queued_per_host: int = 10_000,
+    ) -> None:
+        """Validates and stores the caps, weights and queue bound."""
+        caps: Dict[str, int] = dict(max_in_flight or {})
+        if any(cap < 1 for cap in caps.values()) or (max_in_flight_per_host is not None and max_in_flight_per_host < 1):
+            raise ValueError("per-host caps should be at least 1")
+        if any(weight <= 0 for weight in (weights or {}).values()):
+            raise ValueError("weights should be positive")
+        if max_queued_per_host < 1:
+            raise ValueError("max_queued_per_host should be at least 1")
+        self.max_in_flight_per_host: int | None = max_in_flight_per_host
+        self.max_in_flight: Dict[str, int] = caps
+        self.weights: Dict[str, float] = dict(weights or {})
+        self.max_queued_per_host: int = max_queued_per_host
+
+
+class _HostQueue:
+    """Queued items and round-robin state of one host."""
+
+    __slots__ = ("items", "deficit", "weight", "in_flight", "cap", "active")
+
+    def __init__(self: Self, weight: float, cap: int | None) -> None:
+        self.items: collections.deque[Any] = collections.deque()
+        self.deficit: float = 0.0
+        self.weight: float = weight
+        self.in_flight: int = 0
+        self.cap: int | None = cap
+        # Whether the host is in the ring of hosts with queued items
+        self.active: bool = False
+
+
+class FairQueue:
+    """Bounded queue with the put/get/task_done/join interface of asyncio.Queue that serves hosts fairly.
+
+    host_of(item) names the host of an item, or returns None for control items (e.g. end-of-input markers),
+    which are served once no host has anything left. maxsize bounds the items queued for hosts that can
+    dispatch; a host at its cap queues up to scheduling.max_queued_per_host items on top of it.
+    release(host) must be called when an item taken with get() is finished, so per-host caps free up.
+    """
+
+    def __init__(self: Self, maxsize: int, scheduling: HostScheduling, host_of: Callable[[Any], str | None]) -> None:
+        self.maxsize: int = maxsize
+        self.scheduling: HostScheduling = scheduling
+        self.host_of: Callable[[Any], str | None] = host_of
+        self.hosts: Dict[str, _HostQueue] = {}
+        self._ring: collections.deque[_HostQueue] = collections.deque()
+        self._control: collections.deque[Any] = collections.deque()
+        self._size: int = 0
+        # Items queued for hosts at their cap, which do not count against maxsize
+        self._held: int = 0
+        self._getters: collections.deque[asyncio.Future[None]] = collections.deque()
+        self._putters: collections.deque[asyncio.Future[None]] = collections.deque()
+        self._unfinished: int = 0
+        self._finished: asyncio.Event = asyncio.Event()
+        self._finished.set()
+
+    @staticmethod
+    def _wake(waiters: collections.deque[asyncio.Future[None]]) -> None:
+        while waiters:
+            waiter: asyncio.Future[None] = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def _wait(self: Self, waiters: collections.deque[asyncio.Future[None]]) -> None:
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            waiter.cancel()
+            if waiter in waiters:
+                waiters.remove(waiter)
+            elif not waiter.cancelled():
+                # Woken right before being cancelled: pass the wake-up on
+                self._wake(waiters)
+            raise
+
+    def _host(self: Self, name: str) -> _HostQueue:
+        host: _HostQueue | None = self.hosts.get(name)
+        if host is None:
+            scheduling: HostScheduling = self.scheduling
+            host = self.hosts[name] = _HostQueue(
+                scheduling.weights.get(name, 1.0),
+                scheduling.max_in_flight.get(name, scheduling.max_in_flight_per_host),
+            )
+        return host
+
+    def qsize(self: Self) -> int:
+        return self._size + len(self._control)
+
+    def empty(self: Self) -> bool:
+        return not self._size and not self._control
+
+    def full(self: Self) -> bool:
+        return 0 < self.maxsize <= self._size - self._held
+
+    @staticmethod
+    def _at_cap(host: _HostQueue) -> bool:
+        return host.cap is not None and host.in_flight >= host.cap
+
+    def _full_for(self: Self, name: str | None) -> bool:
+        """Whether an item of host name has to wait for room."""
+        if name is not None:
+            host: _HostQueue = self._host(name)
+            if self._at_cap(host):
+                return len(host.items) >= self.scheduling.max_queued_per_host
+        return self.full()
+
+    def _add(self: Self, item: Any, name: str | None) -> None:
+        if name is None:
+            self._control.append(item)
+        else:
+            host: _HostQueue = self._host(name)
+            host.items.append(item)
+            if not host.active:
+                host.active = True
+                self._ring.append(host)
+            self._size += 1
+            if self._at_cap(host):
+                self._held += 1
+        self._unfinished += 1
+        self._finished.clear()
+        self._wake(self._getters)
+
+    def put_nowait(self: Self, item: Any) -> None:
+        self._add(item, self.host_of(item))
+
+    async def put(self: Self, item: Any) -> None:
+        name: str | None = self.host_of(item)
+        while self._full_for(name):
+            await self._wait(self._putters)
+        self._add(item, name)
+
+    def _pick(self: Self, draining: bool = False) -> Any:
+        """Takes the next item by deficit round-robin, skipping capped hosts; raises QueueEmpty if none."""
+        ring: collections.deque[_HostQueue] = self._ring
+        # Capped hosts passed in a row: only a full turn of them means nothing can be served
+        skipped: int = 0
+        while skipped < len(ring):
+            host: _HostQueue = ring[0]
+            if not draining and host.cap is not None and host.in_flight >= host.cap:
+                # A capped host loses its turn and its deficit
+                host.deficit = 0.0
+                ring.rotate(-1)
+                skipped += 1
+                continue
+            if host.deficit < 1:
+                host.deficit += host.weight
+                if host.deficit < 1:
+                    # A host with a fractional weight is served once its deficit adds up to an item
+                    ring.rotate(-1)
+                    skipped = 0
+                    continue
+            item: Any = host.items.popleft()
+            host.deficit -= 1
+            if not draining:
+                host.in_flight += 1
+                if host.in_flight == host.cap:
+                    # The items left behind no longer count against maxsize
+                    self._held += len(host.items)
+            elif self._at_cap(host):
+                self._held -= 1
+            if not host.items:
+                ring.popleft()
+                host.active = False
+                host.deficit = 0.0
+            elif host.deficit < 1:
+                ring.rotate(-1)
+            self._size -= 1
+            self._wake(self._putters)
+            return item
+        if self._control and (draining or not self._size):
+            return self._control.popleft()
+        raise asyncio.QueueEmpty
+
+    def get_nowait(self: Self) -> Any:
+        """Takes any queued item regardless of the per-host caps, to drop what is left (see SPARP._cancel)."""
+        return self._pick(draining=True)
+
+    async def get(self: Self) -> Any:
+        while True:
+            try:
+                return self._pick()
+            except asyncio.QueueEmpty:
+                await self._wait(self._getters)
+
+    def release(self: Self, name: str) -> None:
+        """Marks an item of host name as finished, freeing its slot under the host's cap."""
+        host: _HostQueue = self.hosts[name]
+        host.in_flight -= 1
+        if host.cap is not None and host.in_flight == host.cap - 1:
+            # Below its cap again, the host's queued items count against maxsize once more
+            self._held -= len(host.items)
+            self._wake(self._putters)
+        if host.cap is not None and host.items:
+            self._wake(self._getters)
+
+    def task_done(self: Self) -> None:
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self: Self) -> None:
+        if self._unfinished:
+            await self._finished.wait()
@@ -1,11 +1,29 @@
 import asyncio
+import collections
+import concurrent.futures
+import contextvars
+import json
+import os
+import sys
+import threading
 import time
 import datetime
+import inspect
+import urllib.parse
 from enum import Enum
-from typing import Callable, Iterable, Any, Awaitable, Self, Dict, List
+from collections.abc import Iterator, Sized
+from typing import Callable, Iterable, Any, Awaitable, Literal, Self, Dict, List
 
 import aiohttp
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from .load import LoadProfile, LoadReport, _LoadCollector
+from .mirrors import MirrorPool, MirrorStats, _Mirror
+from .readers import DEFAULT_CHUNK_SIZE, CsvReader, JsonlReader
+from .reducers import Reducer
+from .retention import RetentionPolicy, RetentionStore
+from .scheduling import FairQueue, HostScheduling
+from .transports import AiohttpTransport, Transport
 
 
 class ResponseState(Enum):
@@ -16,6 +34,29 @@ class ResponseState(Enum):
     SUCCESS = "SUCCESS"
 
 
+class StatusClassifier:
+    """An inspect_response built from sets of status codes, for the common cases that need no custom logic.
+
+    Statuses in success map to SUCCESS, statuses in soft_fail to SOFT_FAIL and everything else to HARD_FAIL.
+    """
+
+    def __init__(
+        self: Self,
+        success: Iterable[int] = range(200, 300),
+        soft_fail: Iterable[int] = (429, 502, 503, 504),
+    ) -> None:
+        """Initializes the classifier from the success and soft-fail status codes."""
+        self.success: frozenset[int] = frozenset(success)
+        self.soft_fail: frozenset[int] = frozenset(soft_fail)
+
+    def __call__(self: Self, response: aiohttp.ClientResponse) -> ResponseState:
+        if response.status in self.success:
+            return ResponseState.SUCCESS
+        if response.status in self.soft_fail:
+            return ResponseState.SOFT_FAIL
+        return ResponseState.HARD_FAIL
+
+
 class Sentinel:
     """Generic sentinel class for internal signaling."""
 
@@ -28,6 +69,85 @@ class DoneSentinel:
     pass
 
 
+class _Envelope:
+    """An input item travelling through input_queue together with its bookkeeping."""
+
+    __slots__ = ("index", "payload", "enqueued_at", "intended_at", "host", "done")
+
+    def __init__(self: Self, index: int, payload: Any) -> None:
+        self.index: int = index
+        self.payload: Any = payload
+        self.enqueued_at: float = 0.0
+        # Scheduled start time in open-loop mode (see LoadProfile), 0.0 otherwise
+        self.intended_at: float = 0.0
+        # Host of the request, only set with host_scheduling
+        self.host: str = ""
+        # Receives the outcome of an item submitted with SPARP._submit: (result kind, value), or (None, error)
+        self.done: Callable[[str | None, Any], None] | None = None
+
+
+class _Activity:
+    """Unfinished work shared by every SPARP of one run: a single instance, or all stages of a Pipeline.
+
+    pending counts items taken from an input collection or emitted as follow-ups that have not finished yet.
+    The run is complete once every input collection is exhausted and pending drops to zero, because an item
+    commits its follow-ups before it counts as finished.
+    """
+
+    __slots__ = ("pending", "open_sources", "changed")
+
+    def __init__(self: Self, open_sources: int = 1) -> None:
+        self.pending: int = 0
+        self.open_sources: int = open_sources
+        self.changed: asyncio.Event = asyncio.Event()
+
+    @property
+    def idle(self: Self) -> bool:
+        return self.pending == 0 and self.open_sources == 0
+
+    def finish(self: Self) -> None:
+        self.pending -= 1
+        if self.pending == 0 and self.open_sources == 0:
+            self.changed.set()
+
+    def close_source(self: Self) -> None:
+        self.open_sources -= 1
+        if self.pending == 0 and self.open_sources == 0:
+            self.changed.set()
+
+
+class _EmitScope:
+    """Follow-ups emitted by the parse_response calls of one worker task, as (stage, item) pairs.
+
+    Set once per task rather than once per response; open is only True while parse_response runs.
+    """
+
+    __slots__ = ("task", "open", "items")
+
+    def __init__(self: Self) -> None:
+        self.task: asyncio.Task[Any] | None = asyncio.current_task()
+        self.open: bool = False
+        self.items: List[tuple[str | None, Any]] = []
+
+
+_emit_scope: contextvars.ContextVar[_EmitScope | None] = contextvars.ContextVar("sparp_emit_scope", default=None)
+
+
+def emit(item: Any, stage: str | None = None) -> None:
+    """Queues a follow-up request from inside parse_response.
+
+    item is handled like an element of the input_collection of the target: a request dict, or a column value
+    when the target was built from a TemplatedInput. stage=None targets the running SPARP itself (e.g. the
+    next page of a listing); other names target stages of the same Pipeline. Follow-ups are only dispatched
+    if the response that emitted them ends up as SUCCESS, so a retried response never emits twice.
+    """
+    scope: _EmitScope | None = _emit_scope.get()
+    # Tasks started from a worker, such as async callbacks, inherit its scope but are not its parse_response
+    if scope is None or not scope.open or scope.task is not asyncio.current_task():
+        raise RuntimeError("emit() can only be called from parse_response")
+    scope.items.append((stage, item))
+
+
 class SPARPStopSignal(Exception):
     """Base exception for signals that should terminate the SPARP execution."""
 
@@ -58,6 +178,122 @@ class MaxRetriesStop(SPARPStopSignal):
     pass
 
 
+class ThresholdStop(SPARPStopSignal):
+    """Raised when one of the thresholds of StopConditions trips."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """Aggregated wall-clock time spent in one stage of request processing.
+
+    Attributes:
+        count: Number of timed events.
+        total_s: Total time spent, in seconds.
+        max_s: Longest single event, in seconds.
+    """
+
+    count: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    @property
+    def mean_s(self: Self) -> float:
+        """Average time per event, in seconds."""
+        return self.total_s / self.count if self.count else 0.0
+
+
+@dataclass(frozen=True)
+class SchedulerMetrics:
+    """Where time went during a run, to decide whether to tune concurrency, input_buffer_size or neither.
+
+    Attributes:
+        elapsed_s: Wall-clock duration of the run so far.
+        concurrency: Number of worker tasks.
+        queue_wait: Time items spent in input_queue between being produced and picked up by a worker.
+        worker_idle: Time workers spent blocked on an empty input_queue, count being how often it happened.
+        inspect_response: Time spent in inspect_response.
+        parse_response: Time spent in parse_response, or in classify_and_parse when it is used.
+        callbacks: Time spent in each callback, keyed by callback name.
+        producer_items: Number of items taken from input_collection.
+        producer_blocked_s: Time the producer waited on a full input_queue.
+    """
+
+    elapsed_s: float
+    concurrency: int
+    queue_wait: StageTiming
+    worker_idle: StageTiming
+    inspect_response: StageTiming
+    parse_response: StageTiming
+    callbacks: Dict[str, StageTiming]
+    producer_items: int
+    producer_blocked_s: float
+
+    @property
+    def producer_throughput(self: Self) -> float:
+        """Items produced per second."""
+        return self.producer_items / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def worker_idle_ratio(self: Self) -> float:
+        """Fraction of total worker time spent waiting on the producer."""
+        capacity: float = self.concurrency * self.elapsed_s
+        return min(self.worker_idle.total_s / capacity, 1.0) if capacity > 0 else 0.0
+
+    @property
+    def producer_blocked_ratio(self: Self) -> float:
+        """Fraction of the run the producer spent waiting for room in input_queue."""
+        return min(self.producer_blocked_s / self.elapsed_s, 1.0) if self.elapsed_s > 0 else 0.0
+
+    @property
+    def hook_ratio(self: Self) -> float:
+        """Fraction of busy worker time spent in inspect_response, parse_response and callbacks."""
+        busy: float = self.concurrency * self.elapsed_s - self.worker_idle.total_s
+        hooks: float = (
+            self.inspect_response.total_s
+            + self.parse_response.total_s
+            + sum(timing.total_s for timing in self.callbacks.values())
+        )
+        return min(hooks / busy, 1.0) if busy > 0 else 0.0
+
+    def recommendation(self: Self) -> str:
+        """Returns a one-line tuning recommendation derived from the metrics."""
+        if self.hook_ratio > 0.3:
+            return (
+                "Hooks (inspect/parse/callbacks) take a large share of worker time and block the event loop: "
+                "make them cheaper before raising concurrency."
+            )
+        if self.worker_idle_ratio > 0.2 and self.producer_blocked_ratio < 0.1:
+            return (
+                "Workers often wait on the producer: input_collection is the bottleneck, so raising concurrency "
+                "will not help. Speed up the input, or raise input_buffer_size if it is bursty."
+            )
+        if self.producer_blocked_ratio > 0.5 and self.worker_idle_ratio < 0.05:
+            return (
+                "input_queue is full most of the time: workers are the bottleneck. Raise concurrency if the "
+                "upstream allows it; a larger input_buffer_size would only use more memory."
+            )
+        return "Producer and workers are balanced: neither concurrency nor input_buffer_size is a clear bottleneck."
+
+    def summary(self: Self) -> str:
+        """Returns a human-readable report of the metrics, ending with a tuning recommendation."""
+        lines: List[str] = [
+            f"elapsed: {self.elapsed_s:.2f}s, concurrency: {self.concurrency}",
+            f"producer: {self.producer_items} items, {self.producer_throughput:.0f} items/s, "
+            f"blocked on full queue {100 * self.producer_blocked_ratio:.1f}% of the time",
+            f"queue wait: mean {1e3 * self.queue_wait.mean_s:.2f}ms, max {1e3 * self.queue_wait.max_s:.2f}ms",
+            f"workers idle: {100 * self.worker_idle_ratio:.1f}% ({self.worker_idle.count} waits on an empty queue)",
+            f"inspect_response: {self.inspect_response.total_s:.3f}s total, "
+            f"mean {1e6 * self.inspect_response.mean_s:.1f}us",
+            f"parse_response: {self.parse_response.total_s:.3f}s total, mean {1e6 * self.parse_response.mean_s:.1f}us",
+        ]
+        for name, timing in sorted(self.callbacks.items()):
+            lines.append(f"{name}: {timing.total_s:.3f}s total, mean {1e6 * timing.mean_s:.1f}us")
+        lines.append(f"recommendation: {self.recommendation()}")
+        return "\n".join(lines)
+
+
 @dataclass(frozen=True)
 class SparpStats:
     """Data container for execution statistics.
@@ -67,12 +303,81 @@ class SparpStats:
         failed: Total number of hard-failed requests.
         soft_retries: Cumulative count of all soft-fail retry attempts.
         timeout_retries: Cumulative count of all timeout retry attempts.
+        memory_in_use_bytes: Bytes currently charged to the memory budget (0 when no budget is set).
+        memory_peak_bytes: Highest value memory_in_use_bytes reached during the run.
+        memory_budget_waits: Number of times dispatch paused because the memory budget was exhausted.
+        max_retries_soft_fail_reached: Number of requests abandoned after max soft retries.
+        max_retries_timeout_reached: Number of requests abandoned after max timeout retries.
+        status_codes: Number of responses received per HTTP status code, over all attempts.
+        exceptions: Number of attempts that raised, per exception type name (e.g. TimeoutError).
+        retries_denied: Number of retries refused by the retry budget.
+        retry_budget_use: Share of the retry budget spent over its window, only set with a retry_budget.
+        mirrors: Live state of every origin of the MirrorPool, only set with mirrors.
+        scheduler: Per-stage timing metrics, only collected with collect_metrics=True.
+        stop_reason: Message of the stop condition that ended the run early, None if it ran to completion.
+        load: Rates and latency percentiles of an open-loop run, only set with a load_profile.
     """
 
     success: int
     failed: int
     soft_retries: int
     timeout_retries: int
+    memory_in_use_bytes: int = 0
+    memory_peak_bytes: int = 0
+    memory_budget_waits: int = 0
+    max_retries_soft_fail_reached: int = 0
+    max_retries_timeout_reached: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+    exceptions: Dict[str, int] = field(default_factory=dict)
+    retries_denied: int = 0
+    retry_budget_use: float | None = None
+    mirrors: List[MirrorStats] | None = None
+    scheduler: SchedulerMetrics | None = None
+    stop_reason: str | None = None
+    load: LoadReport | None = None
+
+    @classmethod
+    def merge(cls: type[Self], all_stats: Iterable["SparpStats"]) -> Self:
+        """Sums the counters of several runs; stop_reason is the first one reported.
+
+        retry_budget_use is the highest of the runs. Per-run details (mirrors, scheduler, load) are left unset.
+        """
+        runs: List[SparpStats] = list(all_stats)
+        status_codes: collections.Counter[int] = collections.Counter()
+        exceptions: collections.Counter[str] = collections.Counter()
+        for stats in runs:
+            status_codes.update(stats.status_codes)
+            exceptions.update(stats.exceptions)
+        budget_uses: List[float] = [stats.retry_budget_use for stats in runs if stats.retry_budget_use is not None]
+        return cls(
+            success=sum(stats.success for stats in runs),
+            failed=sum(stats.failed for stats in runs),
+            soft_retries=sum(stats.soft_retries for stats in runs),
+            timeout_retries=sum(stats.timeout_retries for stats in runs),
+            memory_in_use_bytes=sum(stats.memory_in_use_bytes for stats in runs),
+            memory_peak_bytes=sum(stats.memory_peak_bytes for stats in runs),
+            memory_budget_waits=sum(stats.memory_budget_waits for stats in runs),
+            max_retries_soft_fail_reached=sum(stats.max_retries_soft_fail_reached for stats in runs),
+            max_retries_timeout_reached=sum(stats.max_retries_timeout_reached for stats in runs),
+            status_codes=dict(status_codes),
+            exceptions=dict(exceptions),
+            retries_denied=sum(stats.retries_denied for stats in runs),
+            retry_budget_use=max(budget_uses) if budget_uses else None,
+            stop_reason=next((stats.stop_reason for stats in runs if stats.stop_reason is not None), None),
+        )
+
+
+@dataclass(frozen=True)
+class IndexedResult:
+    """A result tagged with the position of its request in input_collection (ordered=True mode).
+
+    Attributes:
+        index: Zero-based position of the request in input_collection.
+        value: The parsed response, or the request dict for max-retries outcomes.
+    """
+
+    index: int
+    value: Any
 
 
 @dataclass(frozen=True)
@@ -85,46 +390,211 @@ class SparpResult:
         failed: List of parsed hard-fail responses.
         max_retries_soft_fail_reached: Requests that were abandoned after max soft retries.
         max_retries_timeout_reached: Requests that were abandoned after max timeout retries.
+        reduced: Value of each reducer passed to SPARP, keyed by the same name.
+
+    With ordered=True, the items of all four lists are IndexedResults.
     """
 
     stats: SparpStats
     success: List[Any]
     failed: List[Any]
-    max_retries_soft_fail_reached: List[Dict[str, Any]]
-    max_retries_timeout_reached: List[Dict[str, Any]]
+    max_retries_soft_fail_reached: List[Any]
+    max_retries_timeout_reached: List[Any]
+    reduced: Dict[str, Any] = field(default_factory=dict)
 
 
 class ResultQueues:
-    """Async queues for collecting results during processing."""
+    """The final results of a run, in one deque per kind owned by the engine.
+
+    Results are only added and taken on the loop of the run, so a snapshot is a plain copy. With a
+    failure_retention policy, the failure outcomes (hard failures and both max-retries kinds) are kept in one
+    RetentionStore per kind instead of their deques.
+    """
+
+    KINDS: tuple[str, ...] = ("success", "failed", "max_retries_soft_fail_reached", "max_retries_timeout_reached")
+    FAILURE_KINDS: tuple[str, ...] = KINDS[1:]
+
+    def __init__(self: Self, failure_retention: RetentionPolicy | None = None) -> None:
+        """Initializes deques for success, failure, and retry limit exhaustion."""
+        self.success: collections.deque[Any] = collections.deque()
+        self.failed: collections.deque[Any] = collections.deque()
+        self.max_retries_soft_fail_reached: collections.deque[Any] = collections.deque()
+        self.max_retries_timeout_reached: collections.deque[Any] = collections.deque()
+        self.by_kind: Dict[str, collections.deque[Any]] = {kind: getattr(self, kind) for kind in self.KINDS}
+        self.retained: Dict[str, RetentionStore] = (
+            {kind: failure_retention.new_store() for kind in self.FAILURE_KINDS} if failure_retention else {}
+        )
+
+    def snapshot_all(self: Self) -> Dict[str, List[Any]]:
+        """Copies the results of every kind into a dictionary of lists without removing them."""
+        snapshot: Dict[str, List[Any]] = {kind: list(results) for kind, results in self.by_kind.items()}
+        for kind, store in self.retained.items():
+            snapshot[kind] = list(store.kept)
+        return snapshot
+
+    def drain_all(self: Self) -> Dict[str, List[Any]]:
+        """Takes the results of every kind out into a dictionary of lists."""
+        drained: Dict[str, List[Any]] = {}
+        for kind, results in self.by_kind.items():
+            drained[kind] = list(results)
+            results.clear()
+        for kind, store in self.retained.items():
+            drained[kind] = store.kept
+            store.kept = []
+        return drained
 
-    def __init__(self: Self) -> None:
-        """Initializes queues for success, failure, and retry limit exhaustion."""
-        self.success: asyncio.Queue[Any] = asyncio.Queue()
-        self.failed: asyncio.Queue[Any] = asyncio.Queue()
-        self.max_retries_soft_fail_reached: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
-        self.max_retries_timeout_reached: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
-
-    @staticmethod
-    async def _drain(q: asyncio.Queue[Any]) -> List[Any]:
-        """Collects all items currently in a queue and marks them as done."""
-        items: List[Any] = []
-        while not q.empty():
-            items.append(await q.get())
-            q.task_done()
-        return items
-
-    async def drain_all(self: Self) -> Dict[str, List[Any]]:
-        """Drains all result queues into a dictionary of lists."""
-        return {
-            "success": await self._drain(self.success),
-            "failed": await self._drain(self.failed),
-            "max_retries_soft_fail_reached": await self._drain(self.max_retries_soft_fail_reached),
-            "max_retries_timeout_reached": await self._drain(self.max_retries_timeout_reached),
-        }
+
+class Outcome(Enum):
+    """The outcome of a single attempt, as counted by a Threshold."""
+
+    SUCCESS = "SUCCESS"
+    HARD_FAIL = "HARD_FAIL"
+    SOFT_FAIL = "SOFT_FAIL"
+    TIMEOUT = "TIMEOUT"
+
+
+class Threshold:
+    """A stop rule over a sliding window of attempts: the last last_n attempts or the last last_s seconds.
+
+    An attempt matches when its outcome is in outcomes. The rule trips when the share of matching attempts
+    reaches ratio, once the window holds at least min_attempts attempts (capped at last_n), or when the
+    number of matching attempts reaches count. per_host=True keeps one window per URL host, so a single
+    broken host stops the run even while the others are healthy.
+    """
+
+    def __init__(
+        self: Self,
+        outcomes: Outcome | Iterable[Outcome],
+        ratio: float | None = None,
+        count: int | None = None,
+        last_n: int | None = None,
+        last_s: float | None = None,
+        per_host: bool = False,
+        min_attempts: int = 100,
+    ) -> None:
+        """Validates and stores the rule; exactly one of last_n and last_s is needed."""
+        if (last_n is None) == (last_s is None):
+            raise ValueError("Threshold needs exactly one of last_n and last_s")
+        if ratio is None and count is None:
+            raise ValueError("Threshold needs a ratio, a count or both")
+        if ratio is not None and not 0 < ratio <= 1:
+            raise ValueError("ratio should be in (0, 1]")
+        if (last_n is not None and last_n < 1) or (last_s is not None and last_s <= 0):
+            raise ValueError("last_n and last_s should be positive")
+        if count is not None and count < 1:
+            raise ValueError("count should be positive")
+        self.outcomes: frozenset[Outcome] = frozenset([outcomes] if isinstance(outcomes, Outcome) else outcomes)
+        self.ratio: float | None = ratio
+        self.count: int | None = count
+        self.last_n: int | None = last_n
+        self.last_s: float | None = last_s
+        self.per_host: bool = per_host
+        self.min_attempts: int = min(min_attempts, last_n) if last_n is not None else min_attempts
+
+    def __repr__(self: Self) -> str:
+        outcomes: str = "|".join(sorted(outcome.value for outcome in self.outcomes))
+        window: str = f"last {self.last_n} attempts" if self.last_n is not None else f"last {self.last_s}s"
+        limits: List[str] = []
+        if self.ratio is not None:
+            limits.append(f"ratio>={self.ratio:g}")
+        if self.count is not None:
+            limits.append(f"count>={self.count}")
+        return f"Threshold({outcomes} {' or '.join(limits)} over {window}{' per host' if self.per_host else ''})"
+
+
+class _CountWindow:
+    """Matches among the last n attempts, kept in a ring buffer with a running sum."""
+
+    __slots__ = ("ring", "position", "total", "matches")
+
+    def __init__(self: Self, n: int) -> None:
+        self.ring: List[bool] = [False] * n
+        self.position: int = 0
+        self.total: int = 0
+        self.matches: int = 0
+
+    def add(self: Self, match: bool, now: float) -> None:
+        ring: List[bool] = self.ring
+        if self.total == len(ring):
+            self.matches -= ring[self.position]
+        else:
+            self.total += 1
+        ring[self.position] = match
+        self.matches += match
+        self.position = (self.position + 1) % len(ring)
+
+
+class _TimeWindow:
+    """Matches during the last span_s seconds, kept in buckets of 1/_TimeWindow.BUCKETS of the span."""
+
+    BUCKETS: int = 20
+    __slots__ = ("width_s", "buckets", "total", "matches")
+
+    def __init__(self: Self, span_s: float) -> None:
+        self.width_s: float = span_s / self.BUCKETS
+        # [bucket id, attempts, matches], oldest first
+        self.buckets: collections.deque[List[int]] = collections.deque()
+        self.total: int = 0
+        self.matches: int = 0
+
+    def expire(self: Self, now: float) -> None:
+        """Drops the buckets that fell out of the window."""
+        oldest_id: int = int(now / self.width_s) - self.BUCKETS
+        buckets: collections.deque[List[int]] = self.buckets
+        while buckets and buckets[0][0] <= oldest_id:
+            _, attempts, matches = buckets.popleft()
+            self.total -= attempts
+            self.matches -= matches
+
+    def add(self: Self, match: bool, now: float) -> None:
+        bucket_id: int = int(now / self.width_s)
+        buckets: collections.deque[List[int]] = self.buckets
+        self.expire(now)
+        if not buckets or buckets[-1][0] != bucket_id:
+            buckets.append([bucket_id, 0, 0])
+        buckets[-1][1] += 1
+        buckets[-1][2] += match
+        self.total += 1
+        self.matches += match
+
+
+class _ThresholdTracker:
+    """Live windows of one Threshold for one run."""
+
+    def __init__(self: Self, threshold: Threshold) -> None:
+        self.threshold: Threshold = threshold
+        self.windows: Dict[str, _CountWindow | _TimeWindow] = {}
+
+    def _new_window(self: Self) -> _CountWindow | _TimeWindow:
+        if self.threshold.last_n is not None:
+            return _CountWindow(self.threshold.last_n)
+        return _TimeWindow(self.threshold.last_s or 0.0)
+
+    def record(self: Self, outcome: Outcome, req: Dict[str, Any], now: float) -> None:
+        """Adds one attempt to its window and raises ThresholdStop if the threshold trips."""
+        threshold: Threshold = self.threshold
+        host: str = urllib.parse.urlsplit(str(req.get("url", ""))).netloc if threshold.per_host else ""
+        window: _CountWindow | _TimeWindow | None = self.windows.get(host)
+        if window is None:
+            window = self.windows[host] = self._new_window()
+        window.add(outcome in threshold.outcomes, now)
+        tripped: bool = (threshold.count is not None and window.matches >= threshold.count) or (
+            threshold.ratio is not None
+            and window.total >= threshold.min_attempts
+            and window.matches >= threshold.ratio * window.total
+        )
+        if tripped:
+            where: str = f" for host {host}" if threshold.per_host else ""
+            raise ThresholdStop(f"{threshold!r} tripped{where}: {window.matches}/{window.total} attempts matched")
 
 
 class StopConditions:
-    """Configuration for early termination based on specific failure events."""
+    """Configuration for early termination based on specific failure events.
+
+    The stop_on_* flags stop on the first event of their kind. thresholds stop on rates or counts of
+    outcomes over sliding windows instead (see Threshold), which suits long runs where isolated failures
+    are expected.
+    """
 
     def __init__(
         self: Self,
@@ -133,6 +603,7 @@ class StopConditions:
         stop_on_max_retries_by_soft_fail_reached: bool = False,
         stop_on_max_retries_by_timeout_reached: bool = False,
         stop_on_timeout: bool = False,
+        thresholds: Iterable[Threshold] = (),
     ) -> None:
         """Sets the flags for various early-stop scenarios."""
         self.stop_on_soft_fail = stop_on_soft_fail
@@ -140,27 +611,350 @@ class StopConditions:
         self.stop_on_max_retries_by_soft_fail_reached = stop_on_max_retries_by_soft_fail_reached
         self.stop_on_max_retries_by_timeout_reached = stop_on_max_retries_by_timeout_reached
         self.stop_on_timeout = stop_on_timeout
+        self.thresholds: tuple[Threshold, ...] = tuple(thresholds)
+
+
+class RetryBudget:
+    """Caps retries run-wide so a struggling upstream is not hit by a retry storm.
+
+    Over the last window_s seconds, retries may add up to min_retries plus ratio times the first attempts.
+    A request whose retry does not fit goes straight to the max-retries outcome of its last failure (soft
+    fail or timeout), as if it had used up max_retries_by_soft_fail or max_retries_by_timeout.
+    """
+
+    def __init__(self: Self, ratio: float = 0.1, window_s: float = 10.0, min_retries: int = 10) -> None:
+        """Validates and stores the budget."""
+        if ratio < 0 or min_retries < 0:
+            raise ValueError("ratio and min_retries should not be negative")
+        if window_s <= 0:
+            raise ValueError("window_s should be positive")
+        self.ratio: float = ratio
+        self.window_s: float = window_s
+        self.min_retries: int = min_retries
+
+
+class _RetryBudgetTracker:
+    """Live window of one RetryBudget; matches are retries, the other attempts are first attempts."""
+
+    def __init__(self: Self, budget: RetryBudget) -> None:
+        self.budget: RetryBudget = budget
+        self.window: _TimeWindow = _TimeWindow(budget.window_s)
+        self.denied: int = 0
+
+    def allowed(self: Self) -> float:
+        return self.budget.min_retries + self.budget.ratio * (self.window.total - self.window.matches)
+
+    def first_attempt(self: Self, now: float) -> None:
+        self.window.add(False, now)
+
+    def try_retry(self: Self, now: float) -> bool:
+        """Spends one retry if the budget allows it."""
+        self.window.expire(now)
+        if self.window.matches + 1 > self.allowed():
+            self.denied += 1
+            return False
+        self.window.add(True, now)
+        return True
+
+    def use(self: Self) -> float:
+        """Share of the budget spent over the window, refreshed by the last attempt."""
+        allowed: float = self.allowed()
+        return self.window.matches / allowed if allowed > 0 else 1.0
+
+
+CALLBACK_NAMES: tuple[str, ...] = (
+    "on_success",
+    "on_hard_fail",
+    "on_soft_fail",
+    "on_timeout",
+    "on_max_retries_by_soft_fail_reached",
+    "on_max_retries_by_timeout_reached",
+    "on_result",
+)
 
 
 class Callbacks:
-    """User-defined hooks for various lifecycle events in the request process."""
+    """User-defined hooks for various lifecycle events in the request process.
+
+    Every callback may be a plain function, called inline, or a coroutine function. Coroutine callbacks run
+    as tasks, at most max_concurrency at a time; when that many are running, the worker that fires the next
+    one waits, which applies backpressure to dispatch. All of them complete before the run returns.
+
+    Each on_<event> has an on_<event>_batch variant receiving a list of argument tuples (e.g. a list of
+    (request_dict, response) pairs for on_success_batch). A batch is delivered once batch_size events are
+    collected, every batch_interval otherwise, and at the end of the run, so sinks can do bulk writes.
+    Responses handed to async or batched callbacks are already released: status and headers are available,
+    the body is not (read it in parse_response).
+    """
 
     def __init__(
         self: Self,
-        on_success: Callable[[Dict[str, Any], aiohttp.ClientResponse], None] | None = None,
-        on_hard_fail: Callable[[Dict[str, Any], aiohttp.ClientResponse], None] | None = None,
-        on_soft_fail: Callable[[Dict[str, Any], int], None] | None = None,
-        on_timeout: Callable[[Dict[str, Any], int], None] | None = None,
-        on_max_retries_by_soft_fail_reached: Callable[[Dict[str, Any]], None] | None = None,
-        on_max_retries_by_timeout_reached: Callable[[Dict[str, Any]], None] | None = None,
+        on_success: Callable[[Dict[str, Any], aiohttp.ClientResponse], None | Awaitable[None]] | None = None,
+        on_hard_fail: Callable[[Dict[str, Any], aiohttp.ClientResponse], None | Awaitable[None]] | None = None,
+        on_soft_fail: Callable[[Dict[str, Any], int], None | Awaitable[None]] | None = None,
+        on_timeout: Callable[[Dict[str, Any], int], None | Awaitable[None]] | None = None,
+        on_max_retries_by_soft_fail_reached: Callable[[Dict[str, Any]], None | Awaitable[None]] | None = None,
+        on_max_retries_by_timeout_reached: Callable[[Dict[str, Any]], None | Awaitable[None]] | None = None,
+        on_result: Callable[[Dict[str, Any], ResponseState, Any], None | Awaitable[None]] | None = None,
+        on_success_batch: Callable[[List[tuple[Any, ...]]], None | Awaitable[None]] | None = None,
+        on_hard_fail_batch: Callable[[List[tuple[Any, ...]]], None | Awaitable[None]] | None = None,
+        on_soft_fail_batch: Callable[[List[tuple[Any, ...]]], None | Awaitable[None]] | None = None,
+        on_timeout_batch: Callable[[List[tuple[Any, ...]]], None | Awaitable[None]] | None = None,
+        on_max_retries_by_soft_fail_reached_batch: Callable[[List[tuple[Any, ...]]], None | Awaitable[None]]
+        | None = None,
+        on_max_retries_by_timeout_reached_batch: Callable[[List[tuple[Any, ...]]], None | Awaitable[None]]
+        | None = None,
+        on_result_batch: Callable[[List[tuple[Any, ...]]], None | Awaitable[None]] | None = None,
+        max_concurrency: int = 10,
+        batch_size: int = 100,
+        batch_interval: datetime.timedelta = datetime.timedelta(seconds=1),
     ) -> None:
-        """Initializes callback functions for different request outcomes."""
+        """Initializes callback functions for different request outcomes.
+
+        on_result receives the parsed response of every SUCCESS and HARD_FAIL as soon as it is known,
+        which allows streaming results out while the run is in progress.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency should be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size should be at least 1")
+        if batch_interval.total_seconds() <= 0:
+            raise ValueError("batch_interval should be positive")
         self.on_success = on_success
         self.on_hard_fail = on_hard_fail
         self.on_soft_fail = on_soft_fail
         self.on_timeout = on_timeout
         self.on_max_retries_by_soft_fail_reached = on_max_retries_by_soft_fail_reached
         self.on_max_retries_by_timeout_reached = on_max_retries_by_timeout_reached
+        self.on_result = on_result
+        self.on_success_batch = on_success_batch
+        self.on_hard_fail_batch = on_hard_fail_batch
+        self.on_soft_fail_batch = on_soft_fail_batch
+        self.on_timeout_batch = on_timeout_batch
+        self.on_max_retries_by_soft_fail_reached_batch = on_max_retries_by_soft_fail_reached_batch
+        self.on_max_retries_by_timeout_reached_batch = on_max_retries_by_timeout_reached_batch
+        self.on_result_batch = on_result_batch
+        self.max_concurrency: int = max_concurrency
+        self.batch_size: int = batch_size
+        self.batch_interval: datetime.timedelta = batch_interval
+
+
+class TemplateParam:
+    """Placeholder marking where a RequestTemplate puts its parameter value in a body or query skeleton."""
+
+    def __repr__(self: Self) -> str:
+        return "PARAM"
+
+
+PARAM: TemplateParam = TemplateParam()
+
+
+def _substitute(skeleton: Any, value: Any) -> Any:
+    """Returns a copy of skeleton with every PARAM placeholder replaced by value."""
+    if skeleton is PARAM:
+        return value
+    if isinstance(skeleton, dict):
+        return {k: _substitute(v, value) for k, v in skeleton.items()}
+    if isinstance(skeleton, list):
+        return [_substitute(v, value) for v in skeleton]
+    return skeleton
+
+
+def _contains_param(skeleton: Any) -> bool:
+    """Checks whether a skeleton contains at least one PARAM placeholder."""
+    if skeleton is PARAM:
+        return True
+    if isinstance(skeleton, dict):
+        return any(_contains_param(v) for v in skeleton.values())
+    if isinstance(skeleton, list):
+        return any(_contains_param(v) for v in skeleton)
+    return False
+
+
+class RequestTemplate:
+    """Shared shape of many requests that only differ by a single parameter value.
+
+    The url is a str.format pattern receiving the value as its only positional argument (e.g. ".../items/{}").
+    PARAM placeholders inside json, data or params are replaced by the value; headers and any other
+    session.request kwargs are shared by reference between all rendered requests.
+    """
+
+    def __init__(
+        self: Self,
+        method: str,
+        url: str,
+        headers: Dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+        params: Dict[str, Any] | None = None,
+        **request_kwargs: Any,
+    ) -> None:
+        """Stores the template parts and precomputes which of them hold placeholders."""
+        self.method: str = method
+        self.url: str = url
+        self.headers: Dict[str, str] | None = headers
+        self.json: Any = json
+        self.data: Any = data
+        self.params: Dict[str, Any] | None = params
+        self.request_kwargs: Dict[str, Any] = request_kwargs
+        self._templated_parts: List[str] = [
+            name for name in ("json", "data", "params") if _contains_param(getattr(self, name))
+        ]
+
+    def render(self: Self, value: Any) -> Dict[str, Any]:
+        """Expands the template into session.request kwargs for a single parameter value."""
+        if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+            # NumPy scalars (including memory-mapped columns) become plain Python values
+            value = value.item()
+        req: Dict[str, Any] = {"method": self.method, "url": self.url.format(value), **self.request_kwargs}
+        if self.headers is not None:
+            req["headers"] = self.headers
+        for name in ("json", "data", "params"):
+            part: Any = getattr(self, name)
+            if part is not None:
+                req[name] = _substitute(part, value) if name in self._templated_parts else part
+        return req
+
+    def bind(self: Self, column: Iterable[Any]) -> "TemplatedInput":
+        """Binds a column of parameter values (list, array.array, NumPy array or memmap) to this template."""
+        return TemplatedInput(self, column)
+
+
+class TemplatedInput:
+    """A RequestTemplate bound to a compact column of parameter values, usable as SPARP input_collection.
+
+    Only the raw values travel through the input queue; request dicts are rendered right before sending.
+    """
+
+    def __init__(self: Self, template: RequestTemplate, column: Iterable[Any]) -> None:
+        """Initializes the templated input from a template and its parameter column."""
+        self.template: RequestTemplate = template
+        self.column: Iterable[Any] = column
+
+    def __iter__(self: Self) -> Iterator[Any]:
+        return iter(self.column)
+
+    def size(self: Self) -> int | None:
+        """Returns the length of the column, or None when it is a plain iterable of unknown length."""
+        return len(self.column) if isinstance(self.column, Sized) else None
+
+
+def _estimate_size(obj: Any) -> int:
+    """Cheaply estimates the payload size of an object in bytes, recursing into common containers."""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(_estimate_size(k) + _estimate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sum(_estimate_size(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+def _request_body_size(req: Dict[str, Any]) -> int:
+    """Estimates the size of the body a request dict will send."""
+    if "data" in req and req["data"] is not None:
+        return _estimate_size(req["data"])
+    if "json" in req and req["json"] is not None:
+        return len(json.dumps(req["json"]))
+    return 0
+
+
+class MemoryBudget:
+    """Byte-based budget covering request bodies in flight, response bodies being read and undrained results.
+
+    Dispatch of a new request waits until its body fits in the budget. A request is always allowed through
+    when nothing else is in flight, so a single oversized item (or a budget filled by stored results) slows
+    the run down to one request at a time instead of deadlocking it.
+
+    A response body is charged its Content-Length while it is parsed. Chunked responses without one are
+    charged nothing, as their size is only known once parse_response has read them, so the budget does not
+    bound the memory they use; cap them in parse_response (e.g. by reading response.content in chunks).
+    """
+
+    def __init__(self: Self, max_bytes: int) -> None:
+        """Initializes an empty budget of max_bytes."""
+        if max_bytes <= 0:
+            raise ValueError("max_bytes should be a positive number of bytes")
+        self.max_bytes: int = max_bytes
+        self.in_use: int = 0
+        self.peak: int = 0
+        self.waits: int = 0
+        self.in_flight: int = 0
+        self._freed: asyncio.Event = asyncio.Event()
+
+    def _fits(self: Self, n_bytes: int) -> bool:
+        return self.in_use + n_bytes <= self.max_bytes or self.in_flight == 0
+
+    async def reserve(self: Self, n_bytes: int) -> None:
+        """Waits until n_bytes fit in the budget, then charges them for a new in-flight request."""
+        if not self._fits(n_bytes):
+            self.waits += 1
+            while not self._fits(n_bytes):
+                self._freed.clear()
+                await self._freed.wait()
+        self.in_flight += 1
+        self.charge(n_bytes)
+
+    def charge(self: Self, n_bytes: int) -> None:
+        """Charges n_bytes without waiting, for memory that is already allocated (e.g. a response body)."""
+        self.in_use += n_bytes
+        if self.in_use > self.peak:
+            self.peak = self.in_use
+
+    def release(self: Self, n_bytes: int, finished: bool = False) -> None:
+        """Returns n_bytes to the budget; finished marks the end of an in-flight request."""
+        self.in_use -= n_bytes
+        if finished:
+            self.in_flight -= 1
+        self._freed.set()
+
+
+class _StageTimer:
+    """Mutable accumulator behind a StageTiming."""
+
+    __slots__ = ("count", "total_s", "max_s")
+
+    def __init__(self: Self) -> None:
+        self.count: int = 0
+        self.total_s: float = 0.0
+        self.max_s: float = 0.0
+
+    def add(self: Self, duration_s: float) -> None:
+        self.count += 1
+        self.total_s += duration_s
+        if duration_s > self.max_s:
+            self.max_s = duration_s
+
+    def snapshot(self: Self) -> StageTiming:
+        return StageTiming(count=self.count, total_s=self.total_s, max_s=self.max_s)
+
+
+class _MetricsCollector:
+    """Live counters behind SchedulerMetrics."""
+
+    def __init__(self: Self) -> None:
+        self.started_at: float = time.perf_counter()
+        self.queue_wait: _StageTimer = _StageTimer()
+        self.worker_idle: _StageTimer = _StageTimer()
+        self.inspect_response: _StageTimer = _StageTimer()
+        self.parse_response: _StageTimer = _StageTimer()
+        self.callbacks: Dict[str, _StageTimer] = collections.defaultdict(_StageTimer)
+        self.producer_blocked_s: float = 0.0
+
+    def snapshot(self: Self, concurrency: int, producer_items: int) -> SchedulerMetrics:
+        return SchedulerMetrics(
+            elapsed_s=time.perf_counter() - self.started_at,
+            concurrency=concurrency,
+            queue_wait=self.queue_wait.snapshot(),
+            worker_idle=self.worker_idle.snapshot(),
+            inspect_response=self.inspect_response.snapshot(),
+            parse_response=self.parse_response.snapshot(),
+            callbacks={name: timer.snapshot() for name, timer in self.callbacks.items()},
+            producer_items=producer_items,
+            producer_blocked_s=self.producer_blocked_s,
+        )
 
 
 async def default_parse_response(request_dict: Dict[str, Any], response: aiohttp.ClientResponse) -> Any:
@@ -182,8 +976,8 @@ class SPARP:
 
     def __init__(
         self: Self,
-        input_collection: Iterable[Dict[str, Any]],
-        inspect_response: Callable[[aiohttp.ClientResponse], ResponseState],
+        input_collection: Iterable[Dict[str, Any]] | TemplatedInput,
+        inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] | None,
         callbacks: Callbacks = Callbacks(),
         concurrency: int = 100,
         max_retries_by_soft_fail: int = 20,
@@ -196,24 +990,84 @@ class SPARP:
         timeout_s: float = 30.0,
         progress_bar_requests_threshold: int = 1,
         progress_bar_time_threshold: datetime.timedelta = datetime.timedelta(seconds=0.5),
+        memory_budget_bytes: int | None = None,
+        retain_results: bool = True,
+        transport: Transport | None = None,
+        collect_metrics: bool = False,
+        ordered: bool = False,
+        reorder_window: int = 1000,
+        load_profile: LoadProfile | None = None,
+        reducers: Dict[str, Reducer] | None = None,
+        failure_retention: RetentionPolicy | None = None,
+        retry_budget: RetryBudget | None = None,
+        mirrors: MirrorPool | None = None,
+        host_scheduling: HostScheduling | None = None,
+        classify_and_parse: Callable[[Dict[str, Any], aiohttp.ClientResponse], Awaitable[tuple[ResponseState, Any]]]
+        | None = None,
+        dispatch: Literal["workers", "tasks"] = "workers",
     ) -> None:
-        """Initializes the SPARP engine with configuration and state."""
+        """Initializes the SPARP engine with configuration and state.
+
+        With retain_results=False outcomes are only counted and passed to callbacks, so a run of any
+        length keeps constant memory; the result lists of SparpResult are then empty.
+        transport defaults to a fresh AiohttpTransport (HTTP/1.1) per instance.
+        collect_metrics=True times every scheduling stage and hook (see SchedulerMetrics).
+        ordered=True wraps every stored result (and the value passed to on_result) in an IndexedResult and
+        emits them in input order. At most reorder_window items are dispatched past the oldest unfinished one,
+        so one slow request slows dispatch down instead of growing the reorder buffer without limit.
+        load_profile switches to open-loop dispatch: items are queued at the times the profile schedules, not
+        when a worker frees up, and stats.load reports latencies measured from those times. concurrency then
+        caps the requests in flight; time spent waiting for a free worker counts in the latencies.
+        reducers fold parsed responses into aggregates as they arrive (see Reducer), reported by name in
+        SparpResult.reduced; with retain_results=False nothing is kept per result.
+        failure_retention bounds how many failure outcomes of each kind are kept (see RetentionPolicy); all of
+        them are still counted in SparpStats, along with every status code and exception seen. It applies
+        with retain_results=False too, so Spill keeps spilling and the outcomes a policy keeps are returned.
+        retry_budget caps retries across the whole run (see RetryBudget), on top of the per-request limits.
+        mirrors spreads every attempt over equivalent origins, rewriting the host of its url (see MirrorPool).
+        host_scheduling replaces the FIFO input queue with per-host queues served round-robin, optionally with
+        per-host caps on requests in flight (see HostScheduling), so a slow host cannot take all the workers.
+        parse_response is not called for SOFT_FAIL responses, which are retried without reading their body.
+        classify_and_parse(request_dict, response) replaces both inspect_response (which may then be None) and
+        parse_response: it returns (state, parsed) so the body is read once, e.g. for APIs reporting
+        throttling in the JSON body. It decides itself whether to read the body of a soft fail.
+        dispatch="workers" runs concurrency long-lived workers pulling from the input queue. dispatch="tasks"
+        starts one task per request instead, gated by a semaphore of concurrency slots, so memory and startup
+        cost follow the requests actually in flight rather than concurrency (for 100k+ slow or long-polling
+        requests). Items are then handed over directly, input_buffer_size has no effect and host_scheduling is
+        not supported.
+        """
         self.seen: int = 0
         self.concurrency: int = concurrency
-        self.input_queue: asyncio.Queue[Dict[str, Any] | DoneSentinel] = asyncio.Queue(maxsize=input_buffer_size)
-        self.queues: ResultQueues = ResultQueues()
+        self.input_queue: asyncio.Queue[Any] | FairQueue = (
+            FairQueue(input_buffer_size, host_scheduling, self._host_of)
+            if host_scheduling
+            else asyncio.Queue(maxsize=input_buffer_size)
+        )
+        self.fair_queue: FairQueue | None = self.input_queue if isinstance(self.input_queue, FairQueue) else None
+        self.queues: ResultQueues = ResultQueues(failure_retention)
 
         self.success_count: int = 0
         self.failed_count: int = 0
         self.max_retries_soft_reached_count: int = 0
         self.max_retries_timeout_reached_count: int = 0
+        self.status_codes: Dict[int, int] = {}
+        self.exceptions: Dict[str, int] = {}
 
         self.iterator_exhausted: asyncio.Event = asyncio.Event()
 
         self.callbacks: Callbacks = callbacks
-        self.inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] = inspect_response
+        self.inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] | None = inspect_response
+        self.classify_and_parse: (
+            Callable[[Dict[str, Any], aiohttp.ClientResponse], Awaitable[tuple[ResponseState, Any]]] | None
+        ) = classify_and_parse
         self.parse_response: Callable[[Dict[str, Any], aiohttp.ClientResponse], Awaitable[Any]] = parse_response
-        self.input_collection: Iterable[Dict[str, Any]] = input_collection
+        self.input_collection: Iterable[Any] = input_collection
+        self.render_request: Callable[[Any], Dict[str, Any]] | None = None
+        if isinstance(input_collection, TemplatedInput):
+            self.render_request = input_collection.template.render
+            if estimated_input_collection_size is None:
+                estimated_input_collection_size = input_collection.size()
         self.max_retries_by_soft_fail: int = max_retries_by_soft_fail
         self.max_retries_by_timeout: int = max_retries_by_timeout
         self.stop_conditions: StopConditions = stop_conditions
@@ -225,94 +1079,610 @@ class SPARP:
         self.timeout_s: float = timeout_s
         self.progress_bar_time_threshold: datetime.timedelta = progress_bar_time_threshold
         self.progress_bar_requests_threshold: int = progress_bar_requests_threshold
+        self.memory_budget: MemoryBudget | None = MemoryBudget(memory_budget_bytes) if memory_budget_bytes else None
+        self.results_bytes: int = 0
+        self.retain_results: bool = retain_results
+        self.transport: Transport = transport if transport is not None else AiohttpTransport()
+        self.metrics: _MetricsCollector | None = _MetricsCollector() if collect_metrics else None
+        self._async_callbacks: set[str] = {
+            name
+            for name in CALLBACK_NAMES + tuple(f"{n}_batch" for n in CALLBACK_NAMES)
+            if inspect.iscoroutinefunction(getattr(callbacks, name))
+        }
+        self._batches: Dict[str, List[tuple[Any, ...]]] = {
+            name: [] for name in CALLBACK_NAMES if getattr(callbacks, f"{name}_batch") is not None
+        }
+        # Events with a callback or a batch variant set; the others are not fired at all
+        self._events: frozenset[str] = frozenset(
+            name
+            for name in CALLBACK_NAMES
+            if getattr(callbacks, name) is not None or getattr(callbacks, f"{name}_batch") is not None
+        )
+        self._callback_slots: asyncio.Semaphore = asyncio.Semaphore(callbacks.max_concurrency)
+        self._task_group: asyncio.TaskGroup | None = None
+        self.ordered: bool = ordered
+        self.reorder_window: int = reorder_window
+        self.next_emit_index: int = 0
+        self._reorder_buffer: Dict[int, tuple[str, IndexedResult, Dict[str, Any], Any]] = {}
+        self._reorder_window_moved: asyncio.Event = asyncio.Event()
+        self._emitting: bool = False
+        self._followups: collections.deque[Any] = collections.deque()
+        self._activity: _Activity = _Activity()
+        self._stages: Dict[str, SPARP] = {}
+        self._dispatch_done: asyncio.Event = asyncio.Event()
+        self.mirrors: MirrorPool | None = mirrors
+        self._retry_budget: _RetryBudgetTracker | None = _RetryBudgetTracker(retry_budget) if retry_budget else None
+        self._threshold_trackers: List[_ThresholdTracker] = [_ThresholdTracker(t) for t in stop_conditions.thresholds]
+        self.stop_reason: str | None = None
+        self._producer_task: asyncio.Task[None] | None = None
+        self._requester_tasks: List[asyncio.Task[None]] = []
+        self.dispatch: Literal["workers", "tasks"] = dispatch
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        # Tasks of the requests in flight with dispatch="tasks"
+        self._request_tasks: set[asyncio.Task[None]] = set()
+        self._cancelled: bool = False
+        self.load: _LoadCollector | None = _LoadCollector(load_profile) if load_profile else None
+        self.reducers: Dict[str, Reducer] = dict(reducers or {})
+        self.accumulators: Dict[str, Any] = {name: reducer.init() for name, reducer in self.reducers.items()}
+        self._reducers_by_state: Dict[ResponseState, List[tuple[str, Reducer]]] = {}
+        for name, reducer in self.reducers.items():
+            for reduced_state in reducer.states or (ResponseState.SUCCESS,):
+                self._reducers_by_state.setdefault(reduced_state, []).append((name, reducer))
+        # ThreadedSPARP clears this and finishes the merged accumulators of all its loops instead
+        self.finish_reducers: bool = True
 
         if self.progress_bar_time_threshold.total_seconds() == 0:
             raise ValueError("progress_bar_time_threshold should not be zero seconds")
+        if reorder_window < 1:
+            raise ValueError("reorder_window should be at least 1")
+        if inspect_response is None and classify_and_parse is None:
+            raise ValueError("inspect_response is required unless classify_and_parse is given")
+        if dispatch not in ("workers", "tasks"):
+            raise ValueError(f"dispatch should be 'workers' or 'tasks', not {dispatch!r}")
+        if dispatch == "tasks" and host_scheduling:
+            raise ValueError("host_scheduling needs dispatch='workers'")
+
+    @classmethod
+    def from_jsonl(
+        cls: type[Self],
+        path: str | os.PathLike[str],
+        inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] | None,
+        start_offset: int = 0,
+        start_line: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> Self:
+        """Creates a SPARP instance streaming request dicts from a JSONL file.
+
+        The input_collection of the returned instance is the JsonlReader. Its offset is the read position,
+        which runs ahead of the requests still queued or in flight, so restarting from it with start_offset
+        loses those; it is exact once the run has finished. Unless given, estimated_input_collection_size
+        is taken from the file's line-count index.
+        """
+        reader: JsonlReader = JsonlReader(path, start_offset=start_offset, start_line=start_line, chunk_size=chunk_size)
+        if "estimated_input_collection_size" not in kwargs:
+            kwargs["estimated_input_collection_size"] = reader.count_lines()
+        return cls(reader, inspect_response, **kwargs)
+
+    @classmethod
+    def from_csv(
+        cls: type[Self],
+        path: str | os.PathLike[str],
+        inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] | None,
+        to_request: Callable[[Dict[str, str]], Dict[str, Any]] | None = None,
+        start_offset: int = 0,
+        start_line: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        delimiter: str = ",",
+        **kwargs: Any,
+    ) -> Self:
+        """Creates a SPARP instance streaming rows of a CSV file, converted to request dicts by to_request."""
+        reader: CsvReader = CsvReader(
+            path,
+            to_request=to_request,
+            start_offset=start_offset,
+            start_line=start_line,
+            chunk_size=chunk_size,
+            delimiter=delimiter,
+        )
+        if "estimated_input_collection_size" not in kwargs:
+            kwargs["estimated_input_collection_size"] = reader.count_lines()
+        return cls(reader, inspect_response, **kwargs)
 
-    async def _requester(self: Self, session: aiohttp.ClientSession) -> None:
+    async def _requester(self: Self, transport: Transport) -> None:
         """Worker loop that pulls requests from the queue and executes them."""
+        metrics: _MetricsCollector | None = self.metrics
         while True:
-            next_request: Dict[str, Any] | DoneSentinel = await self.input_queue.get()
+            next_request: _Envelope | DoneSentinel
+            if metrics is None:
+                next_request = await self.input_queue.get()
+            else:
+                idle: bool = self.input_queue.empty()
+                wait_start: float = time.perf_counter()
+                next_request = await self.input_queue.get()
+                got_at: float = time.perf_counter()
+                if idle:
+                    metrics.worker_idle.add(got_at - wait_start)
+                if not isinstance(next_request, DoneSentinel):
+                    metrics.queue_wait.add(got_at - next_request.enqueued_at)
+
             if isinstance(next_request, DoneSentinel):
                 self.input_queue.task_done()
                 break
 
-            req: Dict[str, Any] = next_request
-
+            # _process is awaited directly, without a wrapper coroutine that every resume would go through
             try:
-                soft_retries: int = 0
-                timeout_retries: int = 0
-                while True:
-                    if soft_retries >= self.max_retries_by_soft_fail:
-                        self.max_retries_soft_reached_count += 1
-                        await self.queues.max_retries_soft_fail_reached.put(req)
-                        if self.callbacks.on_max_retries_by_soft_fail_reached:
-                            self.callbacks.on_max_retries_by_soft_fail_reached(req)
-                        if self.stop_conditions.stop_on_max_retries_by_soft_fail_reached:
-                            raise MaxRetriesStop("Max soft-fail retries reached.")
-                        break
-
-                    if timeout_retries >= self.max_retries_by_timeout:
-                        self.max_retries_timeout_reached_count += 1
-                        await self.queues.max_retries_timeout_reached.put(req)
-                        if self.callbacks.on_max_retries_by_timeout_reached:
-                            self.callbacks.on_max_retries_by_timeout_reached(req)
-                        if self.stop_conditions.stop_on_max_retries_by_timeout_reached:
-                            raise MaxRetriesStop("Max timeout retries reached.")
-                        break
-
-                    try:
-                        async with session.request(**req) as response:
-                            state: ResponseState = self.inspect_response(response)
-                            parsed_response: Any = await self.parse_response(req, response)
-
-                            if state == ResponseState.SUCCESS:
-                                self.success_count += 1
-                                await self.queues.success.put(parsed_response)
-                                if self.callbacks.on_success:
-                                    self.callbacks.on_success(req, response)
-                                break
-                            elif state == ResponseState.SOFT_FAIL:
-                                self.retries_by_soft_fail += 1
-                                if self.callbacks.on_soft_fail:
-                                    self.callbacks.on_soft_fail(req, soft_retries)
-                                if self.stop_conditions.stop_on_soft_fail:
-                                    raise SoftFailStop("Stop on soft fail.")
-                                soft_retries += 1
-                                continue
-                            elif state == ResponseState.HARD_FAIL:
-                                self.failed_count += 1
-                                await self.queues.failed.put(parsed_response)
-                                if self.callbacks.on_hard_fail:
-                                    self.callbacks.on_hard_fail(req, response)
-                                if self.stop_conditions.stop_on_hard_fail:
-                                    raise HardFailStop("Stop on hard fail.")
-                                break
-                    except asyncio.TimeoutError:
-                        self.retries_by_timeout += 1
-                        if self.callbacks.on_timeout:
-                            self.callbacks.on_timeout(req, timeout_retries)
-                        if self.stop_conditions.stop_on_timeout:
-                            raise TimeoutFailStop("Stop on timeout.")
-                        timeout_retries += 1
-                        continue
-                    except Exception as e:
-                        if not isinstance(e, SPARPStopSignal):
-                            e.add_note(f"SPARP_REQUEST_DATA: {req}")
-                        raise
+                await self._process(transport, next_request)
+                if next_request.intended_at and self.load is not None:
+                    self.load.latency.record(time.perf_counter() - next_request.intended_at)
+            except Exception as e:
+                if next_request.done is None or isinstance(e, SPARPStopSignal):
+                    raise
+                # A submitted item fails on its own instead of ending the run
+                next_request.done(None, e)
             finally:
-                if self.dones() % self.progress_bar_requests_threshold == 0 and self.show_progress_bar:
-                    self.display_bar()
+                if self.fair_queue is not None:
+                    self.fair_queue.release(next_request.host)
+                self._ended()
                 self.input_queue.task_done()
 
-    async def _producer(self: Self) -> None:
-        """Iterates over input_collection and populates the input queue."""
-        for item in self.input_collection:
+    def _ended(self: Self) -> None:
+        """Bookkeeping of the end of an input item, whatever its outcome."""
+        if self.show_progress_bar and self.dones() % self.progress_bar_requests_threshold == 0:
+            self.display_bar()
+        self._activity.finish()
+
+    async def _request_task(self: Self, transport: Transport, envelope: _Envelope) -> None:
+        """Body of the task of one request with dispatch="tasks"; frees its slot when done."""
+        if self.metrics is not None:
+            self.metrics.queue_wait.add(time.perf_counter() - envelope.enqueued_at)
+        try:
+            await self._process(transport, envelope)
+            if envelope.intended_at and self.load is not None:
+                self.load.latency.record(time.perf_counter() - envelope.intended_at)
+        except Exception as e:
+            if envelope.done is None or isinstance(e, SPARPStopSignal):
+                raise
+            envelope.done(None, e)
+        finally:
+            self._ended()
+            self._slots.release()
+
+    async def _put(self: Self, transport: Transport, envelope: _Envelope) -> None:
+        """Hands an item to the workers through input_queue, or to a task of its own with dispatch="tasks".
+
+        A task is only started once one of the concurrency slots is free, so nothing piles up in between.
+        """
+        if self.dispatch == "workers":
+            await self.input_queue.put(envelope)
+            return
+        await self._slots.acquire()
+        assert self._task_group is not None
+        task: asyncio.Task[None] = self._task_group.create_task(self._request_task(transport, envelope))
+        self._request_tasks.add(task)
+        task.add_done_callback(self._request_tasks.discard)
+
+    def _host_of(self: Self, item: Any) -> str | None:
+        """Host of a queued envelope for host_scheduling, None for the DoneSentinels."""
+        if not isinstance(item, _Envelope):
+            return None
+        req: Dict[str, Any] = self.render_request(item.payload) if self.render_request else item.payload
+        item.host = urllib.parse.urlsplit(str(req.get("url", ""))).netloc
+        return item.host
+
+    async def _fire(self: Self, name: str, *args: Any) -> None:
+        """Invokes the callback called name, if set, and queues the event for its batch variant, if set.
+
+        Only called for the names in _events, so unconfigured callbacks cost nothing per attempt.
+        """
+        callback: Callable[..., Any] | None = getattr(self.callbacks, name)
+        if callback is not None:
+            await self._invoke(name, callback, args)
+        batch: List[tuple[Any, ...]] | None = self._batches.get(name)
+        if batch is not None:
+            batch.append(args)
+            if len(batch) >= self.callbacks.batch_size:
+                await self._flush_batch(name)
+
+    async def _flush_batch(self: Self, name: str) -> None:
+        """Delivers the events collected for the batch variant of the callback called name."""
+        batch: List[tuple[Any, ...]] = self._batches[name]
+        if not batch:
+            return
+        self._batches[name] = []
+        await self._invoke(f"{name}_batch", getattr(self.callbacks, f"{name}_batch"), (batch,))
+
+    async def _invoke(self: Self, name: str, callback: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        """Calls a sync callback inline, or starts an async one once a callback slot is free."""
+        if name in self._async_callbacks:
+            await self._callback_slots.acquire()
+            if self._task_group is None:
+                await self._run_async_callback(name, callback, args)
+            else:
+                self._task_group.create_task(self._run_async_callback(name, callback, args))
+            return
+        if self.metrics is None:
+            callback(*args)
+            return
+        start: float = time.perf_counter()
+        try:
+            callback(*args)
+        finally:
+            self.metrics.callbacks[name].add(time.perf_counter() - start)
+
+    async def _run_async_callback(self: Self, name: str, callback: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        """Awaits an async callback, then frees its slot."""
+        start: float = time.perf_counter()
+        try:
+            await callback(*args)
+        finally:
+            self._callback_slots.release()
+            if self.metrics is not None:
+                self.metrics.callbacks[name].add(time.perf_counter() - start)
+
+    async def _batch_flusher(self: Self) -> None:
+        """Background task that delivers incomplete batches every batch_interval."""
+        if not self._batches:
+            return
+        try:
+            while True:
+                await asyncio.sleep(self.callbacks.batch_interval.total_seconds())
+                for name in list(self._batches):
+                    await self._flush_batch(name)
+        except asyncio.CancelledError:
+            return
+
+    async def _process(self: Self, transport: Transport, envelope: _Envelope) -> None:
+        """Sends one input item, retrying it until it reaches a final state."""
+        metrics: _MetricsCollector | None = self.metrics
+        item: Any = envelope.payload
+        req: Dict[str, Any] = self.render_request(item) if self.render_request else item
+        emit_scope: _EmitScope | None = _emit_scope.get()
+        if emit_scope is None:
+            # First item of this worker (or this request's own task with dispatch="tasks")
+            emit_scope = _EmitScope()
+            _emit_scope.set(emit_scope)
+        reserved_bytes: int = 0
+        if self.memory_budget:
+            reserved_bytes = _request_body_size(req)
+            await self.memory_budget.reserve(reserved_bytes)
+
+        try:
+            soft_retries: int = 0
+            timeout_retries: int = 0
+            retry_budget: _RetryBudgetTracker | None = self._retry_budget
+            mirrors: MirrorPool | None = self.mirrors
+            classify: (
+                Callable[[Dict[str, Any], aiohttp.ClientResponse], Awaitable[tuple[ResponseState, Any]]] | None
+            ) = self.classify_and_parse
+            # classify_and_parse replaces inspect_response, which __init__ requires otherwise
+            inspect: Callable[[aiohttp.ClientResponse], ResponseState] | None = (
+                self.inspect_response if classify is None else None
+            )
+            if retry_budget is not None:
+                retry_budget.first_attempt(time.monotonic())
+            # Kind of the last failed attempt, the one a retry refused by the retry budget gives up on
+            retrying: Outcome | None = None
+            while True:
+                denied: bool = False
+                if (
+                    retrying is not None
+                    and retry_budget is not None
+                    and soft_retries < self.max_retries_by_soft_fail
+                    and timeout_retries < self.max_retries_by_timeout
+                ):
+                    denied = not retry_budget.try_retry(time.monotonic())
+                if soft_retries >= self.max_retries_by_soft_fail or (denied and retrying is Outcome.SOFT_FAIL):
+                    self.max_retries_soft_reached_count += 1
+                    await self._finish(envelope, "max_retries_soft_fail_reached", req, req, None)
+                    if "on_max_retries_by_soft_fail_reached" in self._events:
+                        await self._fire("on_max_retries_by_soft_fail_reached", req)
+                    if self.stop_conditions.stop_on_max_retries_by_soft_fail_reached:
+                        raise MaxRetriesStop("Max soft-fail retries reached.")
+                    break
+
+                if timeout_retries >= self.max_retries_by_timeout or denied:
+                    self.max_retries_timeout_reached_count += 1
+                    await self._finish(envelope, "max_retries_timeout_reached", req, req, None)
+                    if "on_max_retries_by_timeout_reached" in self._events:
+                        await self._fire("on_max_retries_by_timeout_reached", req)
+                    if self.stop_conditions.stop_on_max_retries_by_timeout_reached:
+                        raise MaxRetriesStop("Max timeout retries reached.")
+                    break
+
+                sent: Dict[str, Any] = req
+                mirror: _Mirror | None = None
+                sent_at: float = 0.0
+                if mirrors is not None:
+                    mirror = mirrors.acquire()
+                    sent = mirrors.rewrite(req, mirror)
+                    sent_at = time.perf_counter()
+                try:
+                    async with transport.request(sent) as response:
+                        state: ResponseState
+                        parsed_response: Any = None
+                        body_bytes: int = 0
+                        status_codes: Dict[int, int] = self.status_codes
+                        status_codes[response.status] = status_codes.get(response.status, 0) + 1
+                        if inspect is not None:
+                            if metrics is None:
+                                state = inspect(response)
+                            else:
+                                inspect_start: float = time.perf_counter()
+                                state = inspect(response)
+                                metrics.inspect_response.add(time.perf_counter() - inspect_start)
+                            if mirror is not None and mirrors is not None:
+                                mirrors.release(mirror, state == ResponseState.SOFT_FAIL, time.perf_counter() - sent_at)
+                                mirror = None
+                        if self.memory_budget:
+                            body_bytes = response.content_length or 0
+                            self.memory_budget.charge(body_bytes)
+                        if emit_scope.items:
+                            # Left over by a response that did not succeed
+                            emit_scope.items.clear()
+                        emit_scope.open = True
+                        try:
+                            if classify is not None:
+                                if metrics is None:
+                                    state, parsed_response = await classify(req, response)
+                                else:
+                                    parse_start: float = time.perf_counter()
+                                    state, parsed_response = await classify(req, response)
+                                    metrics.parse_response.add(time.perf_counter() - parse_start)
+                            elif state != ResponseState.SOFT_FAIL:
+                                # Soft fails are retried, so their body is never read or decoded
+                                if metrics is None:
+                                    parsed_response = await self.parse_response(req, response)
+                                else:
+                                    parse_start = time.perf_counter()
+                                    parsed_response = await self.parse_response(req, response)
+                                    metrics.parse_response.add(time.perf_counter() - parse_start)
+                        finally:
+                            emit_scope.open = False
+                            if self.memory_budget:
+                                self.memory_budget.release(body_bytes)
+                        if mirror is not None and mirrors is not None:
+                            mirrors.release(mirror, state == ResponseState.SOFT_FAIL, time.perf_counter() - sent_at)
+                            mirror = None
+
+                        if state == ResponseState.SUCCESS:
+                            self.success_count += 1
+                            if emit_scope.items:
+                                self._commit_followups(emit_scope.items)
+                                emit_scope.items.clear()
+                            await self._finish(envelope, "success", parsed_response, req, state)
+                            if "on_success" in self._events:
+                                await self._fire("on_success", req, response)
+                            if self._threshold_trackers:
+                                self._record_attempt(Outcome.SUCCESS, sent)
+                            break
+                        elif state == ResponseState.SOFT_FAIL:
+                            self.retries_by_soft_fail += 1
+                            if "on_soft_fail" in self._events:
+                                await self._fire("on_soft_fail", req, soft_retries)
+                            if self.stop_conditions.stop_on_soft_fail:
+                                raise SoftFailStop("Stop on soft fail.")
+                            if self._threshold_trackers:
+                                self._record_attempt(Outcome.SOFT_FAIL, sent)
+                            soft_retries += 1
+                            retrying = Outcome.SOFT_FAIL
+                            continue
+                        elif state == ResponseState.HARD_FAIL:
+                            self.failed_count += 1
+                            await self._finish(envelope, "failed", parsed_response, req, state)
+                            if "on_hard_fail" in self._events:
+                                await self._fire("on_hard_fail", req, response)
+                            if self.stop_conditions.stop_on_hard_fail:
+                                raise HardFailStop("Stop on hard fail.")
+                            if self._threshold_trackers:
+                                self._record_attempt(Outcome.HARD_FAIL, sent)
+                            break
+                except asyncio.TimeoutError as e:
+                    self._count_exception(e)
+                    self.retries_by_timeout += 1
+                    if "on_timeout" in self._events:
+                        await self._fire("on_timeout", req, timeout_retries)
+                    if self.stop_conditions.stop_on_timeout:
+                        raise TimeoutFailStop("Stop on timeout.")
+                    if self._threshold_trackers:
+                        self._record_attempt(Outcome.TIMEOUT, sent)
+                    timeout_retries += 1
+                    retrying = Outcome.TIMEOUT
+                    continue
+                except Exception as e:
+                    if not isinstance(e, SPARPStopSignal):
+                        self._count_exception(e)
+                        e.add_note(f"SPARP_REQUEST_DATA: {req}")
+                    raise
+                finally:
+                    # Timeouts and errors before inspect_response count against the mirror
+                    if mirror is not None and mirrors is not None:
+                        mirrors.release(mirror, True, time.perf_counter() - sent_at)
+        finally:
+            if self.memory_budget:
+                self.memory_budget.release(reserved_bytes, finished=True)
+
+    def _count_exception(self: Self, e: BaseException) -> None:
+        name: str = type(e).__name__
+        self.exceptions[name] = self.exceptions.get(name, 0) + 1
+
+    def _record_attempt(self: Self, outcome: Outcome, req: Dict[str, Any]) -> None:
+        """Feeds the outcome of one attempt to every threshold, raising ThresholdStop if one trips."""
+        now: float = time.monotonic()
+        for tracker in self._threshold_trackers:
+            tracker.record(outcome, req, now)
+
+    def _submit(self: Self, item: Any, done: Callable[[str | None, Any], None]) -> None:
+        """Queues an item from outside the run, like a follow-up; done receives its outcome (see _Envelope).
+
+        Must be called on the loop of the run, e.g. by SPARPExecutor.
+        """
+        envelope: _Envelope = _Envelope(0, item)
+        envelope.done = done
+        self._followups.append(envelope)
+        self._activity.pending += 1
+        self._activity.changed.set()
+
+    def _commit_followups(self: Self, emitted: List[tuple[str | None, Any]]) -> None:
+        """Hands the follow-ups emitted by a successful response to the producers of their target stages."""
+        for stage, item in emitted:
+            target: SPARP | None = self if stage is None else self._stages.get(stage)
+            if target is None:
+                raise ValueError(f"emit() targets unknown stage {stage!r}")
+            target._followups.append(item)
+            self._activity.pending += 1
+        self._activity.changed.set()
+
+    async def _finish(
+        self: Self,
+        envelope: _Envelope,
+        kind: str,
+        value: Any,
+        req: Dict[str, Any],
+        state: ResponseState | None,
+    ) -> None:
+        """Records the final outcome of an input item under its kind (see ResultQueues).
+
+        state is None for max-retries outcomes.
+
+        With ordered=True the outcome waits in the reorder buffer until all earlier items are emitted.
+        """
+        if envelope.done is not None:
+            envelope.done(kind, value)
+        if self._reducers_by_state and state is not None:
+            accumulators: Dict[str, Any] = self.accumulators
+            for name, reducer in self._reducers_by_state.get(state, ()):
+                accumulators[name] = reducer.accumulate(accumulators[name], value)
+        if not self.ordered:
+            self._store(kind, value)
+            if state is not None:
+                if "on_result" in self._events:
+                    await self._fire("on_result", req, state, value)
+            return
+
+        index: int = envelope.index
+        self._reorder_buffer[index] = (kind, IndexedResult(index=index, value=value), req, state)
+        if self._emitting:
+            # The worker already emitting will pick this outcome up if it is next in line
+            return
+        self._emitting = True
+        try:
+            await self._emit_in_order()
+        finally:
+            self._emitting = False
+
+    async def _emit_in_order(self: Self, flush: bool = False) -> None:
+        """Emits buffered outcomes in input order; flush=True also skips over gaps (used after a stop)."""
+        while self._reorder_buffer:
+            if self.next_emit_index not in self._reorder_buffer:
+                if not flush:
+                    break
+                self.next_emit_index = min(self._reorder_buffer)
+            kind, item, req, state = self._reorder_buffer.pop(self.next_emit_index)
+            self.next_emit_index += 1
+            self._reorder_window_moved.set()
+            self._store(kind, item)
+            if state is not None:
+                if "on_result" in self._events:
+                    await self._fire("on_result", req, state, item)
+
+    def _store(self: Self, kind: str, item: Any) -> None:
+        """Adds a final result to the results of its kind, charging its estimated size to the memory budget.
+
+        Failure outcomes under a failure_retention policy go to its store instead, which may keep, drop or
+        spill them, or evict an earlier one, whether or not retain_results is set.
+        """
+        store: RetentionStore | None = self.queues.retained.get(kind) if self.queues.retained else None
+        if store is not None:
+            kept, evicted = store.offer(item)
+            if self.memory_budget:
+                delta_bytes: int = _estimate_size(item) if kept else 0
+                if evicted is not None:
+                    delta_bytes -= _estimate_size(evicted)
+                self.results_bytes += delta_bytes
+                if delta_bytes > 0:
+                    self.memory_budget.charge(delta_bytes)
+                elif delta_bytes < 0:
+                    self.memory_budget.release(-delta_bytes)
+            return
+        if not self.retain_results:
+            return
+        if self.memory_budget:
+            n_bytes: int = _estimate_size(item)
+            self.results_bytes += n_bytes
+            self.memory_budget.charge(n_bytes)
+        self.queues.by_kind[kind].append(item)
+
+    async def _producer(self: Self, transport: Transport) -> None:
+        """Iterates over input_collection and the emitted follow-ups and populates the input queue.
+
+        Follow-ups go first so that fan-out work finishes before more input is read. Once input_collection
+        is exhausted, the producer waits for follow-ups until the whole run (every Pipeline stage) is idle.
+        """
+        metrics: _MetricsCollector | None = self.metrics
+        activity: _Activity = self._activity
+        followups: collections.deque[Any] = self._followups
+        source: Iterator[Any] | None = iter(self.input_collection)
+        load: _LoadCollector | None = self.load
+        schedule: Iterator[float] | None = None
+        if load is not None:
+            load.started_at = load.last_dispatch_at = time.perf_counter()
+            schedule = load.profile.offsets()
+        while True:
+            item: Any
+            intended_at: float = 0.0
+            if followups:
+                item = followups.popleft()
+            elif source is not None:
+                try:
+                    if schedule is not None and load is not None:
+                        intended_at = load.started_at + next(schedule)
+                    item = next(source)
+                except StopIteration:
+                    source = None
+                    self.iterator_exhausted.set()
+                    activity.close_source()
+                    continue
+                activity.pending += 1
+            elif activity.idle:
+                break
+            else:
+                activity.changed.clear()
+                await activity.changed.wait()
+                continue
+
+            envelope: _Envelope
+            if isinstance(item, _Envelope):
+                envelope = item
+                envelope.index = self.seen
+            else:
+                envelope = _Envelope(self.seen, item)
             self.seen += 1
-            await self.input_queue.put(item)
-        self.iterator_exhausted.set()
-        for _ in range(self.concurrency):
-            await self.input_queue.put(DoneSentinel())
+            if intended_at:
+                delay_s: float = intended_at - time.perf_counter()
+                if delay_s > 0:
+                    await asyncio.sleep(delay_s)
+                envelope.intended_at = intended_at
+            if self.ordered:
+                while envelope.index >= self.next_emit_index + self.reorder_window:
+                    # The reorder buffer is full behind a slow request: hold dispatch instead of growing it
+                    self._reorder_window_moved.clear()
+                    await self._reorder_window_moved.wait()
+            if metrics is None:
+                await self._put(transport, envelope)
+            else:
+                put_start: float = time.perf_counter()
+                await self._put(transport, envelope)
+                envelope.enqueued_at = time.perf_counter()
+                metrics.producer_blocked_s += envelope.enqueued_at - put_start
+            if intended_at and load is not None:
+                load.last_dispatch_at = time.perf_counter()
+                load.dispatched += 1
+                load.max_dispatch_lag_s = max(load.max_dispatch_lag_s, load.last_dispatch_at - intended_at)
+        self._dispatch_done.set()
+        if self.dispatch == "workers":
+            for _ in range(self.concurrency):
+                await self.input_queue.put(DoneSentinel())
 
     def dones(self: Self) -> int:
         """Returns the total number of processed requests (final states)."""
@@ -335,10 +1705,26 @@ class SPARP:
         else:
             est = f"{done}/?"
 
+        memory: str = ""
+        if self.memory_budget:
+            memory = f"MEMORY: {self.memory_budget.in_use / 1e6:.1f}/{self.memory_budget.max_bytes / 1e6:.1f}MB | "
+
+        budget: str = ""
+        if self._retry_budget:
+            budget = f"RETRY_BUDGET: {100 * self._retry_budget.use():.0f}% ({self._retry_budget.denied} denied) | "
+
+        gauges: str = ""
+        if self.metrics:
+            scheduler: SchedulerMetrics = self.metrics.snapshot(self.concurrency, self.seen)
+            gauges = (
+                f"IDLE: {100 * scheduler.worker_idle_ratio:.0f}% | QWAIT: {1e3 * scheduler.queue_wait.mean_s:.1f}ms | "
+                f"PRODUCER: {scheduler.producer_throughput:.0f}/s | "
+            )
+
         print(
             f"SUCCESS: {self.success_count} | HARD_FAIL: {self.failed_count} | "
             f"TIMEOUT_RETRIES: {self.retries_by_timeout} | SOFT_RETRIES: {self.retries_by_soft_fail} | "
-            f"TOOK: {time.time() - self.start_time:.2f}s | PROGRESS: {est}",
+            f"{memory}{budget}{gauges}TOOK: {time.time() - self.start_time:.2f}s | PROGRESS: {est}",
             end="\r",
         )
 
@@ -356,19 +1742,46 @@ class SPARP:
     async def _main(self: Self) -> SparpResult:
         """Core async orchestrator managing the TaskGroup for workers and producer."""
         try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout_s)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with self.transport.opened(self.timeout_s) as transport:
                 async with asyncio.TaskGroup() as tg:
+                    self._task_group = tg
                     updater_task = tg.create_task(self._bar_updater())
-                    tg.create_task(self._producer())
-                    for _ in range(self.concurrency):
-                        tg.create_task(self._requester(session))
-
-                    await self.iterator_exhausted.wait()
+                    flusher_task = tg.create_task(self._batch_flusher())
+                    self._producer_task = tg.create_task(self._producer(transport))
+                    if self.dispatch == "workers":
+                        self._requester_tasks = [
+                            tg.create_task(self._requester(transport)) for _ in range(self.concurrency)
+                        ]
+
+                    await self._dispatch_done.wait()
                     await self.input_queue.join()
+                    while self._request_tasks:
+                        await asyncio.wait(set(self._request_tasks))
                     updater_task.cancel()
-        except* SPARPStopSignal:
-            pass
+                    flusher_task.cancel()
+                    if self._cancelled:
+                        # No DoneSentinels follow a cancel(): release the workers still waiting for input
+                        for task in self._requester_tasks:
+                            task.cancel()
+        except* SPARPStopSignal as stop:
+            self.stop_reason = str(stop.exceptions[0])
+        finally:
+            self._task_group = None
+        return await self._finalize()
+
+    async def _finalize(self: Self) -> SparpResult:
+        """Delivers what the run still holds and collects the results.
+
+        Outcomes stuck behind unfinished requests and incomplete batches are delivered too, so nothing is lost
+        when a stop condition ended the run early.
+        """
+        await self._emit_in_order(flush=True)
+        for name in list(self._batches):
+            await self._flush_batch(name)
+        if self.finish_reducers:
+            self.accumulators = {
+                name: reducer.finish(self.accumulators[name]) for name, reducer in self.reducers.items()
+            }
 
         if self.show_progress_bar:
             print("\r")
@@ -378,6 +1791,50 @@ class SPARP:
         """Synchronous entry point to run the SPARP engine."""
         return asyncio.run(self._main())
 
+    def start(self: Self) -> "SparpHandle":
+        """Starts the run on a background thread with its own event loop and returns a handle to it."""
+        return SparpHandle(self)
+
+    def _cancel(self: Self, drain_timeout_s: float | None) -> None:
+        """Stops dispatch and drops queued items; in-flight requests get drain_timeout_s seconds to finish.
+
+        Must be called on the loop of the run; does nothing once the run is over.
+        """
+        if self._cancelled or self._producer_task is None or self._task_group is None:
+            return
+        self._cancelled = True
+        if self.stop_reason is None:
+            self.stop_reason = "Cancelled."
+        self._producer_task.cancel()
+        while not self.input_queue.empty():
+            if isinstance(self.input_queue.get_nowait(), _Envelope):
+                self._activity.finish()
+            self.input_queue.task_done()
+        self._dispatch_done.set()
+        if drain_timeout_s is not None:
+            asyncio.get_running_loop().call_later(drain_timeout_s, self._abort_in_flight)
+
+    def _abort_in_flight(self: Self) -> None:
+        """Cancels the requests still running once the drain timeout of a cancel() has passed."""
+        for task in [*self._requester_tasks, *self._request_tasks]:
+            task.cancel()
+
+    def reduced(self: Self) -> Dict[str, Any]:
+        """Returns the current value of each reducer, keyed by name."""
+        return {name: reducer.result(self.accumulators[name]) for name, reducer in self.reducers.items()}
+
+    def partial_results(self: Self) -> SparpResult:
+        """Returns the results stored so far without removing them, unlike get_results()."""
+        snapshot: Dict[str, List[Any]] = self.queues.snapshot_all()
+        return SparpResult(
+            success=snapshot["success"],
+            failed=snapshot["failed"],
+            max_retries_soft_fail_reached=snapshot["max_retries_soft_fail_reached"],
+            max_retries_timeout_reached=snapshot["max_retries_timeout_reached"],
+            stats=self.get_stats(),
+            reduced=self.reduced(),
+        )
+
     def get_stats(self: Self) -> SparpStats:
         """Returns a snapshot of the current execution statistics."""
         return SparpStats(
@@ -385,15 +1842,119 @@ class SPARP:
             failed=self.failed_count,
             soft_retries=self.retries_by_soft_fail,
             timeout_retries=self.retries_by_timeout,
+            memory_in_use_bytes=self.memory_budget.in_use if self.memory_budget else 0,
+            memory_peak_bytes=self.memory_budget.peak if self.memory_budget else 0,
+            memory_budget_waits=self.memory_budget.waits if self.memory_budget else 0,
+            max_retries_soft_fail_reached=self.max_retries_soft_reached_count,
+            max_retries_timeout_reached=self.max_retries_timeout_reached_count,
+            status_codes=dict(self.status_codes),
+            exceptions=dict(self.exceptions),
+            retries_denied=self._retry_budget.denied if self._retry_budget else 0,
+            retry_budget_use=self._retry_budget.use() if self._retry_budget else None,
+            mirrors=self.mirrors.snapshot() if self.mirrors else None,
+            scheduler=self.metrics.snapshot(self.concurrency, self.seen) if self.metrics else None,
+            stop_reason=self.stop_reason,
+            load=self.load.snapshot() if self.load else None,
         )
 
     async def get_results(self: Self) -> SparpResult:
-        """Drains all internal queues and returns the final SparpResult object."""
-        drained = await self.queues.drain_all()
+        """Takes all stored results out and returns the final SparpResult object."""
+        drained: Dict[str, List[Any]] = self.queues.drain_all()
+        if self.memory_budget:
+            self.memory_budget.release(self.results_bytes)
+            self.results_bytes = 0
         return SparpResult(
             success=drained["success"],
             failed=drained["failed"],
             max_retries_soft_fail_reached=drained["max_retries_soft_fail_reached"],
             max_retries_timeout_reached=drained["max_retries_timeout_reached"],
             stats=self.get_stats(),
+            reduced=self.reduced(),
+        )
+
+
+class SparpHandle:
+    """A run started with SPARP.start(), executing on its own thread and event loop.
+
+    All methods can be called from any thread. stats() and partial_results() are taken on the loop of the
+    run, between two steps of the engine, so they are consistent snapshots.
+    """
+
+    def __init__(self: Self, sparp: SPARP) -> None:
+        """Starts the background thread of the run and waits for its loop."""
+        self.sparp: SPARP = sparp
+        self._lock: threading.Lock = threading.Lock()
+        self._finished: bool = False
+        self._result: SparpResult | None = None
+        self._error: BaseException | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        loop_ready: threading.Event = threading.Event()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, args=(loop_ready,), name="sparp", daemon=True
         )
+        self._thread.start()
+        loop_ready.wait()
+
+    def _run(self: Self, loop_ready: threading.Event) -> None:
+        with asyncio.Runner() as runner:
+            self._loop = runner.get_loop()
+            loop_ready.set()
+            try:
+                self._result = runner.run(self.sparp._main())
+            except BaseException as e:
+                self._error = e
+            with self._lock:
+                self._finished = True
+            # Serve the calls scheduled by _call before _finished was set
+            runner.run(asyncio.sleep(0))
+
+    def _call(self: Self, fn: Callable[[], Any]) -> Any:
+        """Runs fn on the loop of the run, or directly once the run is over, and returns its result."""
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+
+        def call() -> None:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+        with self._lock:
+            if self._finished or self._loop is None:
+                return fn()
+            self._loop.call_soon_threadsafe(call)
+        return future.result()
+
+    def done(self: Self) -> bool:
+        """Whether the run is over."""
+        return not self._thread.is_alive()
+
+    def stats(self: Self) -> SparpStats:
+        """Returns a snapshot of get_stats()."""
+        return self._call(self.sparp.get_stats)
+
+    def partial_results(self: Self) -> SparpResult:
+        """Returns a snapshot of the results stored so far; the final result() still contains them."""
+        return self._call(self.sparp.partial_results)
+
+    def cancel(self: Self, drain_timeout_s: float | None = None) -> SparpResult:
+        """Stops the run and returns its result.
+
+        No new request is dispatched and queued ones are dropped. Requests in flight may finish for up to
+        drain_timeout_s seconds (as long as they need with None) before they are cancelled too. Once the run
+        is over, this only returns its result.
+        """
+        with self._lock:
+            finished: bool = self._finished
+        if not finished:
+            self._call(lambda: self.sparp._cancel(drain_timeout_s))
+        return self.result()
+
+    def result(self: Self, timeout_s: float | None = None) -> SparpResult:
+        """Waits for the run to end and returns its result, re-raising the error that ended it if any."""
+        self._thread.join(timeout_s)
+        if self._thread.is_alive():
+            raise TimeoutError("SPARP run still in progress")
+        if self._error is not None:
+            raise self._error
+        assert self._result is not None
+        return self._result
@@ -0,0 +1,139 @@
+import asyncio
+import itertools
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Self
+
+import aiohttp
+
+from .reducers import Reducer, merge_accumulators
+from .sparp import SPARP, ResponseState, SparpResult, SparpStats, TemplatedInput
+from .transports import Transport
+
+
+class _SharedFeed:
+    """The input shared by all loops, handed out under a lock in small batches to keep contention low."""
+
+    def __init__(self: Self, source: Iterable[Any], batch_size: int) -> None:
+        self._source: Iterator[Any] = iter(source)
+        self._batch_size: int = batch_size
+        self._lock: threading.Lock = threading.Lock()
+        self.stopped: threading.Event = threading.Event()
+
+    def _take(self: Self) -> List[Any]:
+        with self._lock:
+            if self.stopped.is_set():
+                return []
+            return list(itertools.islice(self._source, self._batch_size))
+
+    def view(self: Self) -> Iterator[Any]:
+        """Yields items for one loop until the input runs out or a loop stopped."""
+        while batch := self._take():
+            yield from batch
+
+
+class ThreadedSPARP:
+    """Runs one SPARP engine per thread, each on its own event loop and transport, over a shared input.
+
+    On free-threaded Python builds parse_response and callbacks then use as many cores as there are threads;
+    with the GIL the loops still overlap their waits. Items are pulled from input_collection under a lock, so
+    any iterator works, and results stay in memory shared by the threads instead of being pickled between
+    processes. Results, counters and reducers of all loops are merged into one SparpResult.
+
+    sparp_kwargs are passed to every engine. concurrency and memory_budget_bytes are divided evenly between
+    the loops, while failure_retention and retry_budget apply to each loop on its own. Callbacks, parse_response
+    and reducer keys run on several threads at once and must be thread-safe. ordered, load_profile, mirrors
+    and show_progress_bar need a single loop and are not supported; pass transport_factory instead of
+    transport, since a transport cannot be shared between event loops.
+    """
+
+    UNSUPPORTED: tuple[str, ...] = ("ordered", "load_profile", "mirrors", "show_progress_bar", "transport")
+
+    def __init__(
+        self: Self,
+        input_collection: Iterable[Dict[str, Any]] | TemplatedInput,
+        inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] | None,
+        threads: int = 4,
+        transport_factory: Callable[[], Transport] | None = None,
+        feed_batch_size: int = 32,
+        **sparp_kwargs: Any,
+    ) -> None:
+        """Stores the engine configuration; transport_factory builds one transport per loop (default aiohttp)."""
+        if threads < 1:
+            raise ValueError("threads should be at least 1")
+        if feed_batch_size < 1:
+            raise ValueError("feed_batch_size should be at least 1")
+        unsupported: List[str] = [name for name in self.UNSUPPORTED if sparp_kwargs.get(name)]
+        if unsupported:
+            raise ValueError(f"ThreadedSPARP does not support {', '.join(unsupported)}")
+        self.input_collection: Iterable[Any] = input_collection
+        self.inspect_response: Callable[[aiohttp.ClientResponse], ResponseState] | None = inspect_response
+        self.threads: int = threads
+        self.transport_factory: Callable[[], Transport] | None = transport_factory
+        self.feed_batch_size: int = feed_batch_size
+        self.sparp_kwargs: Dict[str, Any] = sparp_kwargs
+        # The engine of each loop, set by the loop once it starts
+        self.engines: List[SPARP | None] = []
+
+    def _engine_kwargs(self: Self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = dict(self.sparp_kwargs)
+        kwargs["concurrency"] = max(1, kwargs.get("concurrency", 100) // self.threads)
+        if kwargs.get("memory_budget_bytes"):
+            kwargs["memory_budget_bytes"] = max(1, kwargs["memory_budget_bytes"] // self.threads)
+        kwargs.pop("estimated_input_collection_size", None)
+        if self.transport_factory is not None:
+            kwargs["transport"] = self.transport_factory()
+        return kwargs
+
+    def _run_loop(self: Self, feed: _SharedFeed, slot: int, outcomes: List[Any]) -> None:
+        try:
+            source: Iterable[Any] = feed.view()
+            if isinstance(self.input_collection, TemplatedInput):
+                source = TemplatedInput(self.input_collection.template, source)
+            sparp: SPARP = SPARP(source, self.inspect_response, **self._engine_kwargs())
+            sparp.finish_reducers = False
+            self.engines[slot] = sparp
+            result: SparpResult = asyncio.run(sparp._main())
+            outcomes[slot] = result
+            if result.stats.stop_reason is not None:
+                # A stop condition in one loop ends dispatch in all of them
+                feed.stopped.set()
+        except BaseException as e:
+            feed.stopped.set()
+            outcomes[slot] = e
+
+    def main(self: Self) -> SparpResult:
+        """Runs all loops to completion and returns their merged result, re-raising the first error if any."""
+        source: Iterable[Any] = self.input_collection
+        if isinstance(source, TemplatedInput):
+            source = source.column
+        feed: _SharedFeed = _SharedFeed(source, self.feed_batch_size)
+        outcomes: List[Any] = [None] * self.threads
+        self.engines = [None] * self.threads
+        workers: List[threading.Thread] = [
+            threading.Thread(target=self._run_loop, args=(feed, slot, outcomes), name=f"sparp-{slot}")
+            for slot in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        results: List[SparpResult] = outcomes
+        # Every loop ran without error, so each one has set its engine
+        engines: List[SPARP] = [sparp for sparp in self.engines if sparp is not None]
+
+        reducers: Dict[str, Reducer] = engines[0].reducers
+        accumulators: Dict[str, Any] = engines[0].accumulators
+        for sparp in engines[1:]:
+            accumulators = merge_accumulators(reducers, accumulators, sparp.accumulators)
+        accumulators = {name: reducer.finish(accumulators[name]) for name, reducer in reducers.items()}
+        return SparpResult(
+            stats=SparpStats.merge(result.stats for result in results),
+            success=[item for result in results for item in result.success],
+            failed=[item for result in results for item in result.failed],
+            max_retries_soft_fail_reached=[item for result in results for item in result.max_retries_soft_fail_reached],
+            max_retries_timeout_reached=[item for result in results for item in result.max_retries_timeout_reached],
+            reduced={name: reducer.result(accumulators[name]) for name, reducer in reducers.items()},
+        )
@@ -0,0 +1,267 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, AsyncIterator, Callable, Dict, Self
+
+import aiohttp
+
+
+class Transport(ABC):
+    """Sends request dicts on behalf of the SPARP engine.
+
+    request(req) returns an async context manager yielding a response that offers the part of the
+    aiohttp.ClientResponse surface used by inspect_response and parse_response: status, headers,
+    content_length, read(), text() and json(). Timeouts must surface as asyncio.TimeoutError so the
+    engine can retry them.
+    """
+
+    async def open(self: Self, timeout_s: float) -> None:
+        """Acquires client resources (sessions, connection pools) before the run starts."""
+
+    async def close(self: Self) -> None:
+        """Releases client resources after the run ends."""
+
+    @asynccontextmanager
+    async def opened(self: Self, timeout_s: float) -> AsyncIterator[Self]:
+        """Opens the transport for the duration of a run."""
+        await self.open(timeout_s)
+        try:
+            yield self
+        finally:
+            await self.close()
+
+    @abstractmethod
+    def request(self: Self, req: Dict[str, Any]) -> AbstractAsyncContextManager[Any]:
+        """Sends one request and yields its response."""
+
+
+class AiohttpTransport(Transport):
+    """Default HTTP/1.1 transport backed by one aiohttp.ClientSession."""
+
+    def __init__(self: Self, **session_kwargs: Any) -> None:
+        """Stores extra aiohttp.ClientSession kwargs (e.g. connector, headers)."""
+        self.session_kwargs: Dict[str, Any] = session_kwargs
+        self.session: aiohttp.ClientSession | None = None
+
+    async def open(self: Self, timeout_s: float) -> None:
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout_s), **self.session_kwargs)
+
+    async def close(self: Self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def request(self: Self, req: Dict[str, Any]) -> AbstractAsyncContextManager[Any]:
+        assert self.session is not None, "AiohttpTransport.request called before open"
+        return self.session.request(**req)
+
+
+class HttpxResponse:
+    """Adapts an httpx.Response to the aiohttp.ClientResponse surface expected by SPARP hooks."""
+
+    def __init__(self: Self, response: Any) -> None:
+        """Wraps a streamed httpx.Response."""
+        self._response: Any = response
+        self.status: int = response.status_code
+        self.headers: Any = response.headers
+        self.reason: str = response.reason_phrase
+        self.url: Any = response.url
+        self.version: str = response.http_version
+
+    @property
+    def content_length(self: Self) -> int | None:
+        length: str | None = self.headers.get("content-length")
+        return int(length) if length is not None else None
+
+    async def read(self: Self) -> bytes:
+        import httpx
+
+        try:
+            return bytes(await self._response.aread())
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError() from e
+
+    async def text(self: Self, encoding: str | None = None, errors: str = "strict") -> str:
+        body: bytes = await self.read()
+        return body.decode(encoding or self._response.encoding or "utf-8", errors)
+
+    async def json(
+        self: Self,
+        encoding: str | None = None,
+        loads: Callable[[str], Any] = json.loads,
+        content_type: str | None = "application/json",
+    ) -> Any:
+        return loads(await self.text(encoding=encoding))
+
+
+class Http2Transport(Transport):
+    """HTTP/2 transport multiplexing concurrent requests as streams over a few connections.
+
+    Requires the optional httpx[http2] dependency (pip install sparp[http2]). HTTPS origins negotiate
+    HTTP/2 through ALPN; prior_knowledge=True speaks HTTP/2 directly over cleartext connections (h2c).
+    timeout_s applies to each connect, read, write and pool-acquire phase of an attempt.
+    """
+
+    _SUPPORTED_KWARGS: frozenset[str] = frozenset(
+        {"method", "url", "params", "headers", "json", "data", "cookies", "allow_redirects"}
+    )
+
+    def __init__(self: Self, max_connections: int = 10, prior_knowledge: bool = False, **client_kwargs: Any) -> None:
+        """Stores connection limits and extra httpx.AsyncClient kwargs."""
+        self.max_connections: int = max_connections
+        self.prior_knowledge: bool = prior_knowledge
+        self.client_kwargs: Dict[str, Any] = client_kwargs
+        self.client: Any = None
+
+    async def open(self: Self, timeout_s: float) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("Http2Transport requires httpx[http2]: pip install 'sparp[http2]'") from e
+        self.client = httpx.AsyncClient(
+            http1=not self.prior_knowledge,
+            http2=True,
+            timeout=timeout_s,
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            **self.client_kwargs,
+        )
+
+    async def close(self: Self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def _to_httpx_kwargs(self: Self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """Translates aiohttp-style request kwargs into httpx.AsyncClient.build_request kwargs."""
+        unsupported: set[str] = set(req) - self._SUPPORTED_KWARGS
+        if unsupported:
+            raise TypeError(f"Http2Transport does not support request kwargs: {sorted(unsupported)}")
+        kwargs: Dict[str, Any] = {k: v for k, v in req.items() if k not in ("data", "allow_redirects")}
+        data: Any = req.get("data")
+        if isinstance(data, (bytes, bytearray, str)):
+            kwargs["content"] = data
+        elif data is not None:
+            kwargs["data"] = data
+        return kwargs
+
+    @asynccontextmanager
+    async def _request(self: Self, req: Dict[str, Any]) -> AsyncIterator[HttpxResponse]:
+        import httpx
+
+        request: Any = self.client.build_request(**self._to_httpx_kwargs(req))
+        try:
+            response: Any = await self.client.send(
+                request, stream=True, follow_redirects=req.get("allow_redirects", True)
+            )
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError() from e
+        try:
+            yield HttpxResponse(response)
+        finally:
+            await response.aclose()
+
+    def request(self: Self, req: Dict[str, Any]) -> AbstractAsyncContextManager[HttpxResponse]:
+        assert self.client is not None, "Http2Transport.request called before open"
+        return self._request(req)
+
+
+@dataclass(frozen=True)
+class ScriptedResponse:
+    """Synthetic response returned by InMemoryTransport.
+
+    Attributes:
+        status: HTTP status code.
+        body: Raw response body.
+        headers: Response headers.
+        latency_s: Simulated time until the response arrives; above the run's timeout_s it becomes a timeout.
+    """
+
+    status: int = 200
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    latency_s: float = 0.0
+
+
+class InMemoryResponse:
+    """Response of InMemoryTransport with the aiohttp.ClientResponse surface expected by SPARP hooks."""
+
+    def __init__(self: Self, scripted: ScriptedResponse) -> None:
+        """Wraps a ScriptedResponse."""
+        self.status: int = scripted.status
+        self.headers: Dict[str, str] = scripted.headers
+        self.content_length: int | None = len(scripted.body)
+        self._body: bytes = scripted.body
+
+    async def read(self: Self) -> bytes:
+        return self._body
+
+    async def text(self: Self, encoding: str | None = None, errors: str = "strict") -> str:
+        return self._body.decode(encoding or "utf-8", errors)
+
+    async def json(
+        self: Self,
+        encoding: str | None = None,
+        loads: Callable[[str], Any] = json.loads,
+        content_type: str | None = "application/json",
+    ) -> Any:
+        return loads(self._body.decode(encoding or "utf-8"))
+
+    def release(self: Self) -> None:
+        pass
+
+
+class _InMemoryRequest:
+    """Lightweight async context manager for one InMemoryTransport request."""
+
+    __slots__ = ("transport", "req")
+
+    def __init__(self: Self, transport: "InMemoryTransport", req: Dict[str, Any]) -> None:
+        self.transport: InMemoryTransport = transport
+        self.req: Dict[str, Any] = req
+
+    async def __aenter__(self: Self) -> InMemoryResponse:
+        transport: InMemoryTransport = self.transport
+        transport.requests += 1
+        script: ScriptedResponse | Callable[[Dict[str, Any]], ScriptedResponse] = transport.script
+        scripted: ScriptedResponse = script if isinstance(script, ScriptedResponse) else script(self.req)
+        if scripted.latency_s > transport.timeout_s:
+            await asyncio.sleep(transport.timeout_s)
+            raise asyncio.TimeoutError()
+        # Always yield to the event loop, like a real socket read would
+        await asyncio.sleep(scripted.latency_s)
+        return InMemoryResponse(scripted)
+
+    async def __aexit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+
+class InMemoryTransport(Transport):
+    """Transport answering requests from a script instead of the network.
+
+    script is either one ScriptedResponse used for every request or a callable mapping each request dict to
+    a ScriptedResponse (it may keep state to script retries, or raise to simulate connection errors). Without
+    sockets, runs of millions of requests take seconds, which isolates SPARP's own scheduling overhead.
+    """
+
+    def __init__(
+        self: Self,
+        script: ScriptedResponse | Callable[[Dict[str, Any]], ScriptedResponse] = ScriptedResponse(),
+    ) -> None:
+        """Initializes the transport with its response script."""
+        self.script: ScriptedResponse | Callable[[Dict[str, Any]], ScriptedResponse] = script
+        self.timeout_s: float = float("inf")
+        self.requests: int = 0
+
+    async def open(self: Self, timeout_s: float) -> None:
+        self.timeout_s = timeout_s
+
+    def request(self: Self, req: Dict[str, Any]) -> AbstractAsyncContextManager[InMemoryResponse]:
+        return _InMemoryRequest(self, req)
@@ -146,3 +146,15 @@ async def flaky_timeout_server() -> AsyncGenerator[Dict[str, int], None]:
     await site.start()
     yield attempts
     await runner.cleanup()
+
+
+@pytest.fixture
+async def h2_server() -> AsyncGenerator[Any, None]:
+    """Cleartext HTTP/2 stand-in server answering after ~0.01s."""
+    pytest.importorskip("h2")
+    from benchmarks.servers import H2StandInServer
+
+    server = H2StandInServer(port=8790, latency_s=0.01)
+    await server.start()
+    yield server
+    await server.stop()
@@ -0,0 +1,97 @@
+import asyncio
+import datetime
+import pytest
+from typing import Any, Dict, List, Self
+from src.sparp.sparp import SPARP, Callbacks, ResponseState, SparpResult, StopConditions
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+@pytest.mark.asyncio
+class TestSPARPAsyncCallbacks:
+    async def test_async_callbacks_are_bounded_and_awaited(self: Self) -> None:
+        """Verify coroutine callbacks never exceed max_concurrency and all finish before the run returns."""
+        running: List[int] = [0]
+        peak: List[int] = [0]
+        done: List[int] = []
+
+        async def on_success(req: Dict[str, Any], resp: Any) -> None:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            done.append(req["json"]["value"])
+
+        cb: Callbacks = Callbacks(on_success=on_success, max_concurrency=3)
+        sparp: SPARP = SPARP(req_gen(20, 0), inspect_response, callbacks=cb, transport=InMemoryTransport())
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 20
+        assert sorted(done) == list(range(20))
+        assert peak[0] == 3
+
+    async def test_batches_by_size(self: Self) -> None:
+        """Verify batch callbacks receive lists of argument tuples grouped by batch_size."""
+        batches: List[List[tuple[Any, ...]]] = []
+        cb: Callbacks = Callbacks(on_result_batch=batches.append, batch_size=4)
+        sparp: SPARP = SPARP(
+            req_gen(10, 0), inspect_response, callbacks=cb, transport=InMemoryTransport(), concurrency=1
+        )
+        await sparp._main()
+
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        req, state, parsed = batches[0][0]
+        assert req["json"]["value"] == 0
+        assert state == ResponseState.SUCCESS
+        assert parsed["status"] == 200
+
+    async def test_batches_by_time(self: Self) -> None:
+        """Verify incomplete batches are flushed every batch_interval while the run is in progress."""
+        batches: List[int] = []
+
+        async def sink(events: List[tuple[Any, ...]]) -> None:
+            batches.append(len(events))
+
+        cb: Callbacks = Callbacks(
+            on_success_batch=sink, batch_size=1000, batch_interval=datetime.timedelta(seconds=0.02)
+        )
+        sparp: SPARP = SPARP(
+            req_gen(10, 0),
+            inspect_response,
+            callbacks=cb,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=0.01)),
+            concurrency=1,
+        )
+        await sparp._main()
+
+        assert len(batches) > 1
+        assert sum(batches) == 10
+
+    async def test_batches_flushed_on_early_stop(self: Self) -> None:
+        """Verify events collected before a stop condition still reach the batch callback."""
+        batches: List[List[tuple[Any, ...]]] = []
+        cb: Callbacks = Callbacks(on_hard_fail_batch=batches.append)
+        sparp: SPARP = SPARP(
+            req_gen(10, 0),
+            inspect_response,
+            callbacks=cb,
+            stop_conditions=StopConditions(stop_on_hard_fail=True),
+            transport=InMemoryTransport(ScriptedResponse(status=500)),
+            concurrency=1,
+        )
+        await sparp._main()
+
+        assert [len(batch) for batch in batches] == [1]
+
+    async def test_async_callback_error_bubbles_up(self: Self) -> None:
+        """Verify a crash inside a coroutine callback fails the run like a sync one."""
+
+        async def exploding(req: Dict[str, Any], resp: Any) -> None:
+            raise RuntimeError("Async Callback Crash")
+
+        sparp: SPARP = SPARP(
+            req_gen(1, 0), inspect_response, callbacks=Callbacks(on_success=exploding), transport=InMemoryTransport()
+        )
+        with pytest.raises(ExceptionGroup) as eg:
+            await sparp._main()
+        assert eg.group_contains(RuntimeError, match="Async Callback Crash")
@@ -0,0 +1,108 @@
+import time
+import pytest
+from typing import Any, Dict, Self
+from src.sparp.sparp import SPARP, Callbacks, SparpHandle, SparpResult, SparpStats
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+def wait_until(condition: Any, timeout_s: float = 5.0) -> None:
+    deadline: float = time.monotonic() + timeout_s
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.01)
+
+
+class TestSPARPBackgroundRun:
+    def test_start_returns_while_running(self: Self) -> None:
+        """Verify start() returns immediately and result() waits for the whole run."""
+        sparp: SPARP = SPARP(
+            req_gen(50, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=0.02)),
+            concurrency=5,
+        )
+        handle: SparpHandle = sparp.start()
+
+        assert not handle.done()
+        with pytest.raises(TimeoutError):
+            handle.result(timeout_s=0.01)
+        result: SparpResult = handle.result()
+        assert handle.done()
+        assert result.stats.success == 50
+        assert result.stats.stop_reason is None
+
+    def test_live_stats_and_partial_results(self: Self) -> None:
+        """Verify stats and partial results can be polled from the calling thread without consuming results."""
+        sparp: SPARP = SPARP(
+            req_gen(100, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=0.01)),
+            concurrency=2,
+        )
+        handle: SparpHandle = sparp.start()
+
+        wait_until(lambda: handle.stats().success >= 10)
+        stats: SparpStats = handle.stats()
+        partial: SparpResult = handle.partial_results()
+        assert 10 <= stats.success < 100
+        assert len(partial.success) >= stats.success
+        result: SparpResult = handle.result()
+        assert len(result.success) == 100
+        assert handle.stats().success == 100
+
+    def test_cancel_drains_in_flight(self: Self) -> None:
+        """Verify cancel() stops dispatch, lets in-flight requests finish and returns the partial result."""
+        sparp: SPARP = SPARP(
+            req_gen(10_000, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=0.05)),
+            concurrency=4,
+        )
+        handle: SparpHandle = sparp.start()
+        wait_until(lambda: handle.stats().success >= 4)
+
+        before: SparpStats = handle.stats()
+        result: SparpResult = handle.cancel()
+        assert result.stats.stop_reason == "Cancelled."
+        # The requests in flight at cancel time finished, nothing else was dispatched
+        assert before.success <= result.stats.success <= before.success + 2 * 4
+        assert len(result.success) == result.stats.success
+
+    def test_cancel_with_drain_timeout(self: Self) -> None:
+        """Verify requests still running after drain_timeout_s are cancelled."""
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            return ScriptedResponse(latency_s=10 if req["json"]["value"] == 3 else 0.01)
+
+        sparp: SPARP = SPARP(req_gen(1000, 0), inspect_response, transport=InMemoryTransport(script), concurrency=4)
+        handle: SparpHandle = sparp.start()
+        wait_until(lambda: handle.stats().success >= 20)
+
+        started: float = time.monotonic()
+        result: SparpResult = handle.cancel(drain_timeout_s=0.1)
+        assert time.monotonic() - started < 2
+        assert 3 not in [item["input"]["json"]["value"] for item in result.success]
+
+    def test_cancel_after_the_end(self: Self) -> None:
+        """Verify cancel() on a finished run just returns its result, keeping its stop reason."""
+        handle: SparpHandle = SPARP(req_gen(10, 0), inspect_response, transport=InMemoryTransport()).start()
+        result: SparpResult = handle.result()
+
+        assert handle.cancel(drain_timeout_s=1.0) is result
+        assert result.stats.stop_reason is None
+        assert handle.sparp.stop_reason is None
+        assert handle.partial_results().stats.success == 10
+
+    def test_error_is_raised_by_result(self: Self) -> None:
+        """Verify an error ending the background run is re-raised by result()."""
+
+        def exploding(req: Dict[str, Any], resp: Any) -> None:
+            raise RuntimeError("Background Crash")
+
+        handle: SparpHandle = SPARP(
+            req_gen(1, 0), inspect_response, callbacks=Callbacks(on_success=exploding), transport=InMemoryTransport()
+        ).start()
+        with pytest.raises(ExceptionGroup) as eg:
+            handle.result()
+        assert eg.group_contains(RuntimeError, match="Background Crash")
@@ -0,0 +1,99 @@
+import asyncio
+import io
+import json
+import pytest
+from pathlib import Path
+from typing import Any, Dict, List, Self
+from src.sparp.cli import _make_parser, build_arg_parser, main, parse_status_codes, run
+from src.sparp.sparp import ResponseState, StatusClassifier
+from src.sparp.transports import InMemoryResponse, ScriptedResponse
+
+
+class FakeResponse:
+    def __init__(self: Self, status: int) -> None:
+        self.status = status
+
+
+@pytest.mark.asyncio
+class TestSPARPCli:
+    async def test_status_code_specs(self: Self) -> None:
+        """Verify status code lists and ranges drive the classification."""
+        classifier: StatusClassifier = StatusClassifier(
+            success=parse_status_codes("200-204,304"), soft_fail=parse_status_codes("429, 503")
+        )
+        assert classifier(FakeResponse(204)) == ResponseState.SUCCESS  # type: ignore[arg-type]
+        assert classifier(FakeResponse(304)) == ResponseState.SUCCESS  # type: ignore[arg-type]
+        assert classifier(FakeResponse(503)) == ResponseState.SOFT_FAIL  # type: ignore[arg-type]
+        assert classifier(FakeResponse(500)) == ResponseState.HARD_FAIL  # type: ignore[arg-type]
+
+    async def test_file_to_file(self: Self, tmp_path: Path, success_server: Dict[str, List[Any]]) -> None:
+        """Verify a JSONL input file is streamed into a JSONL output file with one record per request."""
+        input_path: Path = tmp_path / "in.jsonl"
+        output_path: Path = tmp_path / "out.jsonl"
+        input_path.write_text(
+            "".join(
+                json.dumps({"method": "POST", "url": "http://localhost:8765/test", "json": {"value": i}}) + "\n"
+                for i in range(5)
+            )
+        )
+
+        code: int = await asyncio.to_thread(
+            main, [str(input_path), "-o", str(output_path), "--concurrency", "2", "--body", "json"]
+        )
+
+        records: List[Dict[str, Any]] = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert code == 0
+        assert len(records) == 5
+        assert {r["state"] for r in records} == {"SUCCESS"}
+        assert sorted(r["json"]["echo"] for r in records) == [0, 1, 2, 3, 4]
+
+    async def test_non_json_body_is_recorded(self: Self) -> None:
+        """Verify a body that is not JSON is recorded as text with the decoding error instead of raising."""
+        parse = _make_parser("json")
+        response: InMemoryResponse = InMemoryResponse(ScriptedResponse(status=500, body=b"<html>Bad gateway</html>"))
+
+        record: Dict[str, Any] = await parse({"url": "http://localhost/"}, response)  # type: ignore[arg-type]
+
+        assert record["status"] == 500
+        assert record["json"] is None
+        assert record["text"] == "<html>Bad gateway</html>"
+        assert record["error"].startswith("JSONDecodeError")
+
+    async def test_stdin_to_stdout_with_custom_classification(
+        self: Self, failing_server: Any, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Verify stdin streaming and that --success-status replaces a Python inspect_response."""
+        stdin: io.BytesIO = io.BytesIO(
+            b'{"method": "POST", "url": "http://localhost:8767/test", "json": {"value": 1}}\n\n'
+        )
+        stdout: io.StringIO = io.StringIO()
+        args = build_arg_parser().parse_args(["--success-status", "500", "--body", "none", "--progress"])
+
+        code: int = await asyncio.to_thread(run, args, stdin, stdout)
+
+        records: List[Dict[str, Any]] = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert code == 0
+        assert records == [
+            {
+                "state": "SUCCESS",
+                "input": {"method": "POST", "url": "http://localhost:8767/test", "json": {"value": 1}},
+                "status": 500,
+            }
+        ]
+        # Progress and final stats go to stderr, keeping stdout parseable
+        captured = capsys.readouterr()
+        assert "PROGRESS:" in captured.err
+        assert json.loads(captured.err.splitlines()[-1])["success"] == 1
+
+    async def test_stop_condition_exit_code(self: Self, failing_server: Any) -> None:
+        """Verify a run ended by a stop condition exits with 1."""
+        stdin: io.BytesIO = io.BytesIO(
+            b'{"method": "POST", "url": "http://localhost:8767/test", "json": {"value": 1}}\n' * 3
+        )
+        stdout: io.StringIO = io.StringIO()
+        args = build_arg_parser().parse_args(["--stop-on-hard-fail", "--concurrency", "1", "--body", "none"])
+
+        code: int = await asyncio.to_thread(run, args, stdin, stdout)
+
+        assert code == 1
+        assert json.loads(stdout.getvalue().splitlines()[0])["state"] == "HARD_FAIL"
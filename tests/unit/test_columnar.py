@@ -0,0 +1,114 @@
+import pytest
+from typing import Any, Dict, Self
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from src.sparp.columnar import ArrowTable, ParquetOutput, with_schema  # noqa: E402
+from src.sparp.sparp import SPARP, SparpResult  # noqa: E402
+from src.sparp.threaded import ThreadedSPARP  # noqa: E402
+from src.sparp.transports import InMemoryTransport, ScriptedResponse  # noqa: E402
+from tests.unit.helpers import req_gen, inspect_response  # noqa: E402
+
+
+@with_schema([("value", pa.int64()), ("status", pa.int32()), ("note", pa.string())])
+async def parse_row(req: Dict[str, Any], response: Any) -> Dict[str, Any]:
+    value: int = req["json"]["value"]
+    return {"value": value, "status": response.status, "note": None if value % 2 else f"even-{value}"}
+
+
+def script(req: Dict[str, Any]) -> ScriptedResponse:
+    return ScriptedResponse(status=500 if req["json"]["value"] % 10 == 0 else 200)
+
+
+@pytest.mark.asyncio
+class TestSPARPColumnar:
+    async def test_builds_arrow_table(self: Self) -> None:
+        """Verify successful rows land in a typed Arrow table split into record batches of batch_size."""
+        sparp: SPARP = SPARP(
+            req_gen(250, 0),
+            inspect_response,
+            parse_response=parse_row,
+            transport=InMemoryTransport(script),
+            retain_results=False,
+            reducers={"table": ArrowTable(parse_row, batch_size=100)},
+        )
+        result: SparpResult = await sparp._main()
+
+        table: Any = result.reduced["table"]
+        assert table.schema == parse_row.arrow_schema
+        assert table.num_rows == 225
+        assert sorted(table.column("value").to_pylist()) == [v for v in range(250) if v % 10]
+        assert table.column("note").null_count == 125
+        assert [len(batch) for batch in table.to_batches()] == [100, 100, 25]
+        assert result.success == []
+
+    async def test_streams_parquet_file(self: Self, tmp_path: Any) -> None:
+        """Verify rows are written as row groups of batch_size and the file is closed at the end of the run."""
+        path: str = str(tmp_path / "rows.parquet")
+        sparp: SPARP = SPARP(
+            req_gen(250, 0),
+            inspect_response,
+            parse_response=parse_row,
+            transport=InMemoryTransport(),
+            retain_results=False,
+            reducers={"rows": ParquetOutput(path, parse_row, batch_size=100, compression="zstd")},
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.reduced["rows"] == path
+        parquet: Any = pq.ParquetFile(path)
+        assert parquet.metadata.num_rows == 250
+        assert parquet.metadata.num_row_groups == 3
+        assert sorted(parquet.read().column("value").to_pylist()) == list(range(250))
+
+    async def test_empty_run_writes_schema(self: Self, tmp_path: Any) -> None:
+        """Verify a run without rows still leaves a readable Parquet file with the schema."""
+        path: str = str(tmp_path / "empty.parquet")
+        sparp: SPARP = SPARP(
+            req_gen(0, 0),
+            inspect_response,
+            transport=InMemoryTransport(),
+            reducers={"rows": ParquetOutput(path, [("value", pa.int64())])},
+        )
+        await sparp._main()
+
+        assert pq.read_table(path).num_rows == 0
+
+    async def test_positional_rows_and_merge(self: Self) -> None:
+        """Verify rows given in schema order are accepted and accumulators merge into one table."""
+        reducer: ArrowTable = ArrowTable([("a", pa.int64()), ("b", pa.string())], batch_size=2)
+        left: Any = reducer.init()
+        right: Any = reducer.init()
+        for i in range(3):
+            left = reducer.accumulate(left, (i, str(i)))
+        right = reducer.accumulate(right, (10, None))
+
+        table: Any = reducer.result(reducer.merge(left, right))
+        assert table.column("a").to_pylist() == [0, 1, 2, 10]
+        assert table.column("b").to_pylist() == ["0", "1", "2", None]
+
+    async def test_validation(self: Self) -> None:
+        """Verify an empty schema and a batch size below one are rejected."""
+        with pytest.raises(ValueError, match="column"):
+            ArrowTable([])
+        with pytest.raises(ValueError, match="batch_size"):
+            ArrowTable([("a", pa.int64())], batch_size=0)
+
+
+class TestSPARPColumnarThreaded:
+    def test_loops_share_one_parquet_file(self: Self, tmp_path: Any) -> None:
+        """Verify the loops of a ThreadedSPARP write into one file that is closed once, after the merge."""
+        path: str = str(tmp_path / "threaded.parquet")
+        result: SparpResult = ThreadedSPARP(
+            req_gen(1000, 0),
+            inspect_response,
+            threads=4,
+            transport_factory=InMemoryTransport,
+            parse_response=parse_row,
+            retain_results=False,
+            reducers={"rows": ParquetOutput(path, parse_row, batch_size=64), "table": ArrowTable(parse_row)},
+        ).main()
+
+        assert sorted(pq.read_table(path).column("value").to_pylist()) == list(range(1000))
+        assert result.reduced["table"].num_rows == 1000
@@ -1,7 +1,9 @@
+import json
 import pytest
 import aiohttp
-from typing import Any, Dict, Self, Awaitable
-from src.sparp.sparp import SPARP, SparpResult
+from typing import Any, Dict, List, Self
+from src.sparp.sparp import SPARP, ResponseState, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
 from tests.unit.helpers import req_gen, inspect_response
 
 
@@ -85,3 +87,66 @@ class TestSPARPParsing:
         # Check the raw text string contains the key and value
         assert '"status": "ok"' in item["t"]
         assert '"echo": 0' in item["t"]
+
+    async def test_classify_and_parse_reads_body_once(self: Self) -> None:
+        """Verify classify_and_parse classifies on the body and its parsed value is stored."""
+        reads: List[int] = []
+
+        async def classify(request_dict: Dict[str, Any], response: Any) -> tuple[ResponseState, Any]:
+            body: Dict[str, Any] = await response.json()
+            reads.append(request_dict["json"]["value"])
+            if body["error"] == "throttled":
+                return ResponseState.SOFT_FAIL, None
+            return ResponseState.SUCCESS if body["error"] is None else ResponseState.HARD_FAIL, body
+
+        attempts: Dict[int, int] = {}
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            value: int = req["json"]["value"]
+            attempts[value] = attempts.get(value, 0) + 1
+            error: str | None = "throttled" if attempts[value] == 1 else ("bad" if value == 3 else None)
+            return ScriptedResponse(body=json.dumps({"error": error, "value": value}).encode())
+
+        sparp: SPARP = SPARP(
+            input_collection=req_gen(5, 0),
+            inspect_response=None,
+            classify_and_parse=classify,
+            transport=InMemoryTransport(script),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert sorted(item["value"] for item in result.success) == [0, 1, 2, 4]
+        assert result.failed == [{"error": "bad", "value": 3}]
+        assert result.stats.soft_retries == 5
+        assert len(reads) == 10
+
+    async def test_soft_fails_are_not_parsed(self: Self) -> None:
+        """Verify parse_response only runs for the responses that reach a final state."""
+        parsed: List[int] = []
+
+        async def parser(request_dict: Dict[str, Any], response: Any) -> int:
+            parsed.append(response.status)
+            return response.status
+
+        attempts: Dict[int, int] = {}
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            value: int = req["json"]["value"]
+            attempts[value] = attempts.get(value, 0) + 1
+            return ScriptedResponse(status=429 if attempts[value] < 3 else 200)
+
+        sparp: SPARP = SPARP(
+            input_collection=req_gen(4, 0),
+            inspect_response=inspect_response,
+            parse_response=parser,
+            transport=InMemoryTransport(script),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.soft_retries == 8
+        assert parsed == [200] * 4
+
+    async def test_needs_a_classifier(self: Self) -> None:
+        """Verify a SPARP without inspect_response or classify_and_parse is rejected."""
+        with pytest.raises(ValueError, match="inspect_response is required"):
+            SPARP(req_gen(1, 0), inspect_response=None)
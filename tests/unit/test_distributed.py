@@ -0,0 +1,133 @@
+import asyncio
+import multiprocessing
+import pytest
+from typing import Any, Dict, List, Self
+from src.sparp.distributed import Coordinator, DistributedResult, Worker
+from src.sparp.sparp import StatusClassifier, StopConditions
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen
+
+
+def run_worker_process(port: int, latency_s: float) -> None:
+    """Target of the worker processes; each one builds its own engine and transport."""
+    Worker(StatusClassifier(), port=port, transport=InMemoryTransport(ScriptedResponse(latency_s=latency_s))).main()
+
+
+async def start(coordinator: Coordinator) -> asyncio.Task[DistributedResult]:
+    task: asyncio.Task[DistributedResult] = asyncio.create_task(coordinator._main())
+    await coordinator.listening.wait()
+    return task
+
+
+@pytest.mark.asyncio
+class TestSPARPDistributed:
+    async def test_workers_share_the_job(self: Self) -> None:
+        """Verify chunks are spread over several workers and every outcome comes back once."""
+        streamed: List[Dict[str, Any]] = []
+        coordinator: Coordinator = Coordinator(req_gen(500, 0), port=0, chunk_size=20, on_record=streamed.append)
+        task: asyncio.Task[DistributedResult] = await start(coordinator)
+        workers: List[Worker] = [
+            Worker(
+                StatusClassifier(),
+                port=coordinator.port,
+                transport=InMemoryTransport(ScriptedResponse(latency_s=0.001)),
+            )
+            for _ in range(3)
+        ]
+        chunks_per_worker: List[int] = await asyncio.gather(*(worker._main() for worker in workers))
+        result: DistributedResult = await task
+
+        assert result.stats.success == 500
+        assert result.chunks == 25
+        assert sum(chunks_per_worker) == 25
+        assert all(chunks > 0 for chunks in chunks_per_worker)
+        assert sorted(record["input"]["json"]["value"] for record in result.records) == list(range(500))
+        assert streamed == result.records
+
+    async def test_local_worker_processes(self: Self) -> None:
+        """Verify worker processes connect over TCP and run the whole job."""
+        coordinator: Coordinator = Coordinator(req_gen(300, 0), port=0, chunk_size=25, retain_results=False)
+        task: asyncio.Task[DistributedResult] = await start(coordinator)
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=run_worker_process, args=(coordinator.port, 0.0)) for _ in range(2)]
+        for process in processes:
+            process.start()
+        result: DistributedResult = await asyncio.wait_for(task, timeout=60)
+        for process in processes:
+            await asyncio.to_thread(process.join, 10)
+
+        assert result.stats.success == 300
+        assert result.records == []
+        assert [process.exitcode for process in processes] == [0, 0]
+
+    async def test_chunks_of_dead_worker_are_leased_again(self: Self) -> None:
+        """Verify the chunk held by a killed worker process is run again by another worker, without duplicates."""
+        coordinator: Coordinator = Coordinator(req_gen(40, 0), port=0, chunk_size=10)
+        task: asyncio.Task[DistributedResult] = await start(coordinator)
+        context = multiprocessing.get_context("spawn")
+        stuck = context.Process(target=run_worker_process, args=(coordinator.port, 60.0))
+        stuck.start()
+        while not coordinator._leases:
+            await asyncio.sleep(0.05)
+        stuck.kill()
+        await asyncio.to_thread(stuck.join, 10)
+
+        await Worker(StatusClassifier(), port=coordinator.port, transport=InMemoryTransport())._main()
+        result: DistributedResult = await asyncio.wait_for(task, timeout=10)
+
+        # The killed worker held the chunk it ran and the one it leased ahead
+        assert result.releases == 2
+        assert result.stats.success == 40
+        assert sorted(record["input"]["json"]["value"] for record in result.records) == list(range(40))
+
+    async def test_silent_worker_lease_expires(self: Self) -> None:
+        """Verify a worker that stops talking loses its chunk and its late results are ignored."""
+        coordinator: Coordinator = Coordinator(req_gen(10, 0), port=0, chunk_size=10, lease_timeout_s=0.2)
+        task: asyncio.Task[DistributedResult] = await start(coordinator)
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", coordinator.port)
+        writer.write(b'{"type": "lease"}\n')
+        await writer.drain()
+        assert b'"chunk"' in await reader.readline()
+        await asyncio.sleep(0.5)
+        writer.write(b'{"type": "result", "lease": 0, "record": {"state": "SUCCESS", "late": true}}\n')
+        await writer.drain()
+
+        await Worker(StatusClassifier(), port=coordinator.port, transport=InMemoryTransport())._main()
+        result: DistributedResult = await asyncio.wait_for(task, timeout=10)
+        writer.close()
+
+        assert result.releases == 1
+        assert len(result.records) == 10
+        assert not any(record.get("late") for record in result.records)
+
+    async def test_worker_waits_for_coordinator(self: Self) -> None:
+        """Verify a worker started before its coordinator keeps trying to connect."""
+        coordinator: Coordinator = Coordinator(req_gen(5, 0), port=8792)
+        worker_task: asyncio.Task[int] = asyncio.create_task(
+            Worker(StatusClassifier(), port=8792, transport=InMemoryTransport())._main()
+        )
+        await asyncio.sleep(0.3)
+        result: DistributedResult = await asyncio.wait_for(coordinator._main(), timeout=10)
+
+        assert await worker_task == 1
+        assert result.stats.success == 5
+
+    async def test_worker_stop_condition_stops_leasing(self: Self) -> None:
+        """Verify a stop condition tripping on a worker ends the job with the chunks done so far."""
+        coordinator: Coordinator = Coordinator(req_gen(100, 0), port=0, chunk_size=10)
+        task: asyncio.Task[DistributedResult] = await start(coordinator)
+        await Worker(
+            StatusClassifier(),
+            port=coordinator.port,
+            transport=InMemoryTransport(
+                lambda req: ScriptedResponse(status=500 if req["json"]["value"] == 25 else 200)
+            ),
+            stop_conditions=StopConditions(stop_on_hard_fail=True),
+            concurrency=1,
+        )._main()
+        result: DistributedResult = await asyncio.wait_for(task, timeout=10)
+
+        assert result.stats.stop_reason == "Stop on hard fail."
+        assert result.chunks == 3
+        assert result.stats.failed == 1
@@ -0,0 +1,151 @@
+import asyncio
+import concurrent.futures
+import pytest
+import threading
+from typing import Any, Dict, List, Self
+from src.sparp.executor import RequestFailed, SPARPExecutor
+from src.sparp.reducers import Count
+from src.sparp.sparp import SparpResult, StopConditions
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import inspect_response
+
+
+def request(value: int) -> Dict[str, Any]:
+    return {"method": "POST", "url": "http://localhost/items", "json": {"value": value}}
+
+
+async def parse_value(req: Dict[str, Any], response: Any) -> int:
+    return req["json"]["value"]
+
+
+class CountingTransport(InMemoryTransport):
+    """InMemoryTransport that counts how often it is opened, to check the session stays warm."""
+
+    def __init__(self: Self, script: Any = None) -> None:
+        super().__init__(script)
+        self.opens: int = 0
+
+    async def open(self: Self, timeout_s: float) -> None:
+        self.opens += 1
+        await super().open(timeout_s)
+
+
+def script(req: Dict[str, Any]) -> ScriptedResponse:
+    value: int = req["json"]["value"]
+    if value < 0:
+        return ScriptedResponse(status=429)
+    return ScriptedResponse(status=500 if value % 10 == 0 else 200, latency_s=0.001)
+
+
+class TestSPARPExecutor:
+    def test_futures_resolve_to_parsed_responses(self: Self) -> None:
+        """Verify submitted requests resolve one by one on a single warm engine, with merged stats."""
+        transport: CountingTransport = CountingTransport(script)
+        with SPARPExecutor(
+            inspect_response, transport=transport, parse_response=parse_value, reducers={"count": Count()}
+        ) as executor:
+            first: concurrent.futures.Future[Any] = executor.submit(request(1))
+            assert first.result(timeout=5) == 1
+            futures: List[concurrent.futures.Future[Any]] = [executor.submit(request(i)) for i in range(1, 100)]
+            values: List[Any] = [f.result(timeout=5) for f in futures if f.exception(timeout=5) is None]
+
+        assert values == [i for i in range(1, 100) if i % 10]
+        failed: BaseException | None = futures[9].exception()
+        assert isinstance(failed, RequestFailed) and failed.kind == "failed" and failed.value == 10
+        assert transport.opens == 1
+        result: SparpResult = executor.result()
+        assert result.stats.success == 91 and result.stats.failed == 9
+        assert result.reduced["count"] == 91
+        assert result.success == []
+
+    def test_retries_exhausted(self: Self) -> None:
+        """Verify a request that keeps being throttled fails its future once retries run out."""
+        with SPARPExecutor(
+            inspect_response, transport=InMemoryTransport(script), max_retries_by_soft_fail=3
+        ) as executor:
+            future: concurrent.futures.Future[Any] = executor.submit(request(-1))
+            with pytest.raises(RequestFailed) as raised:
+                future.result(timeout=5)
+
+        assert raised.value.kind == "max_retries_soft_fail_reached"
+        assert raised.value.value == request(-1)
+        assert executor.stats().soft_retries == 3
+
+    def test_unexpected_error_fails_only_its_request(self: Self) -> None:
+        """Verify an error raised by parse_response goes to its future and the engine keeps running."""
+
+        async def parse(req: Dict[str, Any], response: Any) -> int:
+            if req["json"]["value"] == 3:
+                raise KeyError("boom")
+            return req["json"]["value"]
+
+        with SPARPExecutor(inspect_response, transport=InMemoryTransport(), parse_response=parse) as executor:
+            futures: List[concurrent.futures.Future[Any]] = [executor.submit(request(i)) for i in range(5)]
+            with pytest.raises(KeyError):
+                futures[3].result(timeout=5)
+            assert executor.submit(request(7)).result(timeout=5) == 7
+
+        assert [futures[i].result() for i in (0, 1, 2, 4)] == [0, 1, 2, 4]
+
+    def test_submissions_from_many_threads_are_batched(self: Self) -> None:
+        """Verify concurrent submitters share engine wake-ups and every future resolves."""
+        results: List[int] = []
+        executor: SPARPExecutor = SPARPExecutor(
+            inspect_response, transport=InMemoryTransport(), parse_response=parse_value, batch_linger_s=0.005
+        )
+        drains: List[int] = []
+        drain = executor._drain
+
+        def counting_drain() -> None:
+            drains.append(len(executor._buffer))
+            drain()
+
+        executor._drain = counting_drain  # type: ignore[method-assign]
+
+        def submitter(offset: int) -> None:
+            futures = [executor.submit(request(offset + i)) for i in range(250)]
+            results.extend(f.result(timeout=10) for f in futures)
+
+        threads: List[threading.Thread] = [threading.Thread(target=submitter, args=(t * 1000,)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result: SparpResult | None = executor.shutdown()
+
+        assert sorted(results) == sorted(t * 1000 + i for t in range(4) for i in range(250))
+        assert result is not None and result.stats.success == 1000
+        assert sum(drains) == 1000 and len(drains) < 1000
+
+    def test_stop_condition_fails_pending_futures(self: Self) -> None:
+        """Verify a stop condition ends the engine and fails what was still pending, and submit then refuses."""
+        executor: SPARPExecutor = SPARPExecutor(
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(status=500, latency_s=0.01)),
+            stop_conditions=StopConditions(stop_on_hard_fail=True),
+            concurrency=1,
+        )
+        futures: List[concurrent.futures.Future[Any]] = [executor.submit(request(i)) for i in range(5)]
+        result: SparpResult = executor.result(timeout_s=5)
+
+        assert result.stats.stop_reason == "Stop on hard fail."
+        assert isinstance(futures[0].exception(timeout=5), RequestFailed)
+        assert all("Stop on hard fail." in str(f.exception(timeout=5)) for f in futures[1:])
+        with pytest.raises(RuntimeError, match="shut down"):
+            executor.submit(request(9))
+
+    def test_await_from_async_code(self: Self) -> None:
+        """Verify futures can be awaited from another event loop with asyncio.wrap_future."""
+
+        async def client(executor: SPARPExecutor) -> List[int]:
+            return await asyncio.gather(*(asyncio.wrap_future(executor.submit(request(i))) for i in range(20)))
+
+        with SPARPExecutor(inspect_response, transport=InMemoryTransport(), parse_response=parse_value) as executor:
+            assert asyncio.run(client(executor)) == list(range(20))
+
+    def test_unsupported_options(self: Self) -> None:
+        """Verify options that need a finite input are rejected."""
+        with pytest.raises(ValueError, match="ordered"):
+            SPARPExecutor(inspect_response, ordered=True)
+        with pytest.raises(ValueError, match="batch_linger_s"):
+            SPARPExecutor(inspect_response, batch_linger_s=-1)
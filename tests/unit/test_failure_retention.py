@@ -0,0 +1,125 @@
+import pytest
+from typing import Any, Dict, List, Self
+from src.sparp.retention import KeepFirst, ReservoirSample, Spill
+from src.sparp.sparp import SPARP, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+async def parse_value(req: Dict[str, Any], response: Any) -> int:
+    return req["json"]["value"]
+
+
+def mostly_failing(req: Dict[str, Any]) -> ScriptedResponse:
+    """Fails every request except multiples of ten, with a 500 or a 404 depending on parity."""
+    value: int = req["json"]["value"]
+    if value % 10 == 0:
+        return ScriptedResponse(status=200)
+    return ScriptedResponse(status=500 if value % 2 else 404)
+
+
+@pytest.mark.asyncio
+class TestSPARPFailureRetention:
+    async def test_keep_first(self: Self) -> None:
+        """Verify KeepFirst keeps only the first n failures while stats still count all of them."""
+        sparp: SPARP = SPARP(
+            req_gen(1000, 0),
+            inspect_response,
+            parse_response=parse_value,
+            transport=InMemoryTransport(mostly_failing),
+            concurrency=1,
+            failure_retention=KeepFirst(5),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.failed == [1, 2, 3, 4, 5]
+        assert len(result.success) == 100
+        assert result.stats.failed == 900
+        assert result.stats.status_codes == {200: 100, 500: 500, 404: 400}
+
+    async def test_reservoir_sample(self: Self) -> None:
+        """Verify ReservoirSample keeps n failures drawn from the whole run, not just its start."""
+        sparp: SPARP = SPARP(
+            req_gen(1000, 0),
+            inspect_response,
+            parse_response=parse_value,
+            transport=InMemoryTransport(mostly_failing),
+            failure_retention=ReservoirSample(20, seed=1),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert len(result.failed) == 20
+        assert len(set(result.failed)) == 20
+        assert all(value % 10 for value in result.failed)
+        assert max(result.failed) > 500
+
+    async def test_spill(self: Self) -> None:
+        """Verify Spill keeps the first failures and hands every other one to the sink."""
+        spilled: List[int] = []
+        sparp: SPARP = SPARP(
+            req_gen(100, 0),
+            inspect_response,
+            parse_response=parse_value,
+            transport=InMemoryTransport(mostly_failing),
+            concurrency=1,
+            failure_retention=Spill(spilled.append, keep=2),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.failed == [1, 2]
+        assert spilled == [v for v in range(3, 100) if v % 10]
+
+    async def test_spill_without_retained_results(self: Self) -> None:
+        """Verify Spill still hands failures to the sink when results are not retained."""
+        spilled: List[int] = []
+        sparp: SPARP = SPARP(
+            req_gen(100, 0),
+            inspect_response,
+            parse_response=parse_value,
+            transport=InMemoryTransport(mostly_failing),
+            concurrency=1,
+            retain_results=False,
+            failure_retention=Spill(spilled.append),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.success == []
+        assert result.failed == []
+        assert spilled == [v for v in range(100) if v % 10]
+
+    async def test_max_retries_outcomes_are_bounded(self: Self) -> None:
+        """Verify the policy also applies to max-retries outcomes, which stay counted in stats."""
+        sparp: SPARP = SPARP(
+            req_gen(50, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(status=429)),
+            max_retries_by_soft_fail=2,
+            failure_retention=KeepFirst(3),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert len(result.max_retries_soft_fail_reached) == 3
+        assert result.stats.max_retries_soft_fail_reached == 50
+        assert result.stats.status_codes == {429: 100}
+
+    async def test_exception_counters(self: Self) -> None:
+        """Verify timeouts are counted by exception type."""
+        sparp: SPARP = SPARP(
+            req_gen(4, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=1)),
+            timeout_s=0.001,
+            max_retries_by_timeout=3,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.exceptions == {"TimeoutError": 12}
+        assert result.stats.max_retries_timeout_reached == 4
+        assert result.stats.status_codes == {}
+
+    async def test_policy_validation(self: Self) -> None:
+        """Verify retention sizes are validated."""
+        with pytest.raises(ValueError, match="n should"):
+            KeepFirst(-1)
+        with pytest.raises(ValueError, match="n should"):
+            ReservoirSample(0)
@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+import urllib.parse
+from typing import Any, Dict, Iterator, List, Self
+from src.sparp.scheduling import FairQueue, HostScheduling
+from src.sparp.sparp import SPARP, Callbacks, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import inspect_response
+
+
+def mixed_hosts(slow: int, fast: int) -> Iterator[Dict[str, Any]]:
+    """All requests to the slow host first, then the ones to the fast hosts, like a badly ordered input."""
+    for i in range(slow):
+        yield {"method": "GET", "url": f"http://slow/items/{i}"}
+    for i in range(fast):
+        yield {"method": "GET", "url": f"http://fast-{i % 3}/items/{i}"}
+
+
+def by_host(req: Dict[str, Any]) -> ScriptedResponse:
+    return ScriptedResponse(latency_s=0.05 if urllib.parse.urlsplit(req["url"]).netloc == "slow" else 0.001)
+
+
+@pytest.mark.asyncio
+class TestSPARPHostScheduling:
+    async def test_round_robin_between_hosts(self: Self) -> None:
+        """Verify hosts take turns even when the input lists one host's requests first."""
+        queue: FairQueue = FairQueue(100, HostScheduling(), lambda item: urllib.parse.urlsplit(item).netloc)
+        for i in range(3):
+            await queue.put(f"http://a/{i}")
+        for i in range(3):
+            await queue.put(f"http://b/{i}")
+
+        order: List[str] = [urllib.parse.urlsplit(await queue.get()).netloc for _ in range(6)]
+        assert order == ["a", "b", "a", "b", "a", "b"]
+
+    async def test_weights(self: Self) -> None:
+        """Verify a host with weight 2 dispatches two requests per turn."""
+        queue: FairQueue = FairQueue(100, HostScheduling(weights={"a": 2}), lambda item: item[0])
+        for item in ["a1", "a2", "a3", "a4", "b1", "b2"]:
+            queue.put_nowait(item)
+
+        assert [await queue.get() for _ in range(6)] == ["a1", "a2", "b1", "a3", "a4", "b2"]
+
+    async def test_cap_holds_host_until_release(self: Self) -> None:
+        """Verify a capped host waits for a release while other hosts keep dispatching."""
+        queue: FairQueue = FairQueue(100, HostScheduling(max_in_flight={"a": 1}), lambda item: item[0])
+        for item in ["a1", "a2", "b1", "b2"]:
+            queue.put_nowait(item)
+
+        assert [await queue.get() for _ in range(3)] == ["a1", "b1", "b2"]
+        waiter: asyncio.Task[Any] = asyncio.create_task(queue.get())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        queue.release("a")
+        assert await asyncio.wait_for(waiter, timeout=1) == "a2"
+
+    async def test_capped_backlog_does_not_fill_buffer(self: Self) -> None:
+        """Verify items queued behind a host at its cap leave room for other hosts, up to the per-host bound."""
+        queue: FairQueue = FairQueue(
+            2, HostScheduling(max_in_flight={"a": 1}, max_queued_per_host=3), lambda item: item[0]
+        )
+        await queue.put("a1")
+        assert await queue.get() == "a1"
+        for item in ["a2", "a3", "a4", "b1", "b2"]:
+            await asyncio.wait_for(queue.put(item), timeout=1)
+        assert queue.full()
+
+        blocked: asyncio.Task[Any] = asyncio.create_task(queue.put("a5"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        assert [await queue.get() for _ in range(2)] == ["b1", "b2"]
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        queue.release("a")
+        await asyncio.wait_for(queue.get(), timeout=1)
+        await asyncio.wait_for(blocked, timeout=1)
+
+    async def test_fractional_weight_next_to_capped_host(self: Self) -> None:
+        """Verify a host with a fractional weight is served while the only other host is at its cap."""
+        queue: FairQueue = FairQueue(
+            100, HostScheduling(max_in_flight={"a": 1}, weights={"b": 0.1}), lambda item: item[0]
+        )
+        for item in ["a1", "a2", "b1", "b2"]:
+            queue.put_nowait(item)
+
+        assert await queue.get() == "a1"
+        assert await asyncio.wait_for(queue.get(), timeout=1) == "b1"
+        assert await asyncio.wait_for(queue.get(), timeout=1) == "b2"
+
+    async def test_slow_host_does_not_starve_fast_hosts(self: Self) -> None:
+        """Verify fast hosts finish early instead of waiting behind a slow host listed first."""
+        finished: List[str] = []
+        sparp: SPARP = SPARP(
+            # Twice the default input_buffer_size of requests to the slow host come first
+            mixed_hosts(200, 300),
+            inspect_response,
+            callbacks=Callbacks(on_success=lambda req, response: finished.append(req["url"])),
+            transport=InMemoryTransport(by_host),
+            concurrency=20,
+            host_scheduling=HostScheduling(max_in_flight_per_host=10),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 500
+        last_fast: int = max(i for i, url in enumerate(finished) if "fast" in url)
+        # Had the slow host's backlog filled the buffer, the fast hosts would only start after it drained 90 requests
+        assert sum("slow" in url for url in finished[:last_fast]) < 50
+
+    async def test_cap_is_respected(self: Self) -> None:
+        """Verify no host ever has more requests in flight than its cap."""
+        in_flight: Dict[str, int] = {}
+        peak: Dict[str, int] = {}
+
+        async def parse(req: Dict[str, Any], response: Any) -> None:
+            host: str = urllib.parse.urlsplit(req["url"]).netloc
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            await asyncio.sleep(0.002)
+            in_flight[host] -= 1
+
+        sparp: SPARP = SPARP(
+            mixed_hosts(100, 100),
+            inspect_response,
+            parse_response=parse,
+            transport=InMemoryTransport(),
+            concurrency=30,
+            host_scheduling=HostScheduling(max_in_flight_per_host=4, max_in_flight={"slow": 2}),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 200
+        assert peak["slow"] == 2
+        assert max(peak.values()) == 4
+
+    async def test_validation(self: Self) -> None:
+        """Verify caps and queue bounds below one and non-positive weights are rejected."""
+        with pytest.raises(ValueError, match="caps"):
+            HostScheduling(max_in_flight_per_host=0)
+        with pytest.raises(ValueError, match="weights"):
+            HostScheduling(weights={"a": 0})
+        with pytest.raises(ValueError, match="max_queued_per_host"):
+            HostScheduling(max_queued_per_host=0)
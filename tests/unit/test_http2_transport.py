@@ -0,0 +1,55 @@
+import json
+import pytest
+from typing import Any, Dict, Self
+from src.sparp.sparp import SPARP, SparpResult
+from src.sparp.transports import Http2Transport
+from tests.unit.helpers import req_gen, inspect_response
+
+pytest.importorskip("httpx")
+
+
+@pytest.mark.asyncio
+class TestSPARPHttp2Transport:
+    async def test_requests_are_multiplexed_over_one_connection(self: Self, h2_server: Any) -> None:
+        """Verify concurrent requests share a single HTTP/2 connection and keep the hook contract."""
+
+        async def parser(request_dict: Dict[str, Any], response: Any) -> Dict[str, Any]:
+            return {"status": response.status, "body": await response.json(), "length": response.content_length}
+
+        sparp: SPARP = SPARP(
+            req_gen(30, 8790),
+            inspect_response=inspect_response,
+            parse_response=parser,
+            concurrency=15,
+            transport=Http2Transport(prior_knowledge=True),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 30
+        assert sorted(item["body"]["echo"]["value"] for item in result.success) == list(range(30))
+        assert result.success[0]["length"] == len(json.dumps(result.success[0]["body"]))
+        assert h2_server.connections == 1
+
+    async def test_timeouts_are_retried(self: Self, h2_server: Any) -> None:
+        """Verify httpx timeouts surface as retryable SPARP timeouts."""
+        h2_server.latency_s = 1.0
+        sparp: SPARP = SPARP(
+            req_gen(1, 8790),
+            inspect_response=inspect_response,
+            timeout_s=0.1,
+            max_retries_by_timeout=1,
+            transport=Http2Transport(prior_knowledge=True),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.timeout_retries == 1
+        assert len(result.max_retries_timeout_reached) == 1
+
+    async def test_unsupported_request_kwargs_are_rejected(self: Self, h2_server: Any) -> None:
+        """Verify aiohttp-only kwargs fail loudly instead of being silently dropped."""
+        reqs = [{"method": "GET", "url": "http://localhost:8790/test", "ssl": False}]
+        sparp: SPARP = SPARP(reqs, inspect_response=inspect_response, transport=Http2Transport(prior_knowledge=True))
+
+        with pytest.raises(ExceptionGroup) as eg:
+            await sparp._main()
+        assert eg.group_contains(TypeError, match="ssl")
@@ -0,0 +1,89 @@
+import pytest
+from contextlib import AbstractAsyncContextManager
+from typing import Any, Dict, List, Self
+from src.sparp.sparp import SPARP, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse, Transport
+from tests.unit.helpers import req_gen, inspect_response
+
+
+@pytest.mark.asyncio
+class TestSPARPInMemoryTransport:
+    async def test_scripted_statuses_drive_retries(self: Self) -> None:
+        """Verify a stateful script can throttle each request twice before letting it through."""
+        attempts: Dict[int, int] = {}
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            value: int = req["json"]["value"]
+            attempts[value] = attempts.get(value, 0) + 1
+            if attempts[value] <= 2:
+                return ScriptedResponse(status=429)
+            return ScriptedResponse(status=200, body=b'{"status": "ok"}')
+
+        transport: InMemoryTransport = InMemoryTransport(script)
+        sparp: SPARP = SPARP(req_gen(10, 0), inspect_response=inspect_response, transport=transport)
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 10
+        assert result.stats.soft_retries == 20
+        assert transport.requests == 30
+        assert result.success[0]["text"] == '{"status": "ok"}'
+
+    async def test_latency_above_timeout_is_a_timeout(self: Self) -> None:
+        """Verify scripted latencies longer than timeout_s are retried as timeouts."""
+        transport: InMemoryTransport = InMemoryTransport(ScriptedResponse(latency_s=10))
+        sparp: SPARP = SPARP(
+            req_gen(2, 0),
+            inspect_response=inspect_response,
+            timeout_s=0.01,
+            max_retries_by_timeout=3,
+            transport=transport,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.timeout_retries == 6
+        assert len(result.max_retries_timeout_reached) == 2
+
+    async def test_large_run_without_sockets(self: Self) -> None:
+        """Verify tens of thousands of requests run through the engine in-memory."""
+        transport: InMemoryTransport = InMemoryTransport()
+        sparp: SPARP = SPARP(
+            req_gen(20_000, 0), inspect_response=inspect_response, transport=transport, retain_results=False
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 20_000
+        assert result.success == []
+        assert transport.requests == 20_000
+
+    async def test_custom_transport_plugs_in(self: Self) -> None:
+        """Verify any Transport subclass can replace the HTTP client."""
+        seen: List[str] = []
+
+        class RecordingTransport(Transport):
+            def __init__(self: Self) -> None:
+                self.inner: InMemoryTransport = InMemoryTransport(ScriptedResponse(status=500))
+
+            async def open(self: Self, timeout_s: float) -> None:
+                seen.append("open")
+
+            async def close(self: Self) -> None:
+                seen.append("close")
+
+            def request(self: Self, req: Dict[str, Any]) -> AbstractAsyncContextManager[Any]:
+                seen.append(req["url"])
+                return self.inner.request(req)
+
+        sparp: SPARP = SPARP(req_gen(1, 1234), inspect_response=inspect_response, transport=RecordingTransport())
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.failed == 1
+        assert seen == ["open", "http://localhost:1234/test", "close"]
+
+    async def test_transport_without_request_cannot_be_created(self: Self) -> None:
+        """Verify a Transport subclass missing request() fails when created, not in the middle of a run."""
+
+        class IncompleteTransport(Transport):
+            pass
+
+        with pytest.raises(TypeError):
+            IncompleteTransport()  # type: ignore[abstract]
@@ -0,0 +1,79 @@
+import itertools
+import pytest
+from typing import List, Self
+from src.sparp.load import ConstantRate, LatencyHistogram, LoadReport, PoissonRate, RampRate
+from src.sparp.sparp import SPARP, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+@pytest.mark.asyncio
+class TestSPARPLoadProfiles:
+    async def test_profiles_schedule(self: Self) -> None:
+        """Verify constant, Poisson and ramp profiles produce the intended start offsets."""
+        assert list(ConstantRate(10, duration_s=0.5).offsets()) == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+
+        poisson: List[float] = list(itertools.islice(PoissonRate(100, seed=1).offsets(), 10_000))
+        assert poisson == sorted(poisson)
+        assert poisson[-1] / len(poisson) == pytest.approx(0.01, rel=0.05)
+
+        ramp: RampRate = RampRate(0, 100, ramp_s=2, duration_s=4)
+        offsets: List[float] = list(ramp.offsets())
+        assert offsets == sorted(offsets)
+        assert len([o for o in offsets if o < 2]) == pytest.approx(ramp.expected(2), abs=1)
+        assert len(offsets) == pytest.approx(ramp.expected(4), abs=1)
+        # The rate grows during the ramp
+        assert offsets[10] - offsets[9] > offsets[90] - offsets[89]
+
+    async def test_histogram_percentiles(self: Self) -> None:
+        """Verify percentiles are within the bucket precision of the exact values."""
+        histogram: LatencyHistogram = LatencyHistogram()
+        for i in range(1, 10_001):
+            histogram.record(i / 1000)
+        assert histogram.percentile(0.5) == pytest.approx(5.0, rel=0.02)
+        assert histogram.percentile(0.99) == pytest.approx(9.9, rel=0.02)
+        assert histogram.percentile(1.0) == 10.0
+        assert histogram.count == 10_000
+
+    async def test_rate_is_reached(self: Self) -> None:
+        """Verify a fast target reaches the requested rate and reports low latencies."""
+        sparp: SPARP = SPARP(
+            req_gen(10_000, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=0.001)),
+            load_profile=ConstantRate(200, duration_s=0.5),
+        )
+        result: SparpResult = await sparp._main()
+
+        load: LoadReport | None = result.stats.load
+        assert load is not None
+        assert load.dispatched == result.stats.success == 100
+        assert load.completed == 100
+        assert load.achieved_rate_per_s == pytest.approx(200, rel=0.2)
+        assert load.target_rate_per_s == pytest.approx(200, rel=0.01)
+        assert load.latency_p50_s < 0.05
+        assert "achieved" in load.summary()
+
+    async def test_latency_counts_from_intended_start(self: Self) -> None:
+        """Verify requests queued behind a saturated worker report the time since their intended start."""
+        sparp: SPARP = SPARP(
+            req_gen(20, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=0.02)),
+            concurrency=1,
+            load_profile=ConstantRate(500),
+        )
+        result: SparpResult = await sparp._main()
+
+        load: LoadReport | None = result.stats.load
+        assert load is not None
+        # A closed-loop measurement would say 20ms for every request; the 20th one was due 40ms in but
+        # only finished after all the others, about 400ms in
+        assert load.latency_max_s > 0.3
+        assert load.latency_p50_s > 0.1
+        assert load.max_dispatch_lag_s < 0.1
+
+    async def test_closed_loop_by_default(self: Self) -> None:
+        """Verify no load report is produced without a load_profile."""
+        result: SparpResult = await SPARP(req_gen(5, 0), inspect_response, transport=InMemoryTransport())._main()
+        assert result.stats.load is None
@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Self
+from src.sparp.sparp import SPARP, MemoryBudget, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+class ChunkedTransport(InMemoryTransport):
+    """InMemoryTransport whose responses have no Content-Length, like chunked ones."""
+
+    def request(self: Self, req: Dict[str, Any]) -> AbstractAsyncContextManager[Any]:
+        return self._chunked(req)
+
+    @asynccontextmanager
+    async def _chunked(self: Self, req: Dict[str, Any]) -> AsyncIterator[Any]:
+        async with super().request(req) as response:
+            response.content_length = None
+            yield response
+
+
+@pytest.mark.asyncio
+class TestSPARPMemoryBudget:
+    async def test_reserve_waits_until_memory_is_released(self: Self) -> None:
+        """Verify a reservation that does not fit pauses until another request frees its bytes."""
+        budget: MemoryBudget = MemoryBudget(max_bytes=100)
+        await budget.reserve(80)
+
+        waiter: asyncio.Task[None] = asyncio.create_task(budget.reserve(50))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        assert budget.waits == 1
+
+        budget.release(80, finished=True)
+        await asyncio.wait_for(waiter, timeout=1)
+        assert budget.in_use == 50
+        assert budget.peak == 80
+
+    async def test_oversized_request_passes_when_nothing_in_flight(self: Self) -> None:
+        """Verify a single item larger than the whole budget does not deadlock the run."""
+        budget: MemoryBudget = MemoryBudget(max_bytes=10)
+        await asyncio.wait_for(budget.reserve(1000), timeout=1)
+        assert budget.in_flight == 1
+
+    async def test_run_under_tight_budget_completes(self: Self, success_server: Dict[str, List[Any]]) -> None:
+        """Verify a budget smaller than the combined payloads throttles dispatch but loses no requests."""
+        sparp: SPARP = SPARP(
+            req_gen(10, 8765), inspect_response=inspect_response, concurrency=5, memory_budget_bytes=64
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 10
+        assert result.stats.memory_budget_waits > 0
+        assert result.stats.memory_peak_bytes > 0
+        # Drained results give their bytes back to the budget
+        assert result.stats.memory_in_use_bytes == 0
+
+    async def test_progress_bar_shows_memory(
+        self: Self, success_server: Dict[str, List[Any]], capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Verify the progress output reports budget usage when a budget is set."""
+        sparp: SPARP = SPARP(
+            req_gen(2, 8765), inspect_response=inspect_response, show_progress_bar=True, memory_budget_bytes=10**6
+        )
+        await sparp._main()
+
+        captured: str = capsys.readouterr().out
+        assert "MEMORY: " in captured
+        assert "/1.0MB" in captured
+
+    async def test_response_bodies_charged_by_content_length(self: Self) -> None:
+        """Verify response bodies are charged their Content-Length while parsed, and nothing without one."""
+        charged: Dict[str, int] = {}
+
+        for name, transport in [
+            ("sized", InMemoryTransport(ScriptedResponse(body=b"x" * 10_000))),
+            ("chunked", ChunkedTransport(ScriptedResponse(body=b"x" * 10_000))),
+        ]:
+
+            async def parse(req: Dict[str, Any], response: Any) -> int:
+                assert sparp.memory_budget is not None
+                charged[name] = sparp.memory_budget.in_use
+                return len(await response.read())
+
+            sparp: SPARP = SPARP(
+                req_gen(1, 0),
+                inspect_response=inspect_response,
+                parse_response=parse,
+                transport=transport,
+                memory_budget_bytes=10**6,
+            )
+            result: SparpResult = await sparp._main()
+            assert result.success == [10_000]
+
+        assert charged["sized"] >= 10_000
+        # The body of a chunked response is not bounded by the budget
+        assert charged["chunked"] < 10_000
+
+    async def test_invalid_budget_raises(self: Self) -> None:
+        """Verify a non-positive budget is rejected up front."""
+        with pytest.raises(ValueError):
+            MemoryBudget(max_bytes=0)
@@ -0,0 +1,47 @@
+import pytest
+import tracemalloc
+from typing import Any, Dict, Self
+from src.sparp.sparp import SPARP, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+async def status_only(req: Dict[str, Any], response: Any) -> int:
+    return response.status
+
+
+async def traced_run(count: int, **kwargs: Any) -> tuple[int, int]:
+    """Runs count requests under tracemalloc; returns the peak and the bytes still held with the result alive."""
+    tracemalloc.start()
+    try:
+        base: int = tracemalloc.get_traced_memory()[0]
+        sparp: SPARP = SPARP(
+            req_gen(count, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(body=b'{"status": "ok"}')),
+            **kwargs,
+        )
+        result: SparpResult = await sparp._main()
+        current, peak = tracemalloc.get_traced_memory()
+        assert result.stats.success == count
+        return peak - base, current - base
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.asyncio
+class TestSPARPMemoryFootprint:
+    async def test_streaming_run_keeps_constant_memory(self: Self) -> None:
+        """Verify the peak of a run without retained results does not grow with the number of requests."""
+        small_peak, _ = await traced_run(2_000, retain_results=False, parse_response=status_only)
+        large_peak, _ = await traced_run(10_000, retain_results=False, parse_response=status_only)
+
+        assert large_peak < small_peak + 256 * 1024
+        assert large_peak < 4 * 1024 * 1024
+
+    async def test_bytes_per_stored_result(self: Self) -> None:
+        """Verify a result stored by the default parser costs a bounded number of bytes."""
+        _, streamed = await traced_run(5_000, retain_results=False)
+        _, retained = await traced_run(5_000)
+
+        assert (retained - streamed) / 5_000 < 3_000
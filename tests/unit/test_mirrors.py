@@ -0,0 +1,98 @@
+import pytest
+import urllib.parse
+from typing import Any, Dict, List, Self
+from src.sparp.mirrors import MirrorPool
+from src.sparp.sparp import SPARP, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+def by_host(responses: Dict[str, ScriptedResponse]) -> Any:
+    """Answers each request with the scripted response of the host it was sent to."""
+    hosts: Dict[str, int] = {}
+
+    def script(req: Dict[str, Any]) -> ScriptedResponse:
+        host: str = urllib.parse.urlsplit(req["url"]).netloc
+        hosts[host] = hosts.get(host, 0) + 1
+        return responses[host]
+
+    script.hosts = hosts  # type: ignore[attr-defined]
+    return script
+
+
+@pytest.mark.asyncio
+class TestSPARPMirrors:
+    async def test_rewrites_host_and_keeps_path(self: Self) -> None:
+        """Verify every attempt goes to a pool origin with the original path and query."""
+        urls: List[str] = []
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            urls.append(req["url"])
+            return ScriptedResponse()
+
+        sparp: SPARP = SPARP(
+            [{"method": "GET", "url": "http://primary/items/7?full=1"}] * 4,
+            inspect_response,
+            transport=InMemoryTransport(script),
+            concurrency=1,
+            mirrors=MirrorPool(["http://eu:8080", "https://us"]),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert sorted(urls) == ["http://eu:8080/items/7?full=1"] * 2 + ["https://us/items/7?full=1"] * 2
+        assert result.success[0]["input"]["url"] == "http://primary/items/7?full=1"
+        assert [mirror.requests for mirror in result.stats.mirrors or []] == [2, 2]
+
+    async def test_least_outstanding_follows_fast_mirror(self: Self) -> None:
+        """Verify the mirror answering faster gets more of the traffic."""
+        script: Any = by_host({"slow": ScriptedResponse(latency_s=0.02), "fast": ScriptedResponse(latency_s=0.001)})
+        sparp: SPARP = SPARP(
+            req_gen(300, 0),
+            inspect_response,
+            transport=InMemoryTransport(script),
+            concurrency=4,
+            mirrors=MirrorPool(["http://slow", "http://fast"]),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert len(result.success) == 300
+        assert script.hosts["fast"] > 3 * script.hosts["slow"]
+
+    async def test_ewma_prefers_low_latency(self: Self) -> None:
+        """Verify the ewma strategy sends most attempts to the origin with the lowest latency."""
+        script: Any = by_host({"slow": ScriptedResponse(latency_s=0.01), "fast": ScriptedResponse(latency_s=0.001)})
+        sparp: SPARP = SPARP(
+            req_gen(200, 0),
+            inspect_response,
+            transport=InMemoryTransport(script),
+            concurrency=1,
+            mirrors=MirrorPool(["http://slow", "http://fast"], strategy="ewma"),
+        )
+        await sparp._main()
+
+        assert script.hosts["fast"] > 5 * script.hosts["slow"]
+
+    async def test_unhealthy_mirror_leaves_rotation(self: Self) -> None:
+        """Verify a mirror that keeps soft-failing is taken out and its requests retried elsewhere."""
+        script: Any = by_host({"down": ScriptedResponse(status=429), "up": ScriptedResponse()})
+        sparp: SPARP = SPARP(
+            req_gen(200, 0),
+            inspect_response,
+            transport=InMemoryTransport(script),
+            concurrency=1,
+            mirrors=MirrorPool(["http://down", "http://up"], min_attempts=3, cooldown_s=60),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert len(result.success) == 200
+        assert script.hosts["down"] == 3
+        assert [mirror.healthy for mirror in result.stats.mirrors or []] == [False, True]
+
+    async def test_validation(self: Self) -> None:
+        """Verify pools without origins or with malformed origins are rejected."""
+        with pytest.raises(ValueError, match="at least one origin"):
+            MirrorPool([])
+        with pytest.raises(ValueError, match="scheme://host"):
+            MirrorPool(["eu.example.com"])
+        with pytest.raises(ValueError, match="strategy"):
+            MirrorPool(["http://a"], strategy="random")  # type: ignore[arg-type]
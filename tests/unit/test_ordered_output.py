@@ -0,0 +1,117 @@
+import pytest
+from typing import Any, Dict, List, Self
+from src.sparp.sparp import SPARP, Callbacks, IndexedResult, ResponseState, SparpResult, StopConditions
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+def uneven_latencies(req: Dict[str, Any]) -> ScriptedResponse:
+    """Makes every fifth request much slower than the rest so completions arrive out of order."""
+    value: int = req["json"]["value"]
+    return ScriptedResponse(status=500 if value % 7 == 0 else 200, latency_s=0.02 if value % 5 == 0 else 0.001)
+
+
+@pytest.mark.asyncio
+class TestSPARPOrderedOutput:
+    async def test_results_follow_input_order(self: Self) -> None:
+        """Verify ordered=True tags results with their input index and emits them in input order."""
+        emitted: List[int] = []
+        cb: Callbacks = Callbacks(on_result=lambda req, state, parsed: emitted.append(parsed.index))
+        sparp: SPARP = SPARP(
+            req_gen(50, 0),
+            inspect_response,
+            callbacks=cb,
+            transport=InMemoryTransport(uneven_latencies),
+            concurrency=10,
+            ordered=True,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert emitted == list(range(50))
+        assert all(isinstance(item, IndexedResult) for item in result.success)
+        assert [item.index for item in result.success] == [i for i in range(50) if i % 7 != 0]
+        assert [item.index for item in result.failed] == [i for i in range(50) if i % 7 == 0]
+
+    async def test_unordered_by_default(self: Self) -> None:
+        """Verify results keep arriving in completion order, untagged, unless ordered=True."""
+        emitted: List[int] = []
+        cb: Callbacks = Callbacks(on_result=lambda req, state, parsed: emitted.append(req["json"]["value"]))
+        sparp: SPARP = SPARP(
+            req_gen(20, 0),
+            inspect_response,
+            callbacks=cb,
+            transport=InMemoryTransport(uneven_latencies),
+            concurrency=10,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert sorted(emitted) == list(range(20))
+        assert emitted != list(range(20))
+        assert not isinstance(result.success[0], IndexedResult)
+
+    async def test_window_bounds_the_reorder_buffer(self: Self) -> None:
+        """Verify a slow first request holds dispatch at reorder_window items instead of buffering everything."""
+        peak_buffer: List[int] = [0]
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            peak_buffer[0] = max(peak_buffer[0], len(sparp._reorder_buffer))
+            return ScriptedResponse(latency_s=0.05 if req["json"]["value"] == 0 else 0)
+
+        sparp: SPARP = SPARP(
+            req_gen(100, 0),
+            inspect_response,
+            transport=InMemoryTransport(script),
+            concurrency=20,
+            ordered=True,
+            reorder_window=5,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert [item.index for item in result.success] == list(range(100))
+        assert peak_buffer[0] < 5
+
+    async def test_max_retries_outcomes_are_indexed(self: Self) -> None:
+        """Verify requests giving up after retries take their place in the order too."""
+        sparp: SPARP = SPARP(
+            req_gen(6, 0),
+            inspect_response,
+            transport=InMemoryTransport(lambda req: ScriptedResponse(status=429 if req["json"]["value"] % 2 else 200)),
+            max_retries_by_soft_fail=2,
+            ordered=True,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert [item.index for item in result.success] == [0, 2, 4]
+        exhausted: List[IndexedResult] = result.max_retries_soft_fail_reached
+        assert [item.index for item in exhausted] == [1, 3, 5]
+        assert exhausted[0].value["json"]["value"] == 1
+
+    async def test_early_stop_flushes_buffer(self: Self) -> None:
+        """Verify outcomes stuck behind an unfinished request are still stored when a stop condition fires."""
+        states: List[ResponseState] = []
+        sparp: SPARP = SPARP(
+            req_gen(10, 0),
+            inspect_response,
+            callbacks=Callbacks(on_result=lambda req, state, parsed: states.append(state)),
+            stop_conditions=StopConditions(stop_on_hard_fail=True),
+            transport=InMemoryTransport(
+                lambda req: ScriptedResponse(
+                    status=500 if req["json"]["value"] == 3 else 200,
+                    latency_s=0.05 if req["json"]["value"] == 0 else 0.001,
+                )
+            ),
+            concurrency=5,
+            ordered=True,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert [item.index for item in result.failed] == [3]
+        success_indexes: List[int] = [item.index for item in result.success]
+        assert success_indexes[:2] == [1, 2]
+        assert success_indexes == sorted(success_indexes)
+        assert states.count(ResponseState.HARD_FAIL) == 1
+
+    async def test_reorder_window_validation(self: Self) -> None:
+        """Verify a reorder window smaller than one is rejected."""
+        with pytest.raises(ValueError, match="reorder_window"):
+            SPARP(req_gen(1, 0), inspect_response, ordered=True, reorder_window=0)
@@ -0,0 +1,174 @@
+import asyncio
+import pytest
+from typing import Any, Dict, List, Self
+from src.sparp.pipeline import Pipeline
+from src.sparp.sparp import SPARP, Callbacks, SparpResult, StopConditions, emit
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import inspect_response
+
+
+def page(number: int) -> Dict[str, Any]:
+    return {"method": "GET", "url": f"http://api/pages/{number}"}
+
+
+def item(number: int) -> Dict[str, Any]:
+    return {"method": "GET", "url": f"http://api/items/{number}"}
+
+
+async def parse_page(req: Dict[str, Any], response: Any) -> int:
+    """Every page lists three items and links to the next page, up to page 4."""
+    number: int = int(req["url"].rsplit("/", 1)[1])
+    for i in range(3):
+        emit(item(number * 3 + i), stage="items")
+    if number < 4:
+        emit(page(number + 1))
+    return number
+
+
+async def parse_item(req: Dict[str, Any], response: Any) -> str:
+    return req["url"]
+
+
+@pytest.mark.asyncio
+class TestSPARPPipeline:
+    async def test_pagination_and_fan_out(self: Self) -> None:
+        """Verify pages emit their next page into their own stage and their items into a downstream stage."""
+        pages: SPARP = SPARP([page(0)], inspect_response, parse_response=parse_page, transport=InMemoryTransport())
+        items: SPARP = SPARP(
+            [], inspect_response, parse_response=parse_item, transport=InMemoryTransport(), concurrency=4
+        )
+        results: Dict[str, SparpResult] = await Pipeline({"pages": pages, "items": items})._main()
+
+        assert sorted(results["pages"].success) == [0, 1, 2, 3, 4]
+        assert sorted(results["items"].success) == sorted(f"http://api/items/{i}" for i in range(15))
+
+    async def test_stages_have_separate_concurrency(self: Self) -> None:
+        """Verify each stage runs at most its own concurrency of requests at a time."""
+        running: Dict[str, int] = {"pages": 0, "items": 0}
+        peak: Dict[str, int] = {"pages": 0, "items": 0}
+
+        def tracking(stage: str) -> Any:
+            async def parse(req: Dict[str, Any], response: Any) -> None:
+                running[stage] += 1
+                peak[stage] = max(peak[stage], running[stage])
+                await asyncio.sleep(0.005)
+                running[stage] -= 1
+                if stage == "pages":
+                    for i in range(10):
+                        emit(item(i), stage="items")
+
+            return parse
+
+        pages: SPARP = SPARP(
+            [page(i) for i in range(5)],
+            inspect_response,
+            parse_response=tracking("pages"),
+            transport=InMemoryTransport(),
+            concurrency=1,
+        )
+        items: SPARP = SPARP(
+            [], inspect_response, parse_response=tracking("items"), transport=InMemoryTransport(), concurrency=3
+        )
+        results: Dict[str, SparpResult] = await Pipeline({"pages": pages, "items": items})._main()
+
+        assert results["items"].stats.success == 50
+        assert peak == {"pages": 1, "items": 3}
+
+    async def test_followups_only_from_successful_responses(self: Self) -> None:
+        """Verify a response that is retried or fails emits nothing."""
+        attempts: List[int] = [0]
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            attempts[0] += 1
+            return ScriptedResponse(status=429 if attempts[0] <= 2 else 500 if "items/" in req["url"] else 200)
+
+        async def parse(req: Dict[str, Any], response: Any) -> int:
+            emit(item(response.status))
+            return response.status
+
+        sparp: SPARP = SPARP([page(0)], inspect_response, parse_response=parse, transport=InMemoryTransport(script))
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.soft_retries == 2
+        assert result.success == [200]
+        assert result.failed == [500]
+
+    async def test_stop_in_one_stage_stops_all(self: Self) -> None:
+        """Verify a stop condition in a downstream stage ends the whole pipeline with partial results."""
+
+        async def parse_pages(req: Dict[str, Any], response: Any) -> None:
+            for i in range(100):
+                emit(item(i), stage="items")
+
+        pages: SPARP = SPARP(
+            [page(i) for i in range(100)],
+            inspect_response,
+            parse_response=parse_pages,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=0.005)),
+            concurrency=2,
+        )
+        items: SPARP = SPARP(
+            [],
+            inspect_response,
+            stop_conditions=StopConditions(stop_on_hard_fail=True),
+            transport=InMemoryTransport(
+                lambda req: ScriptedResponse(status=500 if req["url"].endswith("/50") else 200, latency_s=0.001)
+            ),
+            concurrency=5,
+        )
+        results: Dict[str, SparpResult] = await asyncio.wait_for(
+            Pipeline({"pages": pages, "items": items})._main(), timeout=10
+        )
+
+        assert results["items"].stats.failed == 1
+        assert results["items"].stats.success < 100 * 100
+        assert results["pages"].stats.success < 100
+
+    async def test_emit_outside_parse_response_and_unknown_stage(self: Self) -> None:
+        """Verify emit() is rejected outside parse_response and for stages that do not exist."""
+        with pytest.raises(RuntimeError, match="parse_response"):
+            emit(page(0))
+
+        async def parse(req: Dict[str, Any], response: Any) -> None:
+            emit(item(0), stage="missing")
+
+        sparp: SPARP = SPARP([page(0)], inspect_response, parse_response=parse, transport=InMemoryTransport())
+        with pytest.raises(ExceptionGroup) as eg:
+            await sparp._main()
+        assert eg.group_contains(ValueError, match="missing")
+
+    async def test_callbacks_cannot_emit(self: Self) -> None:
+        """Verify async callbacks, which run as tasks started by the workers, cannot emit follow-ups."""
+        rejected: List[str] = []
+
+        async def on_success(req: Dict[str, Any], response: Any) -> None:
+            try:
+                emit(page(1))
+            except RuntimeError:
+                rejected.append(req["url"])
+
+        sparp: SPARP = SPARP(
+            [page(0), page(2)],
+            inspect_response,
+            callbacks=Callbacks(on_success=on_success),
+            concurrency=1,
+            transport=InMemoryTransport(),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 2
+        assert sorted(rejected) == [page(0)["url"], page(2)["url"]]
+
+    async def test_self_emitting_chain(self: Self) -> None:
+        """Verify a single SPARP emitting into itself walks a whole chain of pages without a Pipeline."""
+
+        async def parse(req: Dict[str, Any], response: Any) -> int:
+            number: int = int(req["url"].rsplit("/", 1)[1])
+            if number < 49:
+                emit(page(number + 1))
+            return number
+
+        sparp: SPARP = SPARP([page(0)], inspect_response, parse_response=parse, transport=InMemoryTransport())
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 50
@@ -1,7 +1,7 @@
 import pytest
 import datetime
 from typing import Any, Dict, List, Self
-from src.sparp.sparp import SPARP, StopConditions, SparpResult
+from src.sparp.sparp import SPARP, StopConditions, SparpResult, SparpStats
 from tests.unit.helpers import req_gen, inspect_response
 
 
@@ -103,3 +103,27 @@ class TestSPARPProgressAndStats:
         await sparp._main()
         captured: str = capsys.readouterr().out
         assert captured == ""
+
+    async def test_merge_stats(self: Self) -> None:
+        """Verify merged stats sum the counters and keep the first stop reason and the highest budget use."""
+        merged: SparpStats = SparpStats.merge(
+            [
+                SparpStats(success=3, failed=1, soft_retries=2, timeout_retries=0, status_codes={200: 3, 500: 1}),
+                SparpStats(
+                    success=2,
+                    failed=0,
+                    soft_retries=1,
+                    timeout_retries=1,
+                    status_codes={200: 2},
+                    exceptions={"TimeoutError": 1},
+                    retry_budget_use=0.5,
+                    stop_reason="Stop on hard fail.",
+                ),
+            ]
+        )
+
+        assert (merged.success, merged.failed, merged.soft_retries, merged.timeout_retries) == (5, 1, 3, 1)
+        assert merged.status_codes == {200: 5, 500: 1}
+        assert merged.exceptions == {"TimeoutError": 1}
+        assert merged.retry_budget_use == 0.5
+        assert merged.stop_reason == "Stop on hard fail."
@@ -0,0 +1,87 @@
+import json
+import pytest
+from pathlib import Path
+from typing import Any, Dict, List, Self
+from src.sparp.readers import CsvReader, JsonlReader
+from src.sparp.sparp import SPARP, SparpResult
+from tests.unit.helpers import inspect_response
+
+
+def write_jsonl(path: Path, count: int, port: int = 8765) -> None:
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"method": "POST", "url": f"http://localhost:{port}/test", "json": {"value": i}}) + "\n")
+
+
+@pytest.mark.asyncio
+class TestSPARPReaders:
+    async def test_jsonl_reader_small_chunks_and_offsets(self: Self, tmp_path: Path) -> None:
+        """Verify lines split across tiny chunks are reassembled and offsets allow resuming."""
+        path: Path = tmp_path / "requests.jsonl"
+        write_jsonl(path, 20)
+
+        reader: JsonlReader = JsonlReader(path, chunk_size=16)
+        values: List[int] = []
+        resume_offset: int = 0
+        for item in reader:
+            values.append(item["json"]["value"])
+            if len(values) == 12:
+                resume_offset = reader.offset
+        assert values == list(range(20))
+        assert reader.offset == path.stat().st_size
+
+        resumed: JsonlReader = JsonlReader(path, start_offset=resume_offset)
+        assert [item["json"]["value"] for item in resumed] == list(range(12, 20))
+        assert resumed.count_lines() == 8
+
+    async def test_line_index_and_start_line(self: Self, tmp_path: Path) -> None:
+        """Verify the line-count index gives the size and lets a job start partway through the file."""
+        path: Path = tmp_path / "requests.jsonl"
+        write_jsonl(path, 100)
+
+        reader: JsonlReader = JsonlReader(path, start_line=95, chunk_size=256)
+        assert reader.build_index().line_count == 100
+        assert reader.count_lines() == 5
+        assert [item["json"]["value"] for item in reader] == [95, 96, 97, 98, 99]
+
+    async def test_csv_reader_skips_header_and_converts_rows(self: Self, tmp_path: Path) -> None:
+        """Verify CSV rows are mapped through to_request and start_line counts data rows only."""
+        path: Path = tmp_path / "ids.csv"
+        path.write_text("id,name\n" + "".join(f"{i},item{i}\n" for i in range(10)))
+
+        reader: CsvReader = CsvReader(
+            path, to_request=lambda row: {"method": "GET", "url": f"http://x/{row['id']}"}, start_line=7
+        )
+        assert reader.count_lines() == 3
+        assert [r["url"] for r in reader] == ["http://x/7", "http://x/8", "http://x/9"]
+
+    async def test_from_jsonl_run(self: Self, tmp_path: Path, success_server: Dict[str, List[Any]]) -> None:
+        """Verify SPARP.from_jsonl streams the file and estimates its size from the line index."""
+        path: Path = tmp_path / "requests.jsonl"
+        write_jsonl(path, 10)
+
+        sparp: SPARP = SPARP.from_jsonl(path, inspect_response, start_line=4, concurrency=2)
+        assert sparp.estimated_input_collection_size == 6
+
+        result: SparpResult = await sparp._main()
+        assert result.stats.success == 6
+        assert sorted(success_server["processed"]) == [4, 5, 6, 7, 8, 9]
+
+    async def test_from_csv_run(self: Self, tmp_path: Path, success_server: Dict[str, List[Any]]) -> None:
+        """Verify SPARP.from_csv turns each row into a request."""
+        path: Path = tmp_path / "values.csv"
+        path.write_text("value\n1\n2\n3\n")
+
+        sparp: SPARP = SPARP.from_csv(
+            path,
+            inspect_response,
+            to_request=lambda row: {
+                "method": "POST",
+                "url": "http://localhost:8765/test",
+                "json": {"value": int(row["value"])},
+            },
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 3
+        assert sorted(success_server["processed"]) == [1, 2, 3]
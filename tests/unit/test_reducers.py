@@ -0,0 +1,106 @@
+import pytest
+from typing import Any, Dict, List, Self
+from src.sparp.reducers import Count, Histogram, Reducer, Sum, TopK, Unique, merge_accumulators
+from src.sparp.sparp import SPARP, ResponseState, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+async def parse_value(req: Dict[str, Any], response: Any) -> Dict[str, Any]:
+    return {"value": req["json"]["value"], "status": response.status}
+
+
+def fold(reducer: Reducer, items: List[Any]) -> Any:
+    acc: Any = reducer.init()
+    for item in items:
+        acc = reducer.accumulate(acc, item)
+    return acc
+
+
+@pytest.mark.asyncio
+class TestSPARPReducers:
+    async def test_aggregates_without_storing_results(self: Self) -> None:
+        """Verify reducers fold every response while retain_results=False keeps no result."""
+        sparp: SPARP = SPARP(
+            req_gen(1000, 0),
+            inspect_response,
+            parse_response=parse_value,
+            transport=InMemoryTransport(lambda req: ScriptedResponse(status=500 if req["json"]["value"] % 10 else 200)),
+            retain_results=False,
+            reducers={
+                "by_status": Count(key=lambda p: p["status"], states=[ResponseState.SUCCESS, ResponseState.HARD_FAIL]),
+                "successes": Count(),
+                "total": Sum(lambda p: p["value"]),
+                "histogram": Histogram(lambda p: p["value"], bounds=[100, 500]),
+                "top": TopK(3, key=lambda p: p["value"]),
+                "ids": Unique(lambda p: p["value"] // 100),
+            },
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.success == []
+        assert result.reduced["by_status"] == {200: 100, 500: 900}
+        assert result.reduced["successes"] == 100
+        assert result.reduced["total"] == sum(range(0, 1000, 10))
+        assert result.reduced["histogram"] == [10, 40, 50]
+        assert [p["value"] for p in result.reduced["top"]] == [990, 980, 970]
+        assert result.reduced["ids"] == set(range(10))
+
+    async def test_merge_matches_single_fold(self: Self) -> None:
+        """Verify merging accumulators of two halves gives the same values as folding everything at once."""
+        items: List[Dict[str, int]] = [{"value": (i * 37) % 101, "status": 200 + i % 3} for i in range(500)]
+        reducers: Dict[str, Reducer] = {
+            "count": Count(key=lambda p: p["status"]),
+            "sum": Sum(lambda p: p["value"]),
+            "histogram": Histogram(lambda p: p["value"], bounds=[10, 50, 90]),
+            "top": TopK(5, key=lambda p: p["value"]),
+            "unique": Unique(lambda p: p["value"]),
+        }
+        whole: Dict[str, Any] = {name: fold(r, items) for name, r in reducers.items()}
+        first: Dict[str, Any] = {name: fold(r, items[:200]) for name, r in reducers.items()}
+        second: Dict[str, Any] = {name: fold(r, items[200:]) for name, r in reducers.items()}
+        merged: Dict[str, Any] = merge_accumulators(reducers, first, second)
+
+        for name, reducer in reducers.items():
+            if name == "top":
+                # Equal keys may keep different responses; the kept keys must match
+                assert [p["value"] for p in reducer.result(merged[name])] == [
+                    p["value"] for p in reducer.result(whole[name])
+                ]
+            else:
+                assert reducer.result(merged[name]) == reducer.result(whole[name])
+
+    async def test_ordered_mode_and_partial_results(self: Self) -> None:
+        """Verify reducers see raw parsed values in ordered mode and are part of partial results."""
+        sparp: SPARP = SPARP(
+            req_gen(20, 0),
+            inspect_response,
+            parse_response=parse_value,
+            transport=InMemoryTransport(),
+            ordered=True,
+            reducers={"total": Sum(lambda p: p["value"])},
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.reduced == {"total": sum(range(20))}
+        assert sparp.partial_results().reduced == {"total": sum(range(20))}
+
+    async def test_validation(self: Self) -> None:
+        """Verify invalid reducer parameters are rejected."""
+        with pytest.raises(ValueError, match="sorted"):
+            Histogram(lambda p: p, bounds=[5, 1])
+        with pytest.raises(ValueError, match="k should"):
+            TopK(0, key=lambda p: p)
+
+    async def test_reducer_without_merge_cannot_be_created(self: Self) -> None:
+        """Verify a Reducer subclass missing one of its methods fails when created, not during the run."""
+
+        class NoMerge(Reducer):
+            def init(self: Self) -> int:
+                return 0
+
+            def accumulate(self: Self, acc: int, parsed: Any) -> int:
+                return acc + 1
+
+        with pytest.raises(TypeError):
+            NoMerge()  # type: ignore[abstract]
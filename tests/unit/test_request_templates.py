@@ -0,0 +1,56 @@
+import array
+import json
+import pytest
+from pathlib import Path
+from typing import Any, Dict, List, Self
+from src.sparp.sparp import SPARP, PARAM, RequestTemplate, SparpResult
+from tests.unit.helpers import inspect_response
+
+
+@pytest.mark.asyncio
+class TestSPARPRequestTemplates:
+    async def test_render_substitutes_placeholders_and_shares_headers(self: Self) -> None:
+        """Verify url and PARAM placeholders are filled while headers stay shared by reference."""
+        headers: Dict[str, str] = {"Authorization": "Bearer x"}
+        template: RequestTemplate = RequestTemplate(
+            "POST", "http://localhost/items/{}", headers=headers, json={"value": PARAM, "tags": ["a", PARAM]}
+        )
+        first: Dict[str, Any] = template.render(7)
+        second: Dict[str, Any] = template.render(8)
+
+        assert first == {
+            "method": "POST",
+            "url": "http://localhost/items/7",
+            "headers": headers,
+            "json": {"value": 7, "tags": ["a", 7]},
+        }
+        assert second["json"]["value"] == 8
+        assert first["headers"] is second["headers"]
+
+    async def test_numpy_scalars_become_python_values(self: Self, tmp_path: Path) -> None:
+        """Verify values from NumPy arrays and memory-mapped columns render as plain JSON-serializable values."""
+        np = pytest.importorskip("numpy")
+        column = np.memmap(tmp_path / "ids.bin", dtype=np.int64, mode="w+", shape=(3,))
+        column[:] = [10, 20, 30]
+
+        templated = RequestTemplate("POST", "http://localhost/test", json={"value": PARAM}).bind(column)
+        rendered: List[Dict[str, Any]] = [templated.template.render(v) for v in templated]
+
+        assert [r["json"]["value"] for r in rendered] == [10, 20, 30]
+        assert json.dumps(rendered[0]["json"]) == '{"value": 10}'
+        assert templated.size() == 3
+
+    async def test_templated_run_against_server(self: Self, success_server: Dict[str, List[Any]]) -> None:
+        """Verify a template bound to an array.array column sends one request per value."""
+        template: RequestTemplate = RequestTemplate("POST", "http://localhost:8765/test", json={"value": PARAM})
+        sparp: SPARP = SPARP(
+            template.bind(array.array("q", range(5))), inspect_response=inspect_response, concurrency=2
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 5
+        assert sorted(success_server["processed"]) == [0, 1, 2, 3, 4]
+        # Parsed results see the fully rendered request
+        assert sorted(item["input"]["json"]["value"] for item in result.success) == [0, 1, 2, 3, 4]
+        # The column length doubles as the progress estimate
+        assert sparp.estimated_input_collection_size == 5
@@ -0,0 +1,77 @@
+import pytest
+from typing import Any, Dict, Self
+from src.sparp.sparp import SPARP, RetryBudget, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+@pytest.mark.asyncio
+class TestSPARPRetryBudget:
+    async def test_caps_retries_during_outage(self: Self) -> None:
+        """Verify retries stay within the budget and refused ones end as max-retries outcomes."""
+        transport: InMemoryTransport = InMemoryTransport(ScriptedResponse(status=429))
+        sparp: SPARP = SPARP(
+            req_gen(200, 0),
+            inspect_response,
+            transport=transport,
+            concurrency=1,
+            max_retries_by_soft_fail=20,
+            retry_budget=RetryBudget(ratio=0.1, window_s=60, min_retries=5),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert transport.requests <= 200 + 5 + 0.1 * 200
+        assert len(result.max_retries_soft_fail_reached) == 200
+        assert result.stats.retries_denied > 150
+        assert result.stats.retry_budget_use is not None and result.stats.retry_budget_use > 0.9
+
+    async def test_refused_timeout_retry(self: Self) -> None:
+        """Verify a refused retry after a timeout ends as a max-retries-by-timeout outcome."""
+        sparp: SPARP = SPARP(
+            req_gen(3, 0),
+            inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=1)),
+            timeout_s=0.001,
+            retry_budget=RetryBudget(ratio=0, min_retries=0),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert len(result.max_retries_timeout_reached) == 3
+        assert result.stats.timeout_retries == 3
+        assert result.stats.retries_denied == 3
+
+    async def test_healthy_run_is_not_limited(self: Self) -> None:
+        """Verify occasional retries fit the budget and reach their normal outcome."""
+        attempts: Dict[int, int] = {}
+
+        def flaky(req: Dict[str, Any]) -> ScriptedResponse:
+            value: int = req["json"]["value"]
+            attempts[value] = attempts.get(value, 0) + 1
+            return ScriptedResponse(status=429 if value % 10 == 0 and attempts[value] == 1 else 200)
+
+        sparp: SPARP = SPARP(
+            req_gen(500, 0),
+            inspect_response,
+            transport=InMemoryTransport(flaky),
+            retry_budget=RetryBudget(ratio=0.2),
+        )
+        result: SparpResult = await sparp._main()
+
+        assert len(result.success) == 500
+        assert result.stats.retries_denied == 0
+        assert result.stats.soft_retries == 50
+
+    async def test_stats_without_budget(self: Self) -> None:
+        """Verify budget stats stay empty when no retry budget is set."""
+        sparp: SPARP = SPARP(req_gen(5, 0), inspect_response, transport=InMemoryTransport())
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.retries_denied == 0
+        assert result.stats.retry_budget_use is None
+
+    async def test_validation(self: Self) -> None:
+        """Verify invalid budgets are rejected."""
+        with pytest.raises(ValueError, match="window_s"):
+            RetryBudget(window_s=0)
+        with pytest.raises(ValueError, match="ratio"):
+            RetryBudget(ratio=-0.1)
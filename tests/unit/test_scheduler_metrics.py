@@ -0,0 +1,94 @@
+import time
+import pytest
+from typing import Any, Dict, Generator, Self
+from src.sparp.sparp import SPARP, Callbacks, SchedulerMetrics, SparpResult
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+@pytest.mark.asyncio
+class TestSPARPSchedulerMetrics:
+    async def test_stage_and_callback_timings(self: Self) -> None:
+        """Verify hooks and each callback are timed once per event."""
+        cb: Callbacks = Callbacks(on_success=lambda req, resp: None, on_soft_fail=lambda req, n: None)
+        attempts: Dict[int, int] = {}
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            value: int = req["json"]["value"]
+            attempts[value] = attempts.get(value, 0) + 1
+            return ScriptedResponse(status=429 if attempts[value] == 1 else 200)
+
+        sparp: SPARP = SPARP(
+            req_gen(10, 0),
+            inspect_response=inspect_response,
+            callbacks=cb,
+            transport=InMemoryTransport(script),
+            collect_metrics=True,
+        )
+        result: SparpResult = await sparp._main()
+
+        scheduler: SchedulerMetrics | None = result.stats.scheduler
+        assert scheduler is not None
+        assert scheduler.inspect_response.count == 20
+        # Soft fails are retried without being parsed
+        assert scheduler.parse_response.count == 10
+        assert scheduler.queue_wait.count == 10
+        assert scheduler.producer_items == 10
+        assert scheduler.callbacks["on_success"].count == 10
+        assert scheduler.callbacks["on_soft_fail"].count == 10
+        assert "recommendation:" in scheduler.summary()
+
+    async def test_slow_producer_is_reported(self: Self) -> None:
+        """Verify workers starved by a slow input iterator point the recommendation at the producer."""
+
+        def slow_gen() -> Generator[Dict[str, Any], None, None]:
+            for item in req_gen(20, 0):
+                time.sleep(0.005)
+                yield item
+
+        sparp: SPARP = SPARP(
+            slow_gen(),
+            inspect_response=inspect_response,
+            transport=InMemoryTransport(),
+            concurrency=4,
+            input_buffer_size=1,
+            collect_metrics=True,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.scheduler is not None
+        assert result.stats.scheduler.worker_idle_ratio > 0.5
+        assert "producer" in result.stats.scheduler.recommendation()
+
+    async def test_busy_workers_are_reported(self: Self) -> None:
+        """Verify a producer blocked on a full queue points the recommendation at concurrency."""
+        sparp: SPARP = SPARP(
+            req_gen(100, 0),
+            inspect_response=inspect_response,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=0.005)),
+            concurrency=2,
+            input_buffer_size=5,
+            collect_metrics=True,
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.scheduler is not None
+        assert result.stats.scheduler.producer_blocked_ratio > 0.5
+        assert "Raise concurrency" in result.stats.scheduler.recommendation()
+
+    async def test_live_gauges_and_disabled_by_default(self: Self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Verify gauges appear in the progress bar and nothing is collected unless asked for."""
+        plain: SparpResult = await SPARP(req_gen(2, 0), inspect_response, transport=InMemoryTransport())._main()
+        assert plain.stats.scheduler is None
+
+        await SPARP(
+            req_gen(2, 0),
+            inspect_response,
+            transport=InMemoryTransport(),
+            show_progress_bar=True,
+            collect_metrics=True,
+        )._main()
+        captured: str = capsys.readouterr().out
+        assert "IDLE: " in captured
+        assert "QWAIT: " in captured
+        assert "PRODUCER: " in captured
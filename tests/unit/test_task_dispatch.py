@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+import time
+import tracemalloc
+from typing import Any, Dict, Self
+from src.sparp.scheduling import HostScheduling
+from src.sparp.sparp import SPARP, SparpResult, StopConditions
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+async def status_only(req: Dict[str, Any], response: Any) -> int:
+    return response.status
+
+
+@pytest.mark.asyncio
+class TestSPARPTaskDispatch:
+    async def test_scales_to_many_in_flight(self: Self) -> None:
+        """Verify 20k slow requests are all in flight at once without any long-lived workers."""
+        sparp: SPARP = SPARP(
+            req_gen(20_000, 0),
+            inspect_response,
+            parse_response=status_only,
+            transport=InMemoryTransport(ScriptedResponse(latency_s=1.0)),
+            concurrency=100_000,
+            retain_results=False,
+            dispatch="tasks",
+        )
+        start: float = time.perf_counter()
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 20_000
+        assert time.perf_counter() - start < 10
+        assert sparp._requester_tasks == []
+        assert not sparp._request_tasks
+
+    async def test_concurrency_caps_tasks(self: Self) -> None:
+        """Verify no more than concurrency requests run at once."""
+        in_flight: int = 0
+        peak: int = 0
+
+        async def parse(req: Dict[str, Any], response: Any) -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.002)
+            in_flight -= 1
+
+        sparp: SPARP = SPARP(
+            req_gen(200, 0),
+            inspect_response,
+            parse_response=parse,
+            transport=InMemoryTransport(),
+            concurrency=7,
+            dispatch="tasks",
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success == 200
+        assert peak == 7
+
+    async def test_memory_follows_requests_in_flight(self: Self) -> None:
+        """Verify a huge concurrency costs nothing when only a few requests are in flight."""
+        tracemalloc.start()
+        try:
+            base: int = tracemalloc.get_traced_memory()[0]
+            sparp: SPARP = SPARP(
+                req_gen(500, 0),
+                inspect_response,
+                parse_response=status_only,
+                transport=InMemoryTransport(),
+                concurrency=1_000_000,
+                retain_results=False,
+                dispatch="tasks",
+            )
+            result: SparpResult = await sparp._main()
+            peak: int = tracemalloc.get_traced_memory()[1] - base
+        finally:
+            tracemalloc.stop()
+
+        assert result.stats.success == 500
+        assert peak < 4 * 1024 * 1024
+
+    async def test_retries_and_stop_conditions(self: Self) -> None:
+        """Verify retries happen inside the task of a request and a stop condition ends the run."""
+        attempts: Dict[int, int] = {}
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            value: int = req["json"]["value"]
+            attempts[value] = attempts.get(value, 0) + 1
+            if value == 150:
+                return ScriptedResponse(status=500)
+            return ScriptedResponse(status=429 if attempts[value] == 1 else 200)
+
+        sparp: SPARP = SPARP(
+            req_gen(100_000, 0),
+            inspect_response,
+            transport=InMemoryTransport(script),
+            stop_conditions=StopConditions(stop_on_hard_fail=True),
+            concurrency=10,
+            dispatch="tasks",
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.stop_reason == "Stop on hard fail."
+        assert result.stats.soft_retries >= 150
+        assert result.stats.success < 1000
+
+    async def test_validation(self: Self) -> None:
+        """Verify unknown dispatch modes and host_scheduling with tasks are rejected."""
+        with pytest.raises(ValueError, match="dispatch"):
+            SPARP(req_gen(1, 0), inspect_response, dispatch="threads")  # type: ignore[arg-type]
+        with pytest.raises(ValueError, match="host_scheduling"):
+            SPARP(req_gen(1, 0), inspect_response, dispatch="tasks", host_scheduling=HostScheduling())
@@ -0,0 +1,78 @@
+import pytest
+import threading
+from typing import Any, Dict, Self, Set
+from src.sparp.reducers import Count, Unique
+from src.sparp.sparp import PARAM, RequestTemplate, SparpResult, StopConditions
+from src.sparp.threaded import ThreadedSPARP
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+async def parse_value(req: Dict[str, Any], response: Any) -> Dict[str, Any]:
+    return {"value": req["json"]["value"], "thread": threading.get_ident()}
+
+
+def script(req: Dict[str, Any]) -> ScriptedResponse:
+    value: int = req["json"]["value"]
+    return ScriptedResponse(status=500 if value % 10 == 0 else 200, latency_s=0.001)
+
+
+class TestSPARPThreaded:
+    def test_merges_results_of_all_loops(self: Self) -> None:
+        """Verify every item is processed exactly once and results and counters of all loops are merged."""
+        threaded: ThreadedSPARP = ThreadedSPARP(
+            req_gen(1000, 0),
+            inspect_response,
+            threads=4,
+            transport_factory=lambda: InMemoryTransport(script),
+            parse_response=parse_value,
+            concurrency=40,
+            reducers={"values": Unique(key=lambda parsed: parsed["value"]), "count": Count()},
+        )
+        result: SparpResult = threaded.main()
+
+        values: Set[int] = {parsed["value"] for parsed in result.success + result.failed}
+        assert values == set(range(1000))
+        assert len(result.success) == 900 and len(result.failed) == 100
+        assert result.stats.success == 900
+        assert result.stats.status_codes == {200: 900, 500: 100}
+        assert result.reduced["count"] == 900
+        assert result.reduced["values"] == {v for v in range(1000) if v % 10}
+        assert len({parsed["thread"] for parsed in result.success}) == 4
+        assert all(sparp is not None and sparp.concurrency == 10 for sparp in threaded.engines)
+
+    def test_templated_input(self: Self) -> None:
+        """Verify a TemplatedInput is split between the loops and rendered by each of them."""
+        template: RequestTemplate = RequestTemplate("POST", "http://localhost/items", json={"value": PARAM})
+        result: SparpResult = ThreadedSPARP(
+            template.bind(range(200)),
+            inspect_response,
+            threads=3,
+            transport_factory=InMemoryTransport,
+            parse_response=parse_value,
+        ).main()
+
+        assert sorted(parsed["value"] for parsed in result.success) == list(range(200))
+
+    def test_stop_in_one_loop_stops_all(self: Self) -> None:
+        """Verify a stop condition in one loop ends dispatch everywhere."""
+        result: SparpResult = ThreadedSPARP(
+            req_gen(100000, 0),
+            inspect_response,
+            threads=2,
+            transport_factory=lambda: InMemoryTransport(script),
+            stop_conditions=StopConditions(stop_on_hard_fail=True),
+            concurrency=4,
+        ).main()
+
+        assert result.stats.stop_reason == "Stop on hard fail."
+        assert result.stats.success < 1000
+
+    def test_unsupported_options(self: Self) -> None:
+        """Verify options that need a single event loop are rejected."""
+        with pytest.raises(ValueError, match="ordered"):
+            ThreadedSPARP(req_gen(1, 0), inspect_response, ordered=True)
+        with pytest.raises(ValueError, match="transport"):
+            ThreadedSPARP(req_gen(1, 0), inspect_response, transport=InMemoryTransport())
+        with pytest.raises(ValueError, match="threads"):
+            ThreadedSPARP(req_gen(1, 0), inspect_response, threads=0)
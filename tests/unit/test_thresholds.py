@@ -0,0 +1,101 @@
+import pytest
+from typing import Any, Dict, Generator, Self
+from src.sparp.sparp import SPARP, Outcome, SparpResult, StopConditions, Threshold, _CountWindow, _TimeWindow
+from src.sparp.transports import InMemoryTransport, ScriptedResponse
+from tests.unit.helpers import req_gen, inspect_response
+
+
+def one_in(n: int, status: int) -> InMemoryTransport:
+    """Answers status to every n-th request and 200 to the others."""
+    return InMemoryTransport(lambda req: ScriptedResponse(status=status if req["json"]["value"] % n == 0 else 200))
+
+
+def hosts(count: int) -> Generator[Dict[str, Any], None, None]:
+    for i in range(count):
+        yield {"method": "GET", "url": f"http://host{i % 2}.example/items/{i}", "json": {"value": i}}
+
+
+@pytest.mark.asyncio
+class TestSPARPThresholds:
+    async def test_isolated_failures_do_not_stop(self: Self) -> None:
+        """Verify a low hard-fail rate stays under a ratio threshold and the run completes."""
+        cond: StopConditions = StopConditions(thresholds=[Threshold(Outcome.HARD_FAIL, ratio=0.3, last_n=100)])
+        sparp: SPARP = SPARP(req_gen(1000, 0), inspect_response, stop_conditions=cond, transport=one_in(100, 500))
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success + result.stats.failed == 1000
+        assert result.stats.stop_reason is None
+
+    async def test_ratio_over_last_n_stops_with_partial_results(self: Self) -> None:
+        """Verify a high hard-fail rate trips the threshold and the results so far are returned."""
+        cond: StopConditions = StopConditions(thresholds=[Threshold(Outcome.HARD_FAIL, ratio=0.3, last_n=100)])
+        sparp: SPARP = SPARP(
+            req_gen(10_000, 0), inspect_response, stop_conditions=cond, transport=one_in(2, 500), concurrency=1
+        )
+        result: SparpResult = await sparp._main()
+
+        assert result.stats.success + result.stats.failed == 100
+        assert len(result.success) == 50
+        assert result.stats.stop_reason is not None
+        assert "HARD_FAIL" in result.stats.stop_reason
+
+    async def test_count_over_last_seconds(self: Self) -> None:
+        """Verify a count threshold over a time window trips on the n-th matching attempt, retries included."""
+        cond: StopConditions = StopConditions(
+            thresholds=[Threshold([Outcome.SOFT_FAIL, Outcome.TIMEOUT], count=5, last_s=60)]
+        )
+        sparp: SPARP = SPARP(
+            req_gen(100, 0), inspect_response, stop_conditions=cond, transport=one_in(10, 429), concurrency=1
+        )
+        result: SparpResult = await sparp._main()
+
+        # The first request is throttled on every attempt, so the fifth retry trips the threshold
+        assert result.stats.soft_retries == 5
+        assert result.stats.success == 0
+        assert result.stats.stop_reason is not None
+
+    async def test_per_host(self: Self) -> None:
+        """Verify a per-host threshold stops on one broken host that an overall ratio would tolerate."""
+
+        def script(req: Dict[str, Any]) -> ScriptedResponse:
+            return ScriptedResponse(status=500 if "host1" in req["url"] and req["json"]["value"] % 3 else 200)
+
+        overall: StopConditions = StopConditions(thresholds=[Threshold(Outcome.HARD_FAIL, ratio=0.5, last_n=50)])
+        result: SparpResult = await SPARP(
+            hosts(200), inspect_response, stop_conditions=overall, transport=InMemoryTransport(script), concurrency=1
+        )._main()
+        assert result.stats.stop_reason is None
+
+        per_host: StopConditions = StopConditions(
+            thresholds=[Threshold(Outcome.HARD_FAIL, ratio=0.5, last_n=50, min_attempts=20, per_host=True)]
+        )
+        result = await SPARP(
+            hosts(200), inspect_response, stop_conditions=per_host, transport=InMemoryTransport(script), concurrency=1
+        )._main()
+        assert result.stats.stop_reason is not None
+        assert "host1.example" in result.stats.stop_reason
+        assert result.stats.success + result.stats.failed == 40
+
+    async def test_validation(self: Self) -> None:
+        """Verify a threshold needs one window and at least one limit."""
+        with pytest.raises(ValueError, match="exactly one"):
+            Threshold(Outcome.HARD_FAIL, ratio=0.1)
+        with pytest.raises(ValueError, match="exactly one"):
+            Threshold(Outcome.HARD_FAIL, ratio=0.1, last_n=10, last_s=10)
+        with pytest.raises(ValueError, match="ratio"):
+            Threshold(Outcome.HARD_FAIL, last_n=10)
+        with pytest.raises(ValueError, match="ratio"):
+            Threshold(Outcome.HARD_FAIL, ratio=1.5, last_n=10)
+
+    async def test_windows_slide(self: Self) -> None:
+        """Verify old attempts leave both window kinds."""
+        count_window: _CountWindow = _CountWindow(3)
+        for match in (True, True, False, False, False):
+            count_window.add(match, 0.0)
+        assert (count_window.matches, count_window.total) == (0, 3)
+
+        time_window: _TimeWindow = _TimeWindow(10.0)
+        time_window.add(True, 100.0)
+        time_window.add(True, 105.0)
+        time_window.add(False, 112.0)
+        assert (time_window.matches, time_window.total) == (1, 2)